@@ -0,0 +1,52 @@
+"""
+Admin script to compact old versions of AI-generated sections
+Keeps the newest versions of every section (and user-edited ones) as full
+text and stores older versions as compressed deltas against the next one.
+
+Run from the backend directory:
+    python compact_generated_content.py --keep-versions 5 --batch-size 100 --dry-run
+"""
+import argparse
+import asyncio
+from prisma import Prisma
+from utils.content_compaction import CONTENT_COMPACT_BATCH_SIZE, CONTENT_KEEP_VERSIONS, compact_generated_content
+
+
+async def compact_content(keep_versions: int, batch_size: int, dry_run: bool):
+    """Apply the generated content retention policy once"""
+    prisma = Prisma()
+    await prisma.connect()
+
+    try:
+        print(f"🗜️  Compacting generated content (keeping {keep_versions} versions per section)")
+        result = await compact_generated_content(prisma, keep_versions, batch_size, dry_run)
+        action = "Would compact" if dry_run else "Compacted"
+        print(f"   {action} {result['compacted_versions']} versions in {result['sections']} sections")
+        if result["failed_sections"]:
+            print(f"   ⚠️  {result['failed_sections']} sections failed (see log)")
+        saved = result["text_bytes"] - result["delta_bytes"]
+        print(f"\n🎉 {'Would save' if dry_run else 'Saved'} {saved / (1024 * 1024):.1f} MB of text")
+
+    except Exception as e:
+        print(f"❌ Error compacting generated content: {str(e)}")
+        raise
+    finally:
+        await prisma.disconnect()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compact old versions of AI-generated sections")
+    parser.add_argument("--keep-versions", type=int, default=CONTENT_KEEP_VERSIONS,
+                        help="Keep this many of each section's newest versions as full text")
+    parser.add_argument("--batch-size", type=int, default=CONTENT_COMPACT_BATCH_SIZE,
+                        help="Sections compacted per batch")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be compacted without changing rows")
+    args = parser.parse_args()
+    if args.keep_versions < 1:
+        parser.error("--keep-versions must be at least 1")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(compact_content(args.keep_versions, args.batch_size, args.dry_run))
@@ -0,0 +1,48 @@
+"""
+Admin script to delete old generated PDFs
+Removes PdfDocument rows and files past the retention period (keeping the
+newest PDFs of every form) and orphaned files in PDF storage.
+
+Run from the backend directory:
+    python gc_pdfs.py --retention-days 30 --keep-per-form 3 --dry-run
+"""
+import argparse
+import asyncio
+from prisma import Prisma
+from utils.pdf_cache import PDF_KEEP_PER_FORM, PDF_RETENTION_DAYS, collect_stale_pdfs
+
+
+async def gc_pdfs(retention_days: int, keep_per_form: int, dry_run: bool):
+    """Apply the PDF retention policy once"""
+    prisma = Prisma()
+    await prisma.connect()
+
+    try:
+        print(f"🧹 Cleaning PDFs older than {retention_days} days (keeping {keep_per_form} per form)")
+        result = await collect_stale_pdfs(prisma, retention_days, keep_per_form, dry_run)
+        action = "Would delete" if dry_run else "Deleted"
+        print(f"   {action} {result['expired_documents']} expired documents")
+        print(f"   {action} {result['orphaned_files']} orphaned files")
+        if not dry_run:
+            print(f"\n🎉 Freed {result['freed_bytes'] / (1024 * 1024):.1f} MB")
+
+    except Exception as e:
+        print(f"❌ Error cleaning PDFs: {str(e)}")
+        raise
+    finally:
+        await prisma.disconnect()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Delete generated PDFs past the retention period")
+    parser.add_argument("--retention-days", type=int, default=PDF_RETENTION_DAYS,
+                        help="Delete PDFs generated more than this many days ago")
+    parser.add_argument("--keep-per-form", type=int, default=PDF_KEEP_PER_FORM,
+                        help="Always keep this many of each form's newest PDFs")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be deleted without deleting")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(gc_pdfs(args.retention_days, args.keep_per_form, args.dry_run))
@@ -6,6 +6,7 @@ from starlette.requests import Request as StarletteRequest
 import os
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 from prisma import Prisma
 import uvicorn
 
@@ -16,7 +17,14 @@ from routes.form import router as form_router
 from routes.financial import router as financial_router
 from routes.analytics import router as analytics_router
 from routes.schemes import router as schemes_router
-from routes.pdf import router as pdf_router
+from routes.pdf import prerender_form_pdf, router as pdf_router
+from utils.content_compaction import CONTENT_COMPACT_INTERVAL_HOURS, run_content_compaction_periodically
+from utils.download_counter import download_counter
+from utils.financial_recompute import financial_recompute_scheduler
+from utils.pdf_cache import PDF_GC_INTERVAL_HOURS, run_pdf_gc_periodically
+from utils.pdf_prerender import pdf_prerender_scheduler
+from utils.pdf_renderer import browser_pool
+from utils.pdf_storage import PDF_STORAGE_DRIVER, local_storage_root
 
 # Prisma client instance
 prisma = Prisma()
@@ -31,10 +39,27 @@ async def lifespan(app: FastAPI):
     # Startup
     await prisma.connect()
     print("✅ Connected to PostgreSQL database")
+    await browser_pool.start()
+    download_counter.start(prisma)
+    pdf_prerender_scheduler.start(prerender_form_pdf)
+    pdf_gc_task = None
+    if PDF_GC_INTERVAL_HOURS > 0:
+        pdf_gc_task = asyncio.create_task(run_pdf_gc_periodically(prisma))
+    content_compaction_task = None
+    if CONTENT_COMPACT_INTERVAL_HOURS > 0:
+        content_compaction_task = asyncio.create_task(run_content_compaction_periodically(prisma))
     
     yield
     
     # Shutdown
+    if pdf_gc_task:
+        pdf_gc_task.cancel()
+    if content_compaction_task:
+        content_compaction_task.cancel()
+    await pdf_prerender_scheduler.shutdown()
+    await browser_pool.shutdown()
+    await download_counter.shutdown()
+    await financial_recompute_scheduler.shutdown()
     await prisma.disconnect()
     print("❌ Disconnected from PostgreSQL database")
 
@@ -78,9 +103,12 @@ app.include_router(analytics_router, prefix="/api")
 app.include_router(schemes_router, prefix="/api")
 app.include_router(pdf_router, prefix="/api")
 
-# Mount static files for PDF downloads
-uploads_dir = os.path.join(os.path.dirname(__file__), "uploads")
-if os.path.exists(uploads_dir):
+# Mount static files for PDF downloads (PDFs in object storage are only
+# served through the authenticated /api/pdf/{pdf_id}/download)
+if PDF_STORAGE_DRIVER == "local":
+    # Same directory LocalPdfStorage writes to
+    uploads_dir = local_storage_root()
+    os.makedirs(uploads_dir, exist_ok=True)
     app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
 
 
@@ -0,0 +1,226 @@
+"""
+Admin script to recompute financial projections for every form
+Streams forms from the database in pages, computes projections in chunks
+across a process pool and bulk-writes the results, marking each form's
+snapshot stale. Every form keeps the horizon and ramp-up curve it was last
+calculated with unless --horizon overrides the horizon.
+
+Run after a change to the projection formulas:
+    python recompute_financials.py --page-size 1000 --workers 4
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from prisma import Json, Prisma
+from utils.financial_engine import (
+    DEFAULT_HORIZON_MONTHS,
+    SUPPORTED_HORIZONS,
+    PaiseInputs,
+    ProjectionBatch,
+    ProjectionInputs,
+    input_fingerprint,
+    paise_batch,
+    paise_projection_records,
+    project_batch,
+    project_paise_batch,
+    projection_records,
+    rupee_series,
+    summarize_batch,
+    summarize_paise_batch,
+    summary_record,
+    summary_rows
+)
+from utils.financial_recompute import FINANCIAL_ARITHMETIC, PROJECTION_STORAGE, projection_series_record
+from utils.form_snapshot import mark_snapshots_stale
+
+# Forms need all three sections before projections can be calculated
+CALCULABLE_FORM_FILTER = {
+    "financialDetails": {"is_not": None},
+    "revenueAssumptions": {"is_not": None},
+    "costDetails": {"is_not": None}
+}
+
+
+def compute_chunk(
+    form_ids: List[int],
+    fingerprints: List[str],
+    batch: ProjectionBatch,
+    horizon_months: int,
+    ramp_up: Optional[Sequence[float]] = None
+):
+    """
+    Compute projections and summaries for forms sharing a horizon and
+    ramp-up curve (runs in a worker process)
+
+    Returns the create_many payloads so the Decimal conversion also happens
+    off the event loop.
+    """
+    exact = FINANCIAL_ARITHMETIC == "paise"
+    if exact:
+        series = project_paise_batch(batch, horizon_months, ramp_up)
+        summaries = summary_rows(summarize_paise_batch(series, batch.total_investment))
+    else:
+        series = project_batch(batch, horizon_months, ramp_up)
+        summaries = summary_rows(summarize_batch(series, batch.total_investment))
+
+    projection_data = []
+    series_data = []
+    for index, form_id in enumerate(form_ids):
+        form_series = series.row(index)
+        if PROJECTION_STORAGE in ("rows", "both"):
+            if exact:
+                projection_data.extend(paise_projection_records(form_id, form_series))
+            else:
+                projection_data.extend(projection_records(form_id, form_series.to_rows()))
+        if exact:
+            form_series = rupee_series(form_series)
+        if PROJECTION_STORAGE in ("columnar", "both"):
+            series_data.append(projection_series_record(form_id, form_series))
+
+    summary_data = [
+        {
+            "formId": form_id,
+            **summary_record(summary, fingerprint),
+            "horizonMonths": horizon_months,
+            "rampUp": Json(list(ramp_up)) if ramp_up else None
+        }
+        for form_id, fingerprint, summary in zip(form_ids, fingerprints, summaries)
+    ]
+    return form_ids, projection_data, series_data, summary_data
+
+
+async def stream_form_pages(prisma: Prisma, page_size: int):
+    """Yield pages of calculable forms using keyset pagination on id"""
+    last_id = 0
+    while True:
+        forms = await prisma.dprform.find_many(
+            where={"id": {"gt": last_id}, **CALCULABLE_FORM_FILTER},
+            include={
+                "financialDetails": True,
+                "revenueAssumptions": True,
+                "costDetails": True,
+                "financialSummary": True
+            },
+            order={"id": "asc"},
+            take=page_size
+        )
+        if not forms:
+            return
+        yield forms
+        last_id = forms[-1].id
+
+
+async def write_results(
+    prisma: Prisma,
+    form_ids: List[int],
+    projection_data: List[dict],
+    series_data: List[dict],
+    summary_data: List[dict]
+):
+    """
+    Replace projections and summaries for a page of forms in one transaction,
+    marking their snapshots stale (rebuilt when the form is next read)
+    """
+    async with prisma.tx() as transaction:
+        await transaction.financialprojection.delete_many(where={"formId": {"in": form_ids}})
+        await transaction.financialprojectionseries.delete_many(where={"formId": {"in": form_ids}})
+        if projection_data:
+            await transaction.financialprojection.create_many(data=projection_data)
+        if series_data:
+            await transaction.financialprojectionseries.create_many(data=series_data)
+        await transaction.financialsummary.delete_many(where={"formId": {"in": form_ids}})
+        await transaction.financialsummary.create_many(data=summary_data)
+        await mark_snapshots_stale(transaction, form_ids)
+
+
+def projection_settings(form, horizon_override: Optional[int]) -> Tuple[int, Optional[tuple]]:
+    """Horizon and ramp-up a form was last calculated with (the horizon can be overridden)"""
+    summary = form.financialSummary
+    horizon_months = horizon_override or (summary.horizonMonths if summary else DEFAULT_HORIZON_MONTHS)
+    ramp_up = tuple(summary.rampUp) if summary and summary.rampUp else None
+    return horizon_months, ramp_up
+
+
+async def recompute_financials(page_size: int, workers: int, horizon_override: Optional[int], dry_run: bool):
+    """
+    Recompute and store financial projections for all calculable forms,
+    each with its stored horizon and ramp-up unless horizon_override is set
+    """
+    prisma = Prisma()
+    await prisma.connect()
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    processed = 0
+
+    try:
+        total = await prisma.dprform.count(where=CALCULABLE_FORM_FILTER)
+        horizon = f"{horizon_override}-month" if horizon_override else "stored-horizon"
+        print(f"📊 Recomputing {horizon} projections for {total} forms")
+
+        async def drain(futures):
+            nonlocal processed
+            for future in futures:
+                form_ids, *results = await future
+                if not dry_run:
+                    await write_results(prisma, form_ids, *results)
+                processed += len(form_ids)
+            elapsed = time.perf_counter() - started
+            print(f"   {processed}/{total} forms ({processed / elapsed:,.0f} forms/s)")
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            async for forms in stream_form_pages(prisma, page_size):
+                # One chunk per horizon and ramp-up curve in the page
+                groups: Dict[Tuple[int, Optional[tuple]], list] = {}
+                for form in forms:
+                    groups.setdefault(projection_settings(form, horizon_override), []).append(form)
+
+                for (horizon_months, ramp_up), group in groups.items():
+                    form_ids = [form.id for form in group]
+                    inputs = [ProjectionInputs.from_form(form) for form in group]
+                    fingerprints = [
+                        input_fingerprint(item, horizon_months, ramp_up, FINANCIAL_ARITHMETIC)
+                        for item in inputs
+                    ]
+                    if FINANCIAL_ARITHMETIC == "paise":
+                        batch = paise_batch([PaiseInputs.from_form(form) for form in group])
+                    else:
+                        batch = ProjectionBatch.from_inputs(inputs)
+                    pending.add(loop.run_in_executor(
+                        pool, compute_chunk, form_ids, fingerprints, batch, horizon_months, ramp_up
+                    ))
+
+                    # Keep at most two chunks per worker in flight to bound memory
+                    if len(pending) >= workers * 2:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        await drain(done)
+
+            if pending:
+                await drain(pending)
+
+        elapsed = time.perf_counter() - started
+        action = "Computed (dry run)" if dry_run else "Recomputed"
+        print(f"\n🎉 {action} {processed} forms in {elapsed:.1f}s")
+
+    except Exception as e:
+        print(f"❌ Error recomputing financials: {str(e)}")
+        raise
+    finally:
+        await prisma.disconnect()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Recompute financial projections for all DPR forms")
+    parser.add_argument("--page-size", type=int, default=1000, help="Forms fetched and computed per chunk")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes for computation")
+    parser.add_argument("--horizon", type=int, choices=SUPPORTED_HORIZONS,
+                        help="Projection horizon in months for every form (default: each form's stored horizon)")
+    parser.add_argument("--dry-run", action="store_true", help="Compute without writing to the database")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(recompute_financials(args.page_size, args.workers, args.horizon, args.dry_run))
@@ -2,13 +2,27 @@
 Financial Projections API Endpoints
 Handles calculation and retrieval of financial projections and summaries
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from prisma import Prisma
-from decimal import Decimal
-from datetime import datetime, timezone
 from middleware.auth import get_current_user, get_optional_user, CurrentUser
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Optional, Union
+from utils.financial_simulation import DISTRIBUTIONS, MAX_SAMPLES, Distribution, simulate
+from utils.financial_loan import (
+    MAX_MORATORIUM_MONTHS,
+    MAX_TENURE_MONTHS,
+    analyze_loan,
+    loan_analysis_cache,
+    loan_fingerprint
+)
+from utils.financial_goal_seek import GOAL_SEEK_TARGETS, GOAL_SEEK_VARIABLES, goal_seek
+from utils.financial_engine import DEFAULT_HORIZON_MONTHS, ProjectionInputs, validate_horizon
+from utils.financial_recompute import (
+    CALCULATION_INCLUDE,
+    calculate_and_store,
+    projection_columns_from_record,
+    projection_columns_from_rows
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,6 +46,16 @@ class FinancialProjectionMonth(BaseModel):
     cumulative_profit_loss: float
 
 
+class FinancialProjectionColumns(BaseModel):
+    """Monthly projections as one array per metric (compact, chart-friendly)"""
+    month_number: List[int]
+    revenue: List[float]
+    fixed_costs: List[float]
+    variable_costs: List[float]
+    profit_loss: List[float]
+    cumulative_profit_loss: List[float]
+
+
 class FinancialSummaryResponse(BaseModel):
     form_id: int
     business_name: str
@@ -41,6 +65,29 @@ class FinancialSummaryResponse(BaseModel):
     npv: float
     profit_margin_percentage: float
     calculated_at: str
+    is_stale: bool = False
+
+
+class ProjectionOptions(BaseModel):
+    """Projection horizon and ramp-up curve shared by the calculation requests"""
+    horizon_months: int = DEFAULT_HORIZON_MONTHS
+    ramp_up: Optional[List[float]] = Field(None, max_length=120)
+    
+    @field_validator('horizon_months')
+    @classmethod
+    def validate_horizon_months(cls, v):
+        return validate_horizon(v)
+    
+    @field_validator('ramp_up')
+    @classmethod
+    def validate_ramp_up(cls, v):
+        if v is not None and any(factor < 0 for factor in v):
+            raise ValueError("Ramp-up factors must be non-negative")
+        return v
+
+
+class FinancialCalculationRequest(ProjectionOptions):
+    force: bool = False
 
 
 class FinancialCalculationResponse(BaseModel):
@@ -49,6 +96,178 @@ class FinancialCalculationResponse(BaseModel):
     form_id: int
     projections_count: int
     summary: Optional[dict] = None
+    cache_hit: bool = False
+
+
+class DistributionSpec(BaseModel):
+    """Multiplier distribution applied to a base form value (1.0 = unchanged)"""
+    distribution: str = "fixed"
+    mean: float = 1.0
+    std: float = Field(0.0, ge=0)
+    low: float = Field(1.0, ge=0)
+    high: float = Field(1.0, ge=0)
+    mode: float = Field(1.0, ge=0)
+    
+    @field_validator('distribution')
+    @classmethod
+    def validate_distribution(cls, v):
+        if v not in DISTRIBUTIONS:
+            raise ValueError(f"Distribution must be one of: {', '.join(DISTRIBUTIONS)}")
+        return v
+    
+    def to_distribution(self) -> Distribution:
+        return Distribution(
+            kind=self.distribution,
+            mean=self.mean,
+            std=self.std,
+            low=self.low,
+            high=self.high,
+            mode=self.mode
+        )
+
+
+class FinancialSimulationRequest(ProjectionOptions):
+    n_samples: int = Field(5000, ge=1, le=MAX_SAMPLES)
+    seed: Optional[int] = Field(None, ge=0)
+    price: DistributionSpec = DistributionSpec()
+    sales_quantity: DistributionSpec = DistributionSpec()
+    fixed_costs: DistributionSpec = DistributionSpec()
+    variable_costs: DistributionSpec = DistributionSpec()
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "n_samples": 5000,
+                "seed": 42,
+                "price": {"distribution": "triangular", "low": 0.9, "mode": 1.0, "high": 1.05},
+                "sales_quantity": {"distribution": "normal", "mean": 0.9, "std": 0.1},
+                "fixed_costs": {"distribution": "uniform", "low": 1.0, "high": 1.1}
+            }
+        }
+
+
+class FinancialSimulationResponse(BaseModel):
+    form_id: int
+    n_samples: int
+    seed: Optional[int] = None
+    horizon_months: int
+    cumulative_profit_loss_bands: Dict[str, List[float]]
+    breakeven_months: Dict[str, float]
+    payback_period_months: Dict[str, float]
+    npv: Dict[str, float]
+
+
+class FinancialGoalSeekRequest(ProjectionOptions):
+    variable: str
+    target_metric: str
+    target_value: float
+    
+    @field_validator('variable')
+    @classmethod
+    def validate_variable(cls, v):
+        if v not in GOAL_SEEK_VARIABLES:
+            raise ValueError(f"Variable must be one of: {', '.join(GOAL_SEEK_VARIABLES)}")
+        return v
+    
+    @field_validator('target_metric')
+    @classmethod
+    def validate_target_metric(cls, v):
+        if v not in GOAL_SEEK_TARGETS:
+            raise ValueError(f"Target metric must be one of: {', '.join(GOAL_SEEK_TARGETS)}")
+        return v
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "variable": "price",
+                "target_metric": "breakeven_months",
+                "target_value": 18
+            }
+        }
+
+
+class FinancialGoalSeekResponse(BaseModel):
+    form_id: int
+    variable: str
+    target_metric: str
+    target_value: float
+    feasible: bool
+    message: str
+    current_value: float
+    solved_value: Optional[float] = None
+    change_percentage: Optional[float] = None
+    solved_inputs: Optional[dict] = None
+    summary: Optional[dict] = None
+    iterations: int
+    evaluations: int
+
+
+class FinancialLoanRequest(ProjectionOptions):
+    annual_interest_rates: List[float] = Field([10.5], min_length=1, max_length=50)
+    tenure_months: List[int] = Field([60], min_length=1, max_length=50)
+    moratorium_months: List[int] = Field([0], min_length=1, max_length=12)
+    include_schedule: bool = True
+    
+    @field_validator('annual_interest_rates')
+    @classmethod
+    def validate_rates(cls, v):
+        if any(not 0 <= rate <= 50 for rate in v):
+            raise ValueError("Interest rates must be between 0 and 50 percent")
+        return v
+    
+    @field_validator('tenure_months')
+    @classmethod
+    def validate_tenures(cls, v):
+        if any(not 1 <= tenure <= MAX_TENURE_MONTHS for tenure in v):
+            raise ValueError(f"Tenure must be between 1 and {MAX_TENURE_MONTHS} months")
+        return v
+    
+    @field_validator('moratorium_months')
+    @classmethod
+    def validate_moratoria(cls, v):
+        if any(not 0 <= months <= MAX_MORATORIUM_MONTHS for months in v):
+            raise ValueError(f"Moratorium must be between 0 and {MAX_MORATORIUM_MONTHS} months")
+        return v
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "annual_interest_rates": [9.5, 10.5, 11.5],
+                "tenure_months": [60, 84],
+                "moratorium_months": [0, 6]
+            }
+        }
+
+
+class LoanScenarioSummary(BaseModel):
+    annual_interest_rate: float
+    tenure_months: int
+    moratorium_months: int
+    emi: float
+    total_interest: float
+    total_payment: float
+    min_dscr: Optional[float] = None
+    average_dscr: Optional[float] = None
+    years_below_one: int
+
+
+class LoanScheduleColumns(BaseModel):
+    month_number: List[int]
+    opening_balance: List[float]
+    interest: List[float]
+    principal: List[float]
+    payment: List[float]
+    closing_balance: List[float]
+
+
+class FinancialLoanResponse(BaseModel):
+    form_id: int
+    loan_amount: float
+    horizon_months: int
+    scenarios: List[LoanScenarioSummary]
+    schedule: Optional[LoanScheduleColumns] = None
+    annual_dscr: Optional[List[Optional[float]]] = None
+    cache_hit: bool = False
 
 
 class FinancialProjectionsResponse(BaseModel):
@@ -59,6 +278,14 @@ class FinancialProjectionsResponse(BaseModel):
     summary: Optional[FinancialSummaryResponse] = None
 
 
+class FinancialProjectionsColumnarResponse(BaseModel):
+    form_id: int
+    business_name: str
+    total_months: int
+    columns: FinancialProjectionColumns
+    summary: Optional[FinancialSummaryResponse] = None
+
+
 # ============================================================
 # Helper Functions
 # ============================================================
@@ -73,12 +300,7 @@ async def get_form_data(form_id: int, user_id: int):
     
     form = await prisma.dprform.find_unique(
         where={"id": form_id},
-        include={
-            "financialDetails": True,
-            "revenueAssumptions": True,
-            "costDetails": True,
-            "businessDetails": True
-        }
+        include={**CALCULATION_INCLUDE, "businessDetails": True}
     )
     
     if not form:
@@ -115,135 +337,6 @@ async def get_form_data(form_id: int, user_id: int):
     return form
 
 
-def calculate_monthly_projections(form) -> List[dict]:
-    """
-    Calculate 36-month financial projections
-    
-    Formula breakdown:
-    - Revenue = Product Price × Monthly Sales Quantity
-    - Fixed Costs = Sum of all fixed monthly costs
-    - Variable Costs = Raw materials (varies with production)
-    - Profit/Loss = Revenue - Fixed Costs - Variable Costs
-    - Cumulative Profit/Loss = Running total of profit/loss
-    """
-    financial = form.financialDetails
-    revenue_assumptions = form.revenueAssumptions
-    cost_details = form.costDetails
-    
-    # Get baseline values
-    product_price = float(revenue_assumptions.productPrice)
-    growth_rate = float(revenue_assumptions.growthRatePercentage) / 100
-    
-    # Sales quantities by year
-    sales_year_1 = revenue_assumptions.monthlySalesQuantityYear1
-    sales_year_2 = revenue_assumptions.monthlySalesQuantityYear2
-    sales_year_3 = revenue_assumptions.monthlySalesQuantityYear3
-    
-    # Monthly costs
-    fixed_monthly = (
-        float(cost_details.laborCostMonthly) +
-        float(cost_details.utilitiesCostMonthly) +
-        float(cost_details.rentMonthly) +
-        float(cost_details.marketingCostMonthly) +
-        float(cost_details.otherFixedCostsMonthly)
-    )
-    
-    variable_monthly_base = float(cost_details.rawMaterialCostMonthly)
-    
-    projections = []
-    cumulative_profit_loss = 0.0
-    
-    for month in range(1, 37):  # 36 months
-        # Determine sales quantity based on year
-        if month <= 12:
-            sales_quantity = sales_year_1
-        elif month <= 24:
-            sales_quantity = sales_year_2
-        else:
-            sales_quantity = sales_year_3
-        
-        # Calculate revenue
-        revenue = product_price * sales_quantity
-        
-        # Variable costs scale with production
-        variable_costs = variable_monthly_base
-        
-        # Calculate profit/loss
-        profit_loss = revenue - fixed_monthly - variable_costs
-        
-        # Update cumulative
-        cumulative_profit_loss += profit_loss
-        
-        projections.append({
-            "month_number": month,
-            "revenue": revenue,
-            "fixed_costs": fixed_monthly,
-            "variable_costs": variable_costs,
-            "profit_loss": profit_loss,
-            "cumulative_profit_loss": cumulative_profit_loss
-        })
-    
-    return projections
-
-
-def calculate_summary_metrics(projections: List[dict], total_investment: float) -> dict:
-    """
-    Calculate financial summary metrics
-    
-    Metrics:
-    - Break-even month: First month where cumulative profit > 0
-    - ROI: (Total profit after 36 months / Total investment) × 100
-    - Payback period: Months until cumulative profit = investment
-    - NPV: Simplified (using 10% discount rate)
-    - Profit margin: Average monthly profit margin
-    """
-    # Break-even month
-    breakeven_months = 0
-    for proj in projections:
-        if proj["cumulative_profit_loss"] > 0:
-            breakeven_months = proj["month_number"]
-            break
-    
-    if breakeven_months == 0:
-        breakeven_months = 36  # Didn't break even in 36 months
-    
-    # ROI calculation
-    final_cumulative_profit = projections[-1]["cumulative_profit_loss"]
-    roi_percentage = (final_cumulative_profit / total_investment) * 100 if total_investment > 0 else 0
-    
-    # Payback period
-    payback_period_months = 0
-    for proj in projections:
-        if proj["cumulative_profit_loss"] >= total_investment:
-            payback_period_months = proj["month_number"]
-            break
-    
-    if payback_period_months == 0:
-        payback_period_months = 36  # Didn't pay back in 36 months
-    
-    # NPV calculation (simplified with 10% annual discount rate = 0.83% monthly)
-    discount_rate_monthly = 0.0083
-    npv = 0.0
-    for proj in projections:
-        discounted_cash_flow = proj["profit_loss"] / ((1 + discount_rate_monthly) ** proj["month_number"])
-        npv += discounted_cash_flow
-    
-    npv -= total_investment  # Subtract initial investment
-    
-    # Average profit margin
-    total_revenue = sum(p["revenue"] for p in projections if p["revenue"] > 0)
-    total_profit = sum(p["profit_loss"] for p in projections)
-    profit_margin_percentage = (total_profit / total_revenue * 100) if total_revenue > 0 else 0
-    
-    return {
-        "breakeven_months": breakeven_months,
-        "roi_percentage": round(roi_percentage, 2),
-        "payback_period_months": payback_period_months,
-        "npv": round(npv, 2),
-        "profit_margin_percentage": round(profit_margin_percentage, 2)
-    }
-
-
 # ============================================================
 # API Endpoints
 # ============================================================
@@ -252,9 +345,10 @@ def calculate_summary_metrics(projections: List[dict], total_investment: float)
              response_model=FinancialCalculationResponse,
              status_code=status.HTTP_201_CREATED,
              summary="Calculate financial projections",
-             description="Calculate 36-month financial projections and summary metrics for a DPR form")
+             description="Calculate 36/60/120-month financial projections and summary metrics for a DPR form")
 async def calculate_financial_projections(
     form_id: int,
+    request: FinancialCalculationRequest = None,
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -262,67 +356,53 @@ async def calculate_financial_projections(
     
     This endpoint:
     1. Retrieves form data (financial, revenue, costs)
-    2. Calculates month-by-month projections (36 months)
+    2. Calculates month-by-month projections (36 months by default)
     3. Computes summary metrics (ROI, break-even, NPV, etc.)
-    4. Stores results in database
+    4. Stores results in database in a single transaction
+    
+    When the engine inputs match the fingerprint stored with the last result,
+    steps 2-4 are skipped and the stored summary is returned (cache_hit=true).
+    
+    Request Body (optional):
+    - horizon_months: Projection horizon (36, 60 or 120 months)
+    - ramp_up: Capacity utilisation per month for the first months (e.g. [0.5, 0.7, 0.9])
+    - force: Recalculate even if the inputs are unchanged
     
     Returns:
     - Success message with projection count and summary metrics
     """
     try:
+        request = request or FinancialCalculationRequest()
+        
         # Get form data and validate
         form = await get_form_data(form_id, current_user.id)
         
-        logger.info(f"Calculating financial projections for form {form_id}")
-        
-        # Calculate monthly projections
-        projections = calculate_monthly_projections(form)
-        
-        # Calculate summary metrics
-        total_investment = float(form.financialDetails.totalInvestmentAmount)
-        summary_metrics = calculate_summary_metrics(projections, total_investment)
+        logger.info(f"Calculating {request.horizon_months}-month financial projections for form {form_id}")
         
         # Ensure database connection
         if not prisma.is_connected():
             await prisma.connect()
         
-        # Delete existing projections for this form
-        await prisma.financialprojection.delete_many(
-            where={"formId": form_id}
+        result = await calculate_and_store(
+            prisma,
+            form,
+            request.horizon_months,
+            request.ramp_up,
+            force=request.force
         )
+        summary_metrics = result["summary"]
         
-        # Store projections in database
-        for proj in projections:
-            await prisma.financialprojection.create(
-                data={
-                    "formId": form_id,
-                    "monthNumber": proj["month_number"],
-                    "revenue": Decimal(str(proj["revenue"])),
-                    "fixedCosts": Decimal(str(proj["fixed_costs"])),
-                    "variableCosts": Decimal(str(proj["variable_costs"])),
-                    "profitLoss": Decimal(str(proj["profit_loss"])),
-                    "cumulativeProfitLoss": Decimal(str(proj["cumulative_profit_loss"]))
-                }
+        if result["cache_hit"]:
+            logger.info(f"Financial inputs unchanged for form {form_id}, returning stored projections")
+            return FinancialCalculationResponse(
+                success=True,
+                message="Financial projections are up to date",
+                form_id=form_id,
+                projections_count=result["projections_count"],
+                summary=summary_metrics,
+                cache_hit=True
             )
         
-        # Delete existing summary
-        await prisma.financialsummary.delete_many(
-            where={"formId": form_id}
-        )
-        
-        # Store summary
-        await prisma.financialsummary.create(
-            data={
-                "formId": form_id,
-                "breakevenMonths": summary_metrics["breakeven_months"],
-                "roiPercentage": Decimal(str(summary_metrics["roi_percentage"])),
-                "paybackPeriodMonths": summary_metrics["payback_period_months"],
-                "npv": Decimal(str(summary_metrics["npv"])),
-                "profitMarginPercentage": Decimal(str(summary_metrics["profit_margin_percentage"])),
-                "calculatedAt": datetime.now(timezone.utc)
-            }
-        )
-        
         logger.info(f"✅ Successfully calculated projections for form {form_id}")
         logger.info(f"   Break-even: {summary_metrics['breakeven_months']} months")
         logger.info(f"   ROI: {summary_metrics['roi_percentage']}%")
@@ -332,7 +412,7 @@ async def calculate_financial_projections(
             success=True,
             message="Financial projections calculated successfully",
             form_id=form_id,
-            projections_count=len(projections),
+            projections_count=result["projections_count"],
             summary=summary_metrics
         )
         
@@ -346,19 +426,232 @@ async def calculate_financial_projections(
         )
 
 
+@router.post("/{form_id}/simulate",
+             response_model=FinancialSimulationResponse,
+             summary="Run Monte Carlo sensitivity analysis",
+             description="Simulate thousands of price, volume and cost scenarios and return percentile bands")
+async def simulate_financial_projections(
+    form_id: int,
+    request: FinancialSimulationRequest = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Monte Carlo sensitivity and scenario analysis
+    
+    Each distribution describes a multiplier on the form's own value, e.g.
+    price {"distribution": "uniform", "low": 0.9, "high": 1.0} models a price
+    drop of up to 10%. Nothing is written to the database.
+    
+    Request Body (optional):
+    - n_samples: Number of scenarios (default 5000)
+    - seed: Random seed for reproducible results
+    - price, sales_quantity, fixed_costs, variable_costs: Distributions
+      (fixed, normal, uniform or triangular)
+    - horizon_months, ramp_up: As for /calculate
+    
+    Returns:
+    - Percentile bands (p5-p95) of cumulative profit/loss per month
+    - Distributions of break-even month, payback period and NPV
+    """
+    try:
+        request = request or FinancialSimulationRequest()
+        
+        try:
+            distributions = {
+                name: getattr(request, name).to_distribution()
+                for name in ("price", "sales_quantity", "fixed_costs", "variable_costs")
+            }
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        form = await get_form_data(form_id, current_user.id)
+        
+        logger.info(f"Simulating {request.n_samples} scenarios for form {form_id} (seed={request.seed})")
+        
+        result = simulate(
+            ProjectionInputs.from_form(form),
+            request.n_samples,
+            seed=request.seed,
+            horizon_months=request.horizon_months,
+            ramp_up=request.ramp_up,
+            **distributions
+        )
+        
+        return FinancialSimulationResponse(form_id=form_id, **result)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error simulating financial projections for form {form_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to simulate financial projections: {str(e)}"
+        )
+
+
+@router.post("/{form_id}/goal-seek",
+             response_model=FinancialGoalSeekResponse,
+             summary="Solve for an input that meets a target",
+             description="Find the minimum price or sales volume, or the maximum cost, for a target break-even, payback or ROI")
+async def goal_seek_financial_projections(
+    form_id: int,
+    request: FinancialGoalSeekRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Goal seek over the projection engine
+    
+    Runs a vectorized bisection entirely in memory; nothing is written to
+    the database, so users can explore targets without re-running /calculate.
+    
+    Request Body:
+    - variable: price, sales_quantity (multiplier on all years' sales),
+      fixed_costs or variable_costs
+    - target_metric: breakeven_months or payback_period_months (reached at or
+      before target_value) or roi_percentage (at least target_value)
+    - horizon_months, ramp_up: As for /calculate
+    
+    Returns:
+    - The solved value, the resulting inputs and their summary metrics
+    """
+    try:
+        form = await get_form_data(form_id, current_user.id)
+        
+        try:
+            result = goal_seek(
+                ProjectionInputs.from_form(form),
+                request.variable,
+                request.target_metric,
+                request.target_value,
+                horizon_months=request.horizon_months,
+                ramp_up=request.ramp_up
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        logger.info(
+            f"Goal seek for form {form_id}: {request.variable} for {request.target_metric}="
+            f"{request.target_value} -> {result['solved_value']} ({result['evaluations']} evaluations)"
+        )
+        
+        return FinancialGoalSeekResponse(form_id=form_id, **result)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error running goal seek for form {form_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to run goal seek: {str(e)}"
+        )
+
+
+@router.post("/{form_id}/loan",
+             response_model=FinancialLoanResponse,
+             summary="Loan amortization and DSCR",
+             description="Compare EMI schedules and debt service coverage for rate, tenure and moratorium options")
+async def analyze_financial_loan(
+    form_id: int,
+    request: FinancialLoanRequest = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Debt service schedule and DSCR for the form's loan requirement
+    
+    Every rate x tenure x moratorium combination is amortized in one batch
+    and scored against the projected monthly cash flow. Interest is serviced
+    during the moratorium. Results are cached per input fingerprint, so
+    repeated comparisons for an unchanged form are served from memory.
+    
+    Request Body (optional):
+    - annual_interest_rates, tenure_months, moratorium_months: Options to compare
+    - include_schedule: Return the monthly schedule of the first combination
+    - horizon_months, ramp_up: As for /calculate
+    
+    Returns:
+    - EMI, total interest, minimum/average DSCR per combination
+    - Monthly schedule and annual DSCR of the first combination
+    """
+    try:
+        request = request or FinancialLoanRequest()
+        form = await get_form_data(form_id, current_user.id)
+        
+        inputs = ProjectionInputs.from_form(form)
+        loan_amount = float(form.financialDetails.loanRequired)
+        fingerprint = loan_fingerprint(
+            inputs,
+            loan_amount,
+            request.annual_interest_rates,
+            request.tenure_months,
+            request.moratorium_months,
+            request.horizon_months,
+            request.ramp_up,
+            request.include_schedule
+        )
+        
+        result = loan_analysis_cache.get(fingerprint)
+        if result is not None:
+            return FinancialLoanResponse(form_id=form_id, cache_hit=True, **result)
+        
+        try:
+            result = analyze_loan(
+                inputs,
+                loan_amount,
+                request.annual_interest_rates,
+                request.tenure_months,
+                request.moratorium_months,
+                horizon_months=request.horizon_months,
+                ramp_up=request.ramp_up,
+                include_schedule=request.include_schedule
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        loan_analysis_cache.put(fingerprint, result)
+        logger.info(f"Loan analysis for form {form_id}: {len(result['scenarios'])} scenarios")
+        
+        return FinancialLoanResponse(form_id=form_id, **result)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error analyzing loan for form {form_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to analyze loan: {str(e)}"
+        )
+
+
 @router.get("/{form_id}/projections",
-            response_model=FinancialProjectionsResponse,
+            response_model=Union[FinancialProjectionsResponse, FinancialProjectionsColumnarResponse],
             summary="Get financial projections",
             description="Retrieve calculated financial projections for a form")
 async def get_financial_projections(
     form_id: int,
+    format: str = Query("rows", pattern="^(rows|columnar)$"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get all financial projections for a form
     
+    Projections are kept fresh by a background recompute after financial
+    sections change; summary.is_stale is true while one is pending.
+    
+    Query Parameters:
+    - format: "rows" (one object per month, default) or "columnar"
+      (one array per metric, smaller payload for charts)
+    
     Returns:
-    - 36-month projections with revenue, costs, profit/loss
+    - Monthly projections with revenue, costs, profit/loss
     - Summary metrics (ROI, break-even, etc.)
     """
     try:
@@ -366,10 +659,10 @@ async def get_financial_projections(
         if not prisma.is_connected():
             await prisma.connect()
         
-        # Verify form ownership
+        # Verify form ownership; compact series and summary come in the same read
         form = await prisma.dprform.find_unique(
             where={"id": form_id},
-            include={"businessDetails": True}
+            include={"projectionSeries": True, "financialSummary": True}
         )
         
         if not form:
@@ -384,36 +677,23 @@ async def get_financial_projections(
                 detail="You don't have permission to access this form"
             )
         
-        # Get projections
-        projections = await prisma.financialprojection.find_many(
-            where={"formId": form_id},
-            order={"monthNumber": "asc"}
-        )
+        if form.projectionSeries:
+            columns = projection_columns_from_record(form.projectionSeries)
+        else:
+            # Fall back to per-month rows (row storage or not yet migrated)
+            projections = await prisma.financialprojection.find_many(
+                where={"formId": form_id},
+                order={"monthNumber": "asc"}
+            )
+            columns = projection_columns_from_rows(projections)
         
-        if not projections:
+        if not columns["month_number"]:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No financial projections found. Please calculate projections first."
             )
         
-        # Get summary
-        summary = await prisma.financialsummary.find_unique(
-            where={"formId": form_id}
-        )
-        
-        # Format response
-        projection_list = [
-            FinancialProjectionMonth(
-                month_number=p.monthNumber,
-                revenue=float(p.revenue),
-                fixed_costs=float(p.fixedCosts),
-                variable_costs=float(p.variableCosts),
-                profit_loss=float(p.profitLoss),
-                cumulative_profit_loss=float(p.cumulativeProfitLoss)
-            )
-            for p in projections
-        ]
-        
+        summary = form.financialSummary
         summary_response = None
         if summary:
             summary_response = FinancialSummaryResponse(
@@ -424,13 +704,45 @@ async def get_financial_projections(
                 payback_period_months=summary.paybackPeriodMonths,
                 npv=float(summary.npv),
                 profit_margin_percentage=float(summary.profitMarginPercentage),
-                calculated_at=summary.calculatedAt.isoformat()
+                calculated_at=summary.calculatedAt.isoformat(),
+                is_stale=summary.isStale
             )
         
+        total_months = len(columns["month_number"])
+        
+        if format == "columnar":
+            return FinancialProjectionsColumnarResponse(
+                form_id=form_id,
+                business_name=form.businessName,
+                total_months=total_months,
+                columns=FinancialProjectionColumns(**columns),
+                summary=summary_response
+            )
+        
+        # Format response
+        projection_list = [
+            FinancialProjectionMonth(
+                month_number=month,
+                revenue=revenue,
+                fixed_costs=fixed,
+                variable_costs=variable,
+                profit_loss=profit,
+                cumulative_profit_loss=cumulative
+            )
+            for month, revenue, fixed, variable, profit, cumulative in zip(
+                columns["month_number"],
+                columns["revenue"],
+                columns["fixed_costs"],
+                columns["variable_costs"],
+                columns["profit_loss"],
+                columns["cumulative_profit_loss"]
+            )
+        ]
+        
         return FinancialProjectionsResponse(
             form_id=form_id,
             business_name=form.businessName,
-            total_months=len(projection_list),
+            total_months=total_months,
             projections=projection_list,
             summary=summary_response
         )
@@ -510,7 +822,8 @@ async def get_financial_summary(
             payback_period_months=summary.paybackPeriodMonths,
             npv=float(summary.npv),
             profit_margin_percentage=float(summary.profitMarginPercentage),
-            calculated_at=summary.calculatedAt.isoformat()
+            calculated_at=summary.calculatedAt.isoformat(),
+            is_stale=summary.isStale
         )
         
     except HTTPException:
@@ -22,14 +22,6 @@ from models.form_models import (
     StaffingDetailsUpdate,
     TimelineDetailsUpdate,
     CompleteFormResponse,
-    EntrepreneurDetailsResponse,
-    BusinessDetailsResponse,
-    ProductDetailsResponse,
-    FinancialDetailsResponse,
-    RevenueAssumptionsResponse,
-    CostDetailsResponse,
-    StaffingDetailsResponse,
-    TimelineDetailsResponse,
     FormListItem,
     UserFormsResponse,
     AIGenerationRequest,
@@ -41,6 +33,11 @@ from models.form_models import (
 from typing import Union, Optional
 import logging
 from utils.ai_service import ai_service, AVAILABLE_SECTIONS
+from utils.content_compaction import load_content_version
+from utils.financial_recompute import financial_recompute_scheduler, FINANCIAL_INPUT_SECTIONS
+from utils.form_context import form_context_cache, load_form_context
+from utils.form_snapshot import find_latest_contents, load_form_snapshot, refresh_form_snapshot
+from utils.pdf_prerender import pdf_prerender_scheduler
 from datetime import datetime, timezone
 
 # Setup logging
@@ -133,15 +130,17 @@ async def create_form(
         if not prisma.is_connected():
             await prisma.connect()
         
-        # Create new DPR form
-        new_form = await prisma.dprform.create(
-            data={
-                "userId": current_user.id,
-                "businessName": form_data.business_name,
-                "status": "draft",
-                "completionPercentage": 0
-            }
-        )
+        # Create new DPR form (and its snapshot)
+        async with prisma.tx() as transaction:
+            new_form = await transaction.dprform.create(
+                data={
+                    "userId": current_user.id,
+                    "businessName": form_data.business_name,
+                    "status": "draft",
+                    "completionPercentage": 0
+                }
+            )
+            await refresh_form_snapshot(transaction, new_form.id)
         
         logger.info(f"New DPR form created: {new_form.id} for user {current_user.id} ({current_user.email})")
         
@@ -266,23 +265,10 @@ async def get_complete_form(
         if not prisma.is_connected():
             await prisma.connect()
         
-        # Retrieve form with all related sections
-        form = await prisma.dprform.find_unique(
-            where={"id": form_id},
-            include={
-                "entrepreneurDetails": True,
-                "businessDetails": True,
-                "productDetails": True,
-                "financialDetails": True,
-                "revenueAssumptions": True,
-                "costDetails": True,
-                "staffingDetails": True,
-                "timelineDetails": True,
-                "generatedContents": True
-            }
-        )
+        # One row with every section already in the response shape
+        snapshot = await load_form_snapshot(prisma, form_id)
         
-        if form is None:
+        if snapshot is None:
             logger.warning(f"Form {form_id} not found")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -290,136 +276,20 @@ async def get_complete_form(
             )
         
         # Check if user owns the form (only if authenticated)
-        if current_user and form.userId != current_user.id:
-            logger.warning(f"User {current_user.id} attempted to access form {form_id} owned by user {form.userId}")
+        if current_user and snapshot["user_id"] != current_user.id:
+            logger.warning(f"User {current_user.id} attempted to access form {form_id} owned by user {snapshot['user_id']}")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to access this form"
             )
         
-        # Build complete response
-        response_data = {
-            "id": form.id,
-            "user_id": form.userId,
-            "business_name": form.businessName,
-            "status": form.status,
-            "completion_percentage": form.completionPercentage,
-            "created_at": form.createdAt,
-            "last_modified": form.lastModified
-        }
-        
-        # Add entrepreneur details if exists
-        if form.entrepreneurDetails:
-            response_data["entrepreneur_details"] = EntrepreneurDetailsResponse(
-                full_name=form.entrepreneurDetails.fullName,
-                date_of_birth=form.entrepreneurDetails.dateOfBirth,
-                education=form.entrepreneurDetails.education,
-                years_of_experience=form.entrepreneurDetails.yearsOfExperience,
-                previous_business_experience=form.entrepreneurDetails.previousBusinessExperience,
-                technical_skills=form.entrepreneurDetails.technicalSkills
-            )
-        
-        # Add business details if exists
-        if form.businessDetails:
-            response_data["business_details"] = BusinessDetailsResponse(
-                business_name=form.businessDetails.businessName,
-                sector=form.businessDetails.sector,
-                sub_sector=form.businessDetails.subSector,
-                legal_structure=form.businessDetails.legalStructure,
-                registration_number=form.businessDetails.registrationNumber,
-                location=form.businessDetails.location,
-                address=form.businessDetails.address
-            )
-        
-        # Add product details if exists
-        if form.productDetails:
-            response_data["product_details"] = ProductDetailsResponse(
-                product_name=form.productDetails.productName,
-                description=form.productDetails.description,
-                key_features=form.productDetails.keyFeatures,
-                target_customers=form.productDetails.targetCustomers,
-                current_capacity=form.productDetails.currentCapacity,
-                planned_capacity=form.productDetails.plannedCapacity,
-                unique_selling_points=form.productDetails.uniqueSellingPoints,
-                quality_certifications=form.productDetails.qualityCertifications
-            )
-        
-        # Add financial details if exists
-        if form.financialDetails:
-            response_data["financial_details"] = FinancialDetailsResponse(
-                total_investment_amount=form.financialDetails.totalInvestmentAmount,
-                land_cost=form.financialDetails.landCost,
-                building_cost=form.financialDetails.buildingCost,
-                machinery_cost=form.financialDetails.machineryCost,
-                working_capital=form.financialDetails.workingCapital,
-                other_costs=form.financialDetails.otherCosts,
-                own_contribution=form.financialDetails.ownContribution,
-                loan_required=form.financialDetails.loanRequired
-            )
-        
-        # Add revenue assumptions if exists
-        if form.revenueAssumptions:
-            response_data["revenue_assumptions"] = RevenueAssumptionsResponse(
-                product_price=form.revenueAssumptions.productPrice,
-                monthly_sales_quantity_year1=form.revenueAssumptions.monthlySalesQuantityYear1,
-                monthly_sales_quantity_year2=form.revenueAssumptions.monthlySalesQuantityYear2,
-                monthly_sales_quantity_year3=form.revenueAssumptions.monthlySalesQuantityYear3,
-                growth_rate_percentage=form.revenueAssumptions.growthRatePercentage
-            )
-        
-        # Add cost details if exists
-        if form.costDetails:
-            response_data["cost_details"] = CostDetailsResponse(
-                raw_material_cost_monthly=form.costDetails.rawMaterialCostMonthly,
-                labor_cost_monthly=form.costDetails.laborCostMonthly,
-                utilities_cost_monthly=form.costDetails.utilitiesCostMonthly,
-                rent_monthly=form.costDetails.rentMonthly,
-                marketing_cost_monthly=form.costDetails.marketingCostMonthly,
-                other_fixed_costs_monthly=form.costDetails.otherFixedCostsMonthly
-            )
-        
-        # Add staffing details if exists
-        if form.staffingDetails:
-            response_data["staffing_details"] = StaffingDetailsResponse(
-                total_employees=form.staffingDetails.totalEmployees,
-                management_count=form.staffingDetails.managementCount,
-                technical_staff_count=form.staffingDetails.technicalStaffCount,
-                support_staff_count=form.staffingDetails.supportStaffCount,
-                average_salary=form.staffingDetails.averageSalary
-            )
-        
-        # Add timeline details if exists
-        if form.timelineDetails:
-            response_data["timeline_details"] = TimelineDetailsResponse(
-                land_acquisition_months=form.timelineDetails.landAcquisitionMonths,
-                construction_months=form.timelineDetails.constructionMonths,
-                machinery_installation_months=form.timelineDetails.machineryInstallationMonths,
-                trial_production_months=form.timelineDetails.trialProductionMonths,
-                commercial_production_start_month=form.timelineDetails.commercialProductionStartMonth
-            )
-        
-        # Add generated content if exists
-        if form.generatedContents and len(form.generatedContents) > 0:
-            # Convert array of generated content to sections object
-            sections = {}
-            generated_at = None
-            for content in form.generatedContents:
-                sections[content.sectionName] = content.generatedText
-                if generated_at is None or content.generatedAt > generated_at:
-                    generated_at = content.generatedAt
-            
-            response_data["generated_content"] = {
-                "sections": sections,
-                "generated_at": generated_at
-            }
-        
         if current_user:
             logger.info(f"Complete form {form_id} retrieved by user {current_user.id} ({current_user.email})")
         else:
             logger.info(f"Complete form {form_id} retrieved without authentication (PDF generation)")
 
         
-        return CompleteFormResponse(**response_data)
+        return CompleteFormResponse.model_validate(snapshot)
         
     except HTTPException:
         raise
@@ -493,11 +363,16 @@ async def update_form(
                 detail="No fields to update"
             )
         
-        # Update form
-        updated_form = await prisma.dprform.update(
-            where={"id": form_id},
-            data=update_data
-        )
+        # Update form (and its snapshot)
+        async with prisma.tx() as transaction:
+            updated_form = await transaction.dprform.update(
+                where={"id": form_id},
+                data=update_data
+            )
+            await refresh_form_snapshot(transaction, form_id)
+        
+        if updated_form.completionPercentage >= 100:
+            pdf_prerender_scheduler.schedule(form_id)
         
         logger.info(f"Form {form_id} updated by user {current_user.id} ({current_user.email})")
         
@@ -521,7 +396,7 @@ async def update_form(
         )
 
 
-async def calculate_completion_percentage(form_id: int) -> int:
+async def calculate_completion_percentage(form_id: int, db: Prisma = prisma) -> int:
     """
     Calculate form completion percentage based on filled sections
     
@@ -536,41 +411,55 @@ async def calculate_completion_percentage(form_id: int) -> int:
     completed_sections = 0
     
     # Check each section
-    entrepreneur = await prisma.entrepreneurdetails.find_unique(where={"formId": form_id})
+    entrepreneur = await db.entrepreneurdetails.find_unique(where={"formId": form_id})
     if entrepreneur:
         completed_sections += 1
     
-    business = await prisma.businessdetails.find_unique(where={"formId": form_id})
+    business = await db.businessdetails.find_unique(where={"formId": form_id})
     if business:
         completed_sections += 1
     
-    product = await prisma.productdetails.find_unique(where={"formId": form_id})
+    product = await db.productdetails.find_unique(where={"formId": form_id})
     if product:
         completed_sections += 1
     
-    financial = await prisma.financialdetails.find_unique(where={"formId": form_id})
+    financial = await db.financialdetails.find_unique(where={"formId": form_id})
     if financial:
         completed_sections += 1
     
-    revenue = await prisma.revenueassumptions.find_unique(where={"formId": form_id})
+    revenue = await db.revenueassumptions.find_unique(where={"formId": form_id})
     if revenue:
         completed_sections += 1
     
-    cost = await prisma.costdetails.find_unique(where={"formId": form_id})
+    cost = await db.costdetails.find_unique(where={"formId": form_id})
     if cost:
         completed_sections += 1
     
-    staffing = await prisma.staffingdetails.find_unique(where={"formId": form_id})
+    staffing = await db.staffingdetails.find_unique(where={"formId": form_id})
     if staffing:
         completed_sections += 1
     
-    timeline = await prisma.timelinedetails.find_unique(where={"formId": form_id})
+    timeline = await db.timelinedetails.find_unique(where={"formId": form_id})
     if timeline:
         completed_sections += 1
     
     return int((completed_sections / total_sections) * 100)
 
 
+async def set_form_status(form_id: int, form_status: str):
+    """Update a form's status and its snapshot in one transaction"""
+    async with prisma.tx() as transaction:
+        await transaction.dprform.update(
+            where={"id": form_id},
+            data={"status": form_status}
+        )
+        snapshot = await refresh_form_snapshot(transaction, form_id)
+    
+    # The next generation for this form starts from the cached context
+    if snapshot is not None:
+        form_context_cache.store(snapshot)
+
+
 @router.put("/{form_id}/section/{section_name}", response_model=SectionUpdateResponse)
 async def update_form_section(
     form_id: int,
@@ -662,17 +551,29 @@ async def update_form_section(
                 detail=f"Invalid data for section '{section_name}': {str(e)}"
             )
         
-        # Update the section
-        await handler(form_id, validated_data)
+        # Update the section, completion percentage and snapshot together
+        async with prisma.tx() as transaction:
+            await handler(form_id, validated_data, transaction)
+            
+            # Recalculate completion percentage
+            completion_percentage = await calculate_completion_percentage(form_id, transaction)
+            
+            # Update form's completion percentage
+            updated_form = await transaction.dprform.update(
+                where={"id": form_id},
+                data={"completionPercentage": completion_percentage}
+            )
+            await refresh_form_snapshot(transaction, form_id)
         
-        # Recalculate completion percentage
-        completion_percentage = await calculate_completion_percentage(form_id)
+        # Stored projections depend on these sections; refresh them in the background
+        if section_name in FINANCIAL_INPUT_SECTIONS:
+            await financial_recompute_scheduler.mark_stale(form_id)
         
-        # Update form's completion percentage
-        updated_form = await prisma.dprform.update(
-            where={"id": form_id},
-            data={"completionPercentage": completion_percentage}
-        )
+        # Pre-build the PDF of a complete form; edits restart the wait
+        if completion_percentage >= 100:
+            pdf_prerender_scheduler.schedule(form_id)
+        else:
+            pdf_prerender_scheduler.cancel(form_id)
         
         logger.info(f"Section '{section_name}' updated for form {form_id} by user {current_user.id}")
         
@@ -697,7 +598,7 @@ async def update_form_section(
 
 # Section update helper functions
 
-async def update_entrepreneur_section(form_id: int, data: EntrepreneurDetailsUpdate):
+async def update_entrepreneur_section(form_id: int, data: EntrepreneurDetailsUpdate, db: Prisma = prisma):
     """Update entrepreneur details section"""
     update_dict = {}
     if data.full_name is not None:
@@ -721,11 +622,11 @@ async def update_entrepreneur_section(form_id: int, data: EntrepreneurDetailsUpd
         )
     
     # Check if section exists
-    existing = await prisma.entrepreneurdetails.find_unique(where={"formId": form_id})
+    existing = await db.entrepreneurdetails.find_unique(where={"formId": form_id})
     
     if existing:
         # Update existing
-        await prisma.entrepreneurdetails.update(
+        await db.entrepreneurdetails.update(
             where={"formId": form_id},
             data=update_dict
         )
@@ -736,7 +637,7 @@ async def update_entrepreneur_section(form_id: int, data: EntrepreneurDetailsUpd
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="First-time creation requires: full_name, date_of_birth, education, years_of_experience"
             )
-        await prisma.entrepreneurdetails.create(
+        await db.entrepreneurdetails.create(
             data={
                 "formId": form_id,
                 "fullName": data.full_name,
@@ -749,7 +650,7 @@ async def update_entrepreneur_section(form_id: int, data: EntrepreneurDetailsUpd
         )
 
 
-async def update_business_section(form_id: int, data: BusinessDetailsUpdate):
+async def update_business_section(form_id: int, data: BusinessDetailsUpdate, db: Prisma = prisma):
     """Update business details section"""
     update_dict = {}
     if data.business_name is not None:
@@ -773,10 +674,10 @@ async def update_business_section(form_id: int, data: BusinessDetailsUpdate):
             detail="No fields to update in business_details"
         )
     
-    existing = await prisma.businessdetails.find_unique(where={"formId": form_id})
+    existing = await db.businessdetails.find_unique(where={"formId": form_id})
     
     if existing:
-        await prisma.businessdetails.update(
+        await db.businessdetails.update(
             where={"formId": form_id},
             data=update_dict
         )
@@ -786,7 +687,7 @@ async def update_business_section(form_id: int, data: BusinessDetailsUpdate):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="First-time creation requires: business_name, sector, legal_structure, location, address"
             )
-        await prisma.businessdetails.create(
+        await db.businessdetails.create(
             data={
                 "formId": form_id,
                 "businessName": data.business_name,
@@ -800,7 +701,7 @@ async def update_business_section(form_id: int, data: BusinessDetailsUpdate):
         )
 
 
-async def update_product_section(form_id: int, data: ProductDetailsUpdate):
+async def update_product_section(form_id: int, data: ProductDetailsUpdate, db: Prisma = prisma):
     """Update product details section"""
     update_dict = {}
     if data.product_name is not None:
@@ -827,10 +728,10 @@ async def update_product_section(form_id: int, data: ProductDetailsUpdate):
             detail="No fields to update in product_details"
         )
     
-    existing = await prisma.productdetails.find_unique(where={"formId": form_id})
+    existing = await db.productdetails.find_unique(where={"formId": form_id})
     
     if existing:
-        await prisma.productdetails.update(
+        await db.productdetails.update(
             where={"formId": form_id},
             data=update_dict
         )
@@ -840,7 +741,7 @@ async def update_product_section(form_id: int, data: ProductDetailsUpdate):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="First-time creation requires: product_name, description, key_features, target_customers, planned_capacity, unique_selling_points"
             )
-        await prisma.productdetails.create(
+        await db.productdetails.create(
             data={
                 "formId": form_id,
                 "productName": data.product_name,
@@ -855,7 +756,7 @@ async def update_product_section(form_id: int, data: ProductDetailsUpdate):
         )
 
 
-async def update_financial_section(form_id: int, data: FinancialDetailsUpdate):
+async def update_financial_section(form_id: int, data: FinancialDetailsUpdate, db: Prisma = prisma):
     """Update financial details section"""
     update_dict = {}
     if data.total_investment_amount is not None:
@@ -881,10 +782,10 @@ async def update_financial_section(form_id: int, data: FinancialDetailsUpdate):
             detail="No fields to update in financial_details"
         )
     
-    existing = await prisma.financialdetails.find_unique(where={"formId": form_id})
+    existing = await db.financialdetails.find_unique(where={"formId": form_id})
     
     if existing:
-        await prisma.financialdetails.update(
+        await db.financialdetails.update(
             where={"formId": form_id},
             data=update_dict
         )
@@ -898,7 +799,7 @@ async def update_financial_section(form_id: int, data: FinancialDetailsUpdate):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="First-time creation requires all financial fields"
             )
-        await prisma.financialdetails.create(
+        await db.financialdetails.create(
             data={
                 "formId": form_id,
                 "totalInvestmentAmount": data.total_investment_amount,
@@ -913,7 +814,7 @@ async def update_financial_section(form_id: int, data: FinancialDetailsUpdate):
         )
 
 
-async def update_revenue_section(form_id: int, data: RevenueAssumptionsUpdate):
+async def update_revenue_section(form_id: int, data: RevenueAssumptionsUpdate, db: Prisma = prisma):
     """Update revenue assumptions section"""
     update_dict = {}
     if data.product_price is not None:
@@ -933,10 +834,10 @@ async def update_revenue_section(form_id: int, data: RevenueAssumptionsUpdate):
             detail="No fields to update in revenue_assumptions"
         )
     
-    existing = await prisma.revenueassumptions.find_unique(where={"formId": form_id})
+    existing = await db.revenueassumptions.find_unique(where={"formId": form_id})
     
     if existing:
-        await prisma.revenueassumptions.update(
+        await db.revenueassumptions.update(
             where={"formId": form_id},
             data=update_dict
         )
@@ -950,7 +851,7 @@ async def update_revenue_section(form_id: int, data: RevenueAssumptionsUpdate):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="First-time creation requires all revenue assumption fields"
             )
-        await prisma.revenueassumptions.create(
+        await db.revenueassumptions.create(
             data={
                 "formId": form_id,
                 "productPrice": data.product_price,
@@ -962,7 +863,7 @@ async def update_revenue_section(form_id: int, data: RevenueAssumptionsUpdate):
         )
 
 
-async def update_cost_section(form_id: int, data: CostDetailsUpdate):
+async def update_cost_section(form_id: int, data: CostDetailsUpdate, db: Prisma = prisma):
     """Update cost details section"""
     update_dict = {}
     if data.raw_material_cost_monthly is not None:
@@ -984,10 +885,10 @@ async def update_cost_section(form_id: int, data: CostDetailsUpdate):
             detail="No fields to update in cost_details"
         )
     
-    existing = await prisma.costdetails.find_unique(where={"formId": form_id})
+    existing = await db.costdetails.find_unique(where={"formId": form_id})
     
     if existing:
-        await prisma.costdetails.update(
+        await db.costdetails.update(
             where={"formId": form_id},
             data=update_dict
         )
@@ -1001,7 +902,7 @@ async def update_cost_section(form_id: int, data: CostDetailsUpdate):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="First-time creation requires all cost detail fields"
             )
-        await prisma.costdetails.create(
+        await db.costdetails.create(
             data={
                 "formId": form_id,
                 "rawMaterialCostMonthly": data.raw_material_cost_monthly,
@@ -1014,7 +915,7 @@ async def update_cost_section(form_id: int, data: CostDetailsUpdate):
         )
 
 
-async def update_staffing_section(form_id: int, data: StaffingDetailsUpdate):
+async def update_staffing_section(form_id: int, data: StaffingDetailsUpdate, db: Prisma = prisma):
     """Update staffing details section"""
     update_dict = {}
     if data.total_employees is not None:
@@ -1034,10 +935,10 @@ async def update_staffing_section(form_id: int, data: StaffingDetailsUpdate):
             detail="No fields to update in staffing_details"
         )
     
-    existing = await prisma.staffingdetails.find_unique(where={"formId": form_id})
+    existing = await db.staffingdetails.find_unique(where={"formId": form_id})
     
     if existing:
-        await prisma.staffingdetails.update(
+        await db.staffingdetails.update(
             where={"formId": form_id},
             data=update_dict
         )
@@ -1051,7 +952,7 @@ async def update_staffing_section(form_id: int, data: StaffingDetailsUpdate):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="First-time creation requires all staffing detail fields"
             )
-        await prisma.staffingdetails.create(
+        await db.staffingdetails.create(
             data={
                 "formId": form_id,
                 "totalEmployees": data.total_employees,
@@ -1063,7 +964,7 @@ async def update_staffing_section(form_id: int, data: StaffingDetailsUpdate):
         )
 
 
-async def update_timeline_section(form_id: int, data: TimelineDetailsUpdate):
+async def update_timeline_section(form_id: int, data: TimelineDetailsUpdate, db: Prisma = prisma):
     """Update timeline details section"""
     update_dict = {}
     if data.land_acquisition_months is not None:
@@ -1083,10 +984,10 @@ async def update_timeline_section(form_id: int, data: TimelineDetailsUpdate):
             detail="No fields to update in timeline_details"
         )
     
-    existing = await prisma.timelinedetails.find_unique(where={"formId": form_id})
+    existing = await db.timelinedetails.find_unique(where={"formId": form_id})
     
     if existing:
-        await prisma.timelinedetails.update(
+        await db.timelinedetails.update(
             where={"formId": form_id},
             data=update_dict
         )
@@ -1100,7 +1001,7 @@ async def update_timeline_section(form_id: int, data: TimelineDetailsUpdate):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="First-time creation requires all timeline detail fields"
             )
-        await prisma.timelinedetails.create(
+        await db.timelinedetails.create(
             data={
                 "formId": form_id,
                 "landAcquisitionMonths": data.land_acquisition_months,
@@ -1147,28 +1048,17 @@ async def generate_ai_content(
                 detail="AI service is not available. Please check GOOGLE_API_KEY configuration."
             )
         
-        # Verify form exists and belongs to current user
-        form = await prisma.dprform.find_unique(
-            where={"id": form_id},
-            include={
-                "entrepreneurDetails": True,
-                "businessDetails": True,
-                "productDetails": True,
-                "financialDetails": True,
-                "revenueAssumptions": True,
-                "costDetails": True,
-                "staffingDetails": True,
-                "timelineDetails": True
-            }
-        )
+        # Verify form exists and belongs to current user (the context is
+        # reused while the form is unchanged)
+        context = await load_form_context(prisma, form_id)
         
-        if not form:
+        if not context:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Form with ID {form_id} not found"
             )
         
-        if form.userId != current_user.id:
+        if context.user_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to access this form"
@@ -1187,13 +1077,7 @@ async def generate_ai_content(
         
         # Check existing content if not regenerating
         if not request.regenerate:
-            existing_sections = await prisma.generatedcontent.find_many(
-                where={
-                    "formId": form_id,
-                    "sectionName": {"in": sections_to_generate}
-                }
-            )
-            existing_section_names = {content.sectionName for content in existing_sections}
+            existing_section_names = {section["section_name"] for section in context.snapshot["generated_sections"]}
             sections_to_generate = [s for s in sections_to_generate if s not in existing_section_names]
         
         if not sections_to_generate:
@@ -1206,62 +1090,10 @@ async def generate_ai_content(
             )
         
         # Prepare form data for AI service
-        form_data = {
-            "business_name": form.businessName,
-            "entrepreneur_details": {
-                "full_name": form.entrepreneurDetails.fullName if form.entrepreneurDetails else None,
-                "education": form.entrepreneurDetails.education if form.entrepreneurDetails else None,
-                "years_of_experience": form.entrepreneurDetails.yearsOfExperience if form.entrepreneurDetails else None,
-                "previous_business_experience": form.entrepreneurDetails.previousBusinessExperience if form.entrepreneurDetails else None,
-                "technical_skills": form.entrepreneurDetails.technicalSkills if form.entrepreneurDetails else None
-            } if form.entrepreneurDetails else {},
-            "business_details": {
-                "business_name": form.businessDetails.businessName if form.businessDetails else None,
-                "sector": form.businessDetails.sector if form.businessDetails else None,
-                "legal_structure": form.businessDetails.legalStructure if form.businessDetails else None,
-                "location": form.businessDetails.location if form.businessDetails else None,
-                "address": form.businessDetails.address if form.businessDetails else None
-            } if form.businessDetails else {},
-            "product_details": {
-                "product_name": form.productDetails.productName if form.productDetails else None,
-                "description": form.productDetails.description if form.productDetails else None,
-                "key_features": form.productDetails.keyFeatures if form.productDetails else [],
-                "target_customers": form.productDetails.targetCustomers if form.productDetails else None,
-                "planned_capacity": form.productDetails.plannedCapacity if form.productDetails else None,
-                "unique_selling_points": form.productDetails.uniqueSellingPoints if form.productDetails else None,
-                "quality_certifications": form.productDetails.qualityCertifications if form.productDetails else None
-            } if form.productDetails else {},
-            "financial_details": {
-                "total_investment_amount": float(form.financialDetails.totalInvestmentAmount) if form.financialDetails else None,
-                "loan_required": float(form.financialDetails.loanRequired) if form.financialDetails else None,
-                "working_capital": float(form.financialDetails.workingCapital) if form.financialDetails else None
-            } if form.financialDetails else {},
-            "revenue_assumptions": {
-                "product_price": float(form.revenueAssumptions.productPrice) if form.revenueAssumptions else None,
-                "monthly_sales_quantity_year1": form.revenueAssumptions.monthlySalesQuantityYear1 if form.revenueAssumptions else None,
-                "monthly_sales_quantity_year2": form.revenueAssumptions.monthlySalesQuantityYear2 if form.revenueAssumptions else None,
-                "monthly_sales_quantity_year3": form.revenueAssumptions.monthlySalesQuantityYear3 if form.revenueAssumptions else None
-            } if form.revenueAssumptions else {},
-            "cost_details": {
-                "marketing_cost_monthly": float(form.costDetails.marketingCostMonthly) if form.costDetails else None
-            } if form.costDetails else {},
-            "staffing_details": {
-                "total_employees": form.staffingDetails.totalEmployees if form.staffingDetails else None
-            } if form.staffingDetails else {},
-            "timeline_details": {
-                "land_acquisition_months": form.timelineDetails.landAcquisitionMonths if form.timelineDetails else None,
-                "construction_months": form.timelineDetails.constructionMonths if form.timelineDetails else None,
-                "machinery_installation_months": form.timelineDetails.machineryInstallationMonths if form.timelineDetails else None,
-                "trial_production_months": form.timelineDetails.trialProductionMonths if form.timelineDetails else None,
-                "commercial_production_start_month": form.timelineDetails.commercialProductionStartMonth if form.timelineDetails else None
-            } if form.timelineDetails else {}
-        }
+        form_data = context.prompt_data
         
         # Update form status to 'generating'
-        await prisma.dprform.update(
-            where={"id": form_id},
-            data={"status": "generating"}
-        )
+        await set_form_status(form_id, "generating")
         
         # Generate content for each section
         generated_sections = []
@@ -1289,18 +1121,23 @@ async def generate_ai_content(
             else:
                 next_version = 1
             
-            # Store generated content
-            content = await prisma.generatedcontent.create(
-                data={
-                    "formId": form_id,
-                    "sectionName": section_name,
-                    "generatedText": generated_text,
-                    "aiModelUsed": ai_service.get_model_name(),
-                    "confidenceScore": 85,  # Can be calculated based on response quality
-                    "versionNumber": next_version,
-                    "userEdited": False
-                }
-            )
+            # Store generated content and the snapshot together
+            async with prisma.tx() as transaction:
+                content = await transaction.generatedcontent.create(
+                    data={
+                        "formId": form_id,
+                        "sectionName": section_name,
+                        "generatedText": generated_text,
+                        "aiModelUsed": ai_service.get_model_name(),
+                        "confidenceScore": 85,  # Can be calculated based on response quality
+                        "versionNumber": next_version,
+                        "userEdited": False
+                    }
+                )
+                snapshot = await refresh_form_snapshot(transaction, form_id)
+            
+            if snapshot is not None:
+                form_context_cache.store(snapshot)
             
             generated_sections.append(GeneratedSectionResponse(
                 section_name=content.sectionName,
@@ -1312,10 +1149,10 @@ async def generate_ai_content(
             ))
         
         # Update form status back to draft (or completed if all sections done)
-        await prisma.dprform.update(
-            where={"id": form_id},
-            data={"status": "draft"}
-        )
+        await set_form_status(form_id, "draft")
+        
+        if generated_sections and context.response.completion_percentage >= 100:
+            pdf_prerender_scheduler.schedule(form_id)
         
         logger.info(f"✅ Generated {len(generated_sections)} sections for form {form_id}")
         
@@ -1333,10 +1170,7 @@ async def generate_ai_content(
         logger.error(f"Error generating AI content for form {form_id}: {str(e)}")
         # Update form status back to draft on error
         try:
-            await prisma.dprform.update(
-                where={"id": form_id},
-                data={"status": "draft"}
-            )
+            await set_form_status(form_id, "draft")
         except:
             pass
         raise HTTPException(
@@ -1373,18 +1207,8 @@ async def get_generated_content(
                 detail="You don't have permission to access this form"
             )
         
-        # Get all generated content for the form
-        all_generated_content = await prisma.generatedcontent.find_many(
-            where={"formId": form_id}
-        )
-        
-        # Filter to get only the latest version of each section
-        latest_sections = {}
-        for content in all_generated_content:
-            section_name = content.sectionName
-            # Keep the version with the highest versionNumber for each section
-            if section_name not in latest_sections or content.versionNumber > latest_sections[section_name].versionNumber:
-                latest_sections[section_name] = content
+        # Only the latest version of each section (older versions stay in the database)
+        latest_contents = await find_latest_contents(prisma, form_id)
         
         sections = [
             GeneratedSectionResponse(
@@ -1395,7 +1219,7 @@ async def get_generated_content(
                 version_number=content.versionNumber,
                 generated_at=content.generatedAt
             )
-            for content in latest_sections.values()
+            for content in latest_contents
         ]
         
         return GeneratedContentListResponse(
@@ -1415,6 +1239,65 @@ async def get_generated_content(
         )
 
 
+@router.get("/{form_id}/generated-content/{section}/versions/{version_number}", response_model=GeneratedSectionResponse)
+async def get_generated_content_version(
+    form_id: int,
+    section: str,
+    version_number: int,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Get one earlier version of a generated section
+    
+    Compacted versions (past the retention policy's kept versions) are
+    rebuilt from their deltas.
+    """
+    try:
+        # Verify form exists and belongs to current user
+        form = await prisma.dprform.find_unique(
+            where={"id": form_id}
+        )
+        
+        if not form:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Form with ID {form_id} not found"
+            )
+        
+        if form.userId != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to access this form"
+            )
+        
+        version = await load_content_version(prisma, form_id, section, version_number)
+        
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Version {version_number} of section {section} not found"
+            )
+        
+        content, generated_text = version
+        return GeneratedSectionResponse(
+            section_name=content.sectionName,
+            generated_text=generated_text,
+            ai_model_used=content.aiModelUsed,
+            confidence_score=content.confidenceScore,
+            version_number=content.versionNumber,
+            generated_at=content.generatedAt
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving version {version_number} of {section} for form {form_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve generated content: {str(e)}"
+        )
+
+
 # ============================================================
 # AI CONTENT GENERATION - SINGLE SECTION
 # ============================================================
@@ -1454,35 +1337,24 @@ async def generate_single_section(
                 detail=f"Invalid section name: {section}. Valid sections are: {', '.join(AVAILABLE_SECTIONS)}"
             )
         
-        # Verify form exists and belongs to current user
-        form = await prisma.dprform.find_unique(
-            where={"id": form_id},
-            include={
-                "entrepreneurDetails": True,
-                "businessDetails": True,
-                "productDetails": True,
-                "financialDetails": True,
-                "revenueAssumptions": True,
-                "costDetails": True,
-                "staffingDetails": True,
-                "timelineDetails": True
-            }
-        )
+        # Verify form exists and belongs to current user (the context is
+        # reused while the form is unchanged)
+        context = await load_form_context(prisma, form_id)
         
-        if not form:
+        if not context:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Form with ID {form_id} not found"
             )
         
-        if form.userId != current_user.id:
+        if context.user_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to access this form"
             )
         
         # Check if form has enough data for AI generation
-        if not form.entrepreneurDetails or not form.businessDetails:
+        if not context.response.entrepreneur_details or not context.response.business_details:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Form must have at least entrepreneur and business details before generating AI content"
@@ -1491,62 +1363,10 @@ async def generate_single_section(
         logger.info(f"Generating AI content for section '{section}' in form {form_id}")
         
         # Prepare form data for AI service
-        form_data = {
-            "business_name": form.businessName,
-            "entrepreneur_details": {
-                "full_name": form.entrepreneurDetails.fullName if form.entrepreneurDetails else None,
-                "education": form.entrepreneurDetails.education if form.entrepreneurDetails else None,
-                "years_of_experience": form.entrepreneurDetails.yearsOfExperience if form.entrepreneurDetails else None,
-                "previous_business_experience": form.entrepreneurDetails.previousBusinessExperience if form.entrepreneurDetails else None,
-                "technical_skills": form.entrepreneurDetails.technicalSkills if form.entrepreneurDetails else None
-            } if form.entrepreneurDetails else {},
-            "business_details": {
-                "business_name": form.businessDetails.businessName if form.businessDetails else None,
-                "sector": form.businessDetails.sector if form.businessDetails else None,
-                "legal_structure": form.businessDetails.legalStructure if form.businessDetails else None,
-                "location": form.businessDetails.location if form.businessDetails else None,
-                "address": form.businessDetails.address if form.businessDetails else None
-            } if form.businessDetails else {},
-            "product_details": {
-                "product_name": form.productDetails.productName if form.productDetails else None,
-                "description": form.productDetails.description if form.productDetails else None,
-                "key_features": form.productDetails.keyFeatures if form.productDetails else [],
-                "target_customers": form.productDetails.targetCustomers if form.productDetails else None,
-                "planned_capacity": form.productDetails.plannedCapacity if form.productDetails else None,
-                "unique_selling_points": form.productDetails.uniqueSellingPoints if form.productDetails else None,
-                "quality_certifications": form.productDetails.qualityCertifications if form.productDetails else None
-            } if form.productDetails else {},
-            "financial_details": {
-                "total_investment_amount": float(form.financialDetails.totalInvestmentAmount) if form.financialDetails else None,
-                "loan_required": float(form.financialDetails.loanRequired) if form.financialDetails else None,
-                "working_capital": float(form.financialDetails.workingCapital) if form.financialDetails else None
-            } if form.financialDetails else {},
-            "revenue_assumptions": {
-                "product_price": float(form.revenueAssumptions.productPrice) if form.revenueAssumptions else None,
-                "monthly_sales_quantity_year1": form.revenueAssumptions.monthlySalesQuantityYear1 if form.revenueAssumptions else None,
-                "monthly_sales_quantity_year2": form.revenueAssumptions.monthlySalesQuantityYear2 if form.revenueAssumptions else None,
-                "monthly_sales_quantity_year3": form.revenueAssumptions.monthlySalesQuantityYear3 if form.revenueAssumptions else None
-            } if form.revenueAssumptions else {},
-            "cost_details": {
-                "marketing_cost_monthly": float(form.costDetails.marketingCostMonthly) if form.costDetails else None
-            } if form.costDetails else {},
-            "staffing_details": {
-                "total_employees": form.staffingDetails.totalEmployees if form.staffingDetails else None
-            } if form.staffingDetails else {},
-            "timeline_details": {
-                "land_acquisition_months": form.timelineDetails.landAcquisitionMonths if form.timelineDetails else None,
-                "construction_months": form.timelineDetails.constructionMonths if form.timelineDetails else None,
-                "machinery_installation_months": form.timelineDetails.machineryInstallationMonths if form.timelineDetails else None,
-                "trial_production_months": form.timelineDetails.trialProductionMonths if form.timelineDetails else None,
-                "commercial_production_start_month": form.timelineDetails.commercialProductionStartMonth if form.timelineDetails else None
-            } if form.timelineDetails else {}
-        }
+        form_data = context.prompt_data
         
         # Temporarily set status to 'generating'
-        await prisma.dprform.update(
-            where={"id": form_id},
-            data={"status": "generating"}
-        )
+        await set_form_status(form_id, "generating")
         
         try:
             # Generate content for the single section with optional custom prompt
@@ -1570,18 +1390,23 @@ async def generate_single_section(
             
             version_number = 1 if not existing_content else existing_content.versionNumber + 1
             
-            # Store generated content in database
-            generated_content = await prisma.generatedcontent.create(
-                data={
-                    "formId": form_id,
-                    "sectionName": section,
-                    "generatedText": generated_text,
-                    "aiModelUsed": ai_service.get_model_name(),
-                    "confidenceScore": 85,  # Default confidence score
-                    "versionNumber": version_number,
-                    "generatedAt": datetime.now(timezone.utc)
-                }
-            )
+            # Store generated content and the snapshot together
+            async with prisma.tx() as transaction:
+                generated_content = await transaction.generatedcontent.create(
+                    data={
+                        "formId": form_id,
+                        "sectionName": section,
+                        "generatedText": generated_text,
+                        "aiModelUsed": ai_service.get_model_name(),
+                        "confidenceScore": 85,  # Default confidence score
+                        "versionNumber": version_number,
+                        "generatedAt": datetime.now(timezone.utc)
+                    }
+                )
+                snapshot = await refresh_form_snapshot(transaction, form_id)
+            
+            if snapshot is not None:
+                form_context_cache.store(snapshot)
             
             # Create response
             section_response = GeneratedSectionResponse(
@@ -1595,6 +1420,9 @@ async def generate_single_section(
             
             logger.info(f"Successfully generated section '{section}' for form {form_id} (version {version_number})")
             
+            if context.response.completion_percentage >= 100:
+                pdf_prerender_scheduler.schedule(form_id)
+            
             return AIGenerationResponse(
                 success=True,
                 message=f"AI content generated successfully for {section}",
@@ -1605,10 +1433,7 @@ async def generate_single_section(
             
         finally:
             # Reset status back to 'draft'
-            await prisma.dprform.update(
-                where={"id": form_id},
-                data={"status": "draft"}
-            )
+            await set_form_status(form_id, "draft")
     
     except HTTPException:
         raise
@@ -1679,6 +1504,11 @@ async def delete_form(
             where={"formId": form_id}
         )
         
+        # Delete compact projection series
+        await prisma.financialprojectionseries.delete_many(
+            where={"formId": form_id}
+        )
+        
         # Delete financial summary
         await prisma.financialsummary.delete_many(
             where={"formId": form_id}
@@ -1688,6 +1518,8 @@ async def delete_form(
         await prisma.dprform.delete(
             where={"id": form_id}
         )
+        pdf_prerender_scheduler.cancel(form_id)
+        form_context_cache.discard(form_id)
         
         logger.info(f"Form {form_id} deleted successfully by user {current_user.id} ({current_user.email})")
         
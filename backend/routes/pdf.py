@@ -3,21 +3,264 @@ PDF Generation Routes - Task 16
 Handles PDF generation from form data using Playwright
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
 from prisma import Prisma
+from starlette.background import BackgroundTask
 from middleware.auth import get_current_user
-from playwright.sync_api import sync_playwright
+from utils.download_counter import download_counter
+from utils.dpr_html import render_dpr_html
+from utils.form_context import load_form_context, load_form_contexts
+from utils.pdf_cache import etag_matches, find_cached_pdf, pdf_content_hash, pdf_etag
+from utils.pdf_native import render_dpr_pdf, uses_native_renderer
+from utils.pdf_optimize import PDF_OPTIMIZE, OptimizeResult, optimize_pdf
+from utils.pdf_prerender import (
+    PDF_PRERENDER_LANGUAGE,
+    PDF_PRERENDER_TEMPLATE_TYPE,
+    is_ready_for_prerender,
+    pdf_prerender_scheduler
+)
+from utils.pdf_renderer import PDF_OPTIONS, PdfRendererBusy, browser_pool, context_options_for
+from utils.pdf_storage import get_storage, storage_for
+import asyncio
+import json
 import os
 import logging
+import tempfile
+import time
+import zipfile
 from datetime import datetime
-from typing import Optional
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from urllib.parse import quote
 
 router = APIRouter(prefix="/pdf", tags=["PDF Generation"])
 logger = logging.getLogger(__name__)
 
+# Where the DPR HTML comes from:
+# - server: rendered by the backend (Jinja2) and loaded with set_content
+# - frontend: Chromium navigates to FRONTEND_URL/pdf/{form_id}
+PDF_RENDER_SOURCES = ("server", "frontend")
+PDF_RENDER_SOURCE = os.getenv("PDF_RENDER_SOURCE", "server")
+if PDF_RENDER_SOURCE not in PDF_RENDER_SOURCES:
+    raise ValueError(f"PDF_RENDER_SOURCE must be one of: {', '.join(PDF_RENDER_SOURCES)}")
+
+PDF_LANGUAGES = ("english", "telugu")
+PDF_TEMPLATE_TYPES = ("basic", "professional", "bank-ready")
+
+# Hand file transfer to a fronting proxy instead of streaming from Python:
+# - x-accel-redirect: nginx, internal location PDF_ACCEL_REDIRECT_PREFIX
+#   aliased to the uploads directory
+# - x-sendfile: Apache mod_xsendfile / lighttpd, given the absolute path
+PDF_SENDFILE_MODES = ("", "x-accel-redirect", "x-sendfile")
+PDF_SENDFILE_MODE = os.getenv("PDF_SENDFILE_MODE", "").lower()
+if PDF_SENDFILE_MODE not in PDF_SENDFILE_MODES:
+    raise ValueError(f"PDF_SENDFILE_MODE must be empty or one of: {', '.join(PDF_SENDFILE_MODES[1:])}")
+PDF_ACCEL_REDIRECT_PREFIX = os.getenv("PDF_ACCEL_REDIRECT_PREFIX", "/protected-uploads/")
+
+# Upper bound on (form, language, template) jobs per batch request
+PDF_BATCH_MAX_JOBS = int(os.getenv("PDF_BATCH_MAX_JOBS", "100"))
+
+
+class PdfBatchJob(BaseModel):
+    form_id: int
+    language: str = "english"
+    template_type: str = "professional"
+    
+    @field_validator('language')
+    @classmethod
+    def validate_language(cls, v):
+        if v not in PDF_LANGUAGES:
+            raise ValueError(f"Language must be one of: {', '.join(PDF_LANGUAGES)}")
+        return v
+    
+    @field_validator('template_type')
+    @classmethod
+    def validate_template_type(cls, v):
+        if v not in PDF_TEMPLATE_TYPES:
+            raise ValueError(f"Template type must be one of: {', '.join(PDF_TEMPLATE_TYPES)}")
+        return v
+
+
+class PdfBatchRequest(BaseModel):
+    jobs: List[PdfBatchJob] = Field(..., min_length=1, max_length=PDF_BATCH_MAX_JOBS)
+    
+    @field_validator('jobs')
+    @classmethod
+    def validate_unique_jobs(cls, v):
+        keys = [(job.form_id, job.language, job.template_type) for job in v]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Each (form, language, template) combination may only appear once")
+        return v
+
+
+class PdfArchiveRequest(BaseModel):
+    pdf_ids: List[int] = Field(..., min_length=1, max_length=PDF_BATCH_MAX_JOBS)
+
+
+def pdf_download_url(pdf_document) -> str:
+    """Authenticated download endpoint of a stored PDF"""
+    return f"/api/pdf/{pdf_document.id}/download"
+
+
+def pdf_url(pdf_document) -> str:
+    """
+    Link to a stored PDF: the public /uploads file for local storage; PDFs in
+    object storage are only reachable through the download endpoint
+    """
+    if pdf_document.storageDriver == "local":
+        return pdf_document.fileUrl
+    return pdf_download_url(pdf_document)
+
+
+def pdf_response_data(pdf_document) -> dict:
+    """Response payload describing a stored PDF document"""
+    return {
+        "pdfId": pdf_document.id,
+        "pdfUrl": pdf_url(pdf_document),
+        "downloadUrl": pdf_download_url(pdf_document),
+        "fileName": pdf_document.fileName,
+        "fileSize": pdf_document.fileSize,
+        "language": pdf_document.language,
+        "templateType": pdf_document.templateType,
+        "generatedAt": pdf_document.generatedAt.isoformat()
+    }
+
+
+async def produce_form_pdf(db: Prisma, form, matched_schemes, language: str, template_type: str) -> Tuple[object, bool]:
+    """
+    Return the PdfDocument for one (form, language, template) combination,
+    rendering and storing it unless an identical PDF already exists
+    
+    Returns (pdf_document, cached). Raises PdfRendererBusy when no browser is
+    available; any other exception means rendering failed.
+    """
+    form_id = form.id
+    renderer = "native" if uses_native_renderer(template_type, language) else PDF_RENDER_SOURCE
+    
+    # Reuse an existing PDF when nothing that affects it has changed
+    html = render_dpr_html(form, matched_schemes, language, template_type)
+    content_hash = pdf_content_hash(html, language, template_type, renderer)
+    
+    # Frontend renders also depend on the frontend build, which the hash
+    # cannot see, so only server and native renders are reused
+    if renderer != "frontend":
+        cached_pdf = await find_cached_pdf(db, form_id, content_hash)
+        if cached_pdf:
+            logger.info(f"Reusing PDF {cached_pdf.id} for form {form_id} (content unchanged)")
+            return cached_pdf, True
+    
+    # Render the PDF (natively, or with the pooled browser)
+    pdf_filename = (
+        f"DPR_{form.businessName.replace(' ', '_')}_{form_id}_{language}_{template_type}_"
+        f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    )
+    storage = get_storage()
+    descriptor, pdf_path = tempfile.mkstemp(suffix=".pdf")
+    os.close(descriptor)
+    try:
+        started = time.perf_counter()
+        await render_pdf_file(renderer, pdf_path, html, form, matched_schemes, language, template_type)
+        render_ms = round((time.perf_counter() - started) * 1000)
+        optimized = await optimize_rendered_pdf(pdf_path)
+        stored = await asyncio.to_thread(storage.save_file, pdf_path)
+    finally:
+        os.remove(pdf_path)
+    logger.info(f"PDF generated successfully with the {renderer} renderer: {storage.name}:{stored.key}")
+    
+    # Save PDF metadata to database
+    pdf_document = await db.pdfdocument.create(
+        data={
+            "formId": form_id,
+            "fileUrl": f"/uploads/{stored.key}",
+            "fileName": pdf_filename,
+            "fileSize": stored.size,
+            "language": language,
+            "templateType": template_type,
+            "downloadCount": 0,
+            "contentHash": content_hash,
+            "storageDriver": storage.name,
+            "storageKey": stored.key,
+            "checksum": stored.checksum,
+            "renderMs": render_ms,
+            "originalFileSize": optimized.original_size if optimized else None,
+            "optimizeMs": optimized.duration_ms if optimized else None
+        }
+    )
+    
+    logger.info(f"PDF metadata saved to database: ID {pdf_document.id}")
+    return pdf_document, False
+
+
+async def optimize_rendered_pdf(pdf_path: str) -> Optional[OptimizeResult]:
+    """Run the PDF_OPTIMIZE post-processing; a failure keeps the file as rendered"""
+    if PDF_OPTIMIZE == "off":
+        return None
+    try:
+        result = await asyncio.to_thread(optimize_pdf, pdf_path)
+    except Exception as e:
+        logger.error(f"PDF optimization failed, keeping the rendered file: {str(e)}")
+        return None
+    logger.info(
+        f"PDF optimized from {result.original_size} to {result.optimized_size} bytes "
+        f"in {result.duration_ms} ms ({result.images_recompressed} images recompressed)"
+    )
+    return result
+
+
+async def render_pdf_file(renderer: str, pdf_path: str, html: str, form, matched_schemes, language: str, template_type: str):
+    """Write the rendered PDF to pdf_path"""
+    form_id = form.id
+    if renderer == "native":
+        # Written directly with fpdf2, no browser involved
+        pdf_bytes = await asyncio.to_thread(render_dpr_pdf, form, matched_schemes, language, template_type)
+        with open(pdf_path, "wb") as pdf_file:
+            pdf_file.write(pdf_bytes)
+    elif renderer == "server":
+        # Self-contained HTML (inlined CSS, no external requests), so the
+        # page is ready as soon as it has loaded
+        def render_pdf(page):
+            page.set_content(html, wait_until="load", timeout=30000)
+            page.pdf(path=pdf_path, **PDF_OPTIONS)
+    else:
+        frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
+        pdf_render_url = f"{frontend_url}/pdf/{form_id}"
+        logger.info(f"Rendering PDF from URL: {pdf_render_url}")
+        
+        def render_pdf(page):
+            # Navigate to the preview page
+            page.goto(pdf_render_url, wait_until="networkidle", timeout=60000)
+            
+            # Wait for content to load
+            page.wait_for_selector("body", timeout=30000)
+            
+            # Optional: Wait a bit more for dynamic content
+            page.wait_for_timeout(2000)
+            
+            page.pdf(path=pdf_path, **PDF_OPTIONS)
+    
+    if renderer != "native":
+        await browser_pool.run(render_pdf, context_options_for(renderer))
+
+
+async def prerender_form_pdf(db: Prisma, form_id: int):
+    """Background job: build the default PDF of a completed form ahead of the download click"""
+    context = await load_form_context(db, form_id)
+    form = context.render_form if context else None
+    if not is_ready_for_prerender(form):
+        return
+    
+    matched_schemes = await db.selectedscheme.find_many(
+        where={"formId": form_id},
+        include={"scheme": True}
+    )
+    pdf_document, cached = await produce_form_pdf(
+        db, form, matched_schemes, PDF_PRERENDER_LANGUAGE, PDF_PRERENDER_TEMPLATE_TYPE
+    )
+    if not cached:
+        logger.info(f"Pre-rendered PDF {pdf_document.id} for completed form {form_id}")
+
+
 @router.post("/generate/{form_id}")
 async def generate_pdf(
     form_id: int,
@@ -44,28 +287,14 @@ async def generate_pdf(
         # Step 1: Retrieve all data for PDF generation
         logger.info(f"Generating PDF for form {form_id} by user {current_user.id}")
         
-        # Fetch complete form data with all relations
-        form = await db.dprform.find_unique(
-            where={"id": form_id},
-            include={
-                "user": True,
-                "entrepreneurDetails": True,
-                "businessDetails": True,
-                "productDetails": True,
-                "financialDetails": True,
-                "revenueAssumptions": True,
-                "costDetails": True,
-                "staffingDetails": True,
-                "timelineDetails": True,
-                "generatedContents": True,
-                "financialProjections": True,
-                "financialSummary": True,
-            }
-        )
+        # Complete form data from its snapshot (reused while the form is unchanged)
+        context = await load_form_context(db, form_id)
         
-        if not form:
+        if not context:
             raise HTTPException(status_code=404, detail="Form not found")
         
+        form = context.render_form
+        
         # Verify ownership
         if form.userId != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to generate PDF for this form")
@@ -76,98 +305,25 @@ async def generate_pdf(
             include={"scheme": True}
         )
         
-        # Step 2: Determine frontend URL for rendering
-        frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
-        pdf_render_url = f"{frontend_url}/pdf/{form_id}"
-        
-        logger.info(f"Rendering PDF from URL: {pdf_render_url}")
-        
-        # Step 3: Generate PDF using Playwright
-        pdf_filename = f"DPR_{form.businessName.replace(' ', '_')}_{form_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        pdf_path = os.path.join("uploads", pdf_filename)
-        
-        # Define synchronous PDF generation function for thread pool
-        def generate_pdf_sync():
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                try:
-                    context = browser.new_context(
-                        viewport={"width": 1920, "height": 1080},
-                        device_scale_factor=2
-                    )
-                    page = context.new_page()
-                    
-                    # Navigate to the preview page
-                    page.goto(pdf_render_url, wait_until="networkidle", timeout=60000)
-                    
-                    # Wait for content to load
-                    page.wait_for_selector("body", timeout=30000)
-                    
-                    # Optional: Wait a bit more for dynamic content
-                    page.wait_for_timeout(2000)
-                    
-                    # Generate PDF
-                    page.pdf(
-                        path=pdf_path,
-                        format="A4",
-                        print_background=True,
-                        margin={
-                            "top": "20mm",
-                            "right": "15mm",
-                            "bottom": "20mm",
-                            "left": "15mm"
-                        },
-                        prefer_css_page_size=False
-                    )
-                    
-                    logger.info(f"PDF generated successfully: {pdf_path}")
-                    
-                except Exception as e:
-                    logger.error(f"Error generating PDF with Playwright: {str(e)}")
-                    raise HTTPException(status_code=500, detail=f"PDF generation failed: {str(e)}")
-                finally:
-                    browser.close()
-        
-        # Run Playwright in thread pool to avoid Windows asyncio subprocess issues
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            await loop.run_in_executor(executor, generate_pdf_sync)
-        
-        # Step 4: Get PDF file information
-        pdf_url = f"/uploads/{pdf_filename}"
-        file_size = os.path.getsize(pdf_path)
-        logger.info(f"PDF stored locally: {pdf_path}")
-        
-        # Step 5: Save PDF metadata to database
-        pdf_document = await db.pdfdocument.create(
-            data={
-                "formId": form_id,
-                "fileUrl": pdf_url,
-                "fileName": pdf_filename,
-                "fileSize": file_size,
-                "language": language,
-                "templateType": template_type,
-                "downloadCount": 0
-            }
-        )
-        
-        logger.info(f"PDF metadata saved to database: ID {pdf_document.id}")
+        # Step 2: Reuse or render the PDF (after a background pre-render of
+        # the same PDF that is already running, which is then a cache hit)
+        await pdf_prerender_scheduler.wait_for(form_id, language, template_type, browser_pool.queue_timeout)
+        try:
+            pdf_document, cached = await produce_form_pdf(db, form, matched_schemes, language, template_type)
+        except PdfRendererBusy as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception as e:
+            logger.error(f"Error generating PDF with Playwright: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"PDF generation failed: {str(e)}")
         
-        # Step 6: Return response
+        # Step 3: Return response
         return JSONResponse(
             status_code=200,
             content={
                 "success": True,
-                "message": "PDF generated successfully",
-                "data": {
-                    "pdfId": pdf_document.id,
-                    "pdfUrl": pdf_url,
-                    "fileName": pdf_filename,
-                    "fileSize": file_size,
-                    "language": language,
-                    "templateType": template_type,
-                    "generatedAt": pdf_document.generatedAt.isoformat()
-                }
+                "message": "PDF is up to date" if cached else "PDF generated successfully",
+                "cached": cached,
+                "data": pdf_response_data(pdf_document)
             }
         )
         
@@ -180,6 +336,351 @@ async def generate_pdf(
         await db.disconnect()
 
 
+@router.post("/batch")
+async def generate_pdf_batch(
+    request: PdfBatchRequest,
+    current_user = Depends(get_current_user)
+):
+    """
+    Generate PDFs for many (form, language, template) combinations at once
+    
+    Jobs share the warm browser pool and run as parallel pages (one per
+    pooled browser). Progress is streamed as newline-delimited JSON: a
+    "started" event, one "progress" event per finished job (in completion
+    order) and a final "completed" event with the manifest of all results in
+    request order. Pass the manifest's pdfIds to /pdf/archive for a zip.
+    
+    Args:
+        request: Jobs to render
+        current_user: Authenticated user from JWT
+    
+    Returns:
+        application/x-ndjson stream of progress events
+    """
+    db = Prisma()
+    await db.connect()
+    
+    try:
+        form_ids = sorted({job.form_id for job in request.jobs})
+        logger.info(f"Batch generating {len(request.jobs)} PDFs for {len(form_ids)} forms by user {current_user.id}")
+        
+        # Check ownership on the plain rows before loading (or rebuilding) any snapshot
+        owners = {
+            form.id: form.userId
+            for form in await db.dprform.find_many(where={"id": {"in": form_ids}})
+        }
+        
+        missing = [form_id for form_id in form_ids if form_id not in owners]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Forms not found: {', '.join(map(str, missing))}")
+        
+        if any(user_id != current_user.id for user_id in owners.values()):
+            raise HTTPException(status_code=403, detail="Not authorized to generate PDFs for these forms")
+        
+        # Load every form (and its schemes) once, however many jobs use it
+        forms = {
+            form_id: context.render_form
+            for form_id, context in (await load_form_contexts(db, form_ids)).items()
+        }
+        
+        missing = [form_id for form_id in form_ids if form_id not in forms]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Forms not found: {', '.join(map(str, missing))}")
+        
+        schemes_by_form = {form_id: [] for form_id in form_ids}
+        for selected in await db.selectedscheme.find_many(
+            where={"formId": {"in": form_ids}},
+            include={"scheme": True}
+        ):
+            schemes_by_form[selected.formId].append(selected)
+    except HTTPException:
+        await db.disconnect()
+        raise
+    except Exception as e:
+        await db.disconnect()
+        logger.error(f"Error preparing PDF batch: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    
+    # No more jobs in flight than there are browsers, so a large batch never
+    # fills the renderer's wait queue
+    semaphore = asyncio.Semaphore(browser_pool.size)
+    
+    async def run_job(index: int, job: PdfBatchJob):
+        result = {"formId": job.form_id, "language": job.language, "templateType": job.template_type}
+        async with semaphore:
+            try:
+                pdf_document, cached = await produce_form_pdf(
+                    db, forms[job.form_id], schemes_by_form[job.form_id], job.language, job.template_type
+                )
+                result.update(status="cached" if cached else "generated", data=pdf_response_data(pdf_document))
+            except Exception as e:
+                logger.error(f"Error generating batch PDF for form {job.form_id}: {str(e)}")
+                result.update(status="failed", error=str(e))
+        return index, result
+    
+    def event(payload: dict) -> str:
+        return json.dumps(payload) + "\n"
+    
+    async def stream_events():
+        total = len(request.jobs)
+        results = [None] * total
+        tasks = [asyncio.create_task(run_job(index, job)) for index, job in enumerate(request.jobs)]
+        try:
+            yield event({"event": "started", "total": total})
+            
+            for completed, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+                index, result = await next_result
+                results[index] = result
+                yield event({"event": "progress", "completed": completed, "total": total, "job": result})
+            
+            counts = {status: sum(result["status"] == status for result in results) for status in ("generated", "cached", "failed")}
+            yield event({
+                "event": "completed",
+                "manifest": {
+                    "total": total,
+                    **counts,
+                    "pdfIds": [result["data"]["pdfId"] for result in results if result["status"] != "failed"],
+                    "results": results
+                }
+            })
+        finally:
+            # Client went away: stop unfinished jobs before closing the connection
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await db.disconnect()
+    
+    return StreamingResponse(stream_events(), media_type="application/x-ndjson")
+
+
+def build_pdf_archive(pdf_documents) -> str:
+    """Write the PDFs and a manifest to a temporary zip file and return its path"""
+    manifest = []
+    with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as archive_file:
+        # PDFs are already compressed, so store them as-is
+        with zipfile.ZipFile(archive_file, "w", compression=zipfile.ZIP_STORED) as archive:
+            for pdf in pdf_documents:
+                name = f"{pdf.id}_{os.path.basename(pdf.fileName)}"
+                storage, key = storage_for(pdf)
+                with archive.open(name, "w") as entry:
+                    for chunk in storage.open(key):
+                        entry.write(chunk)
+                manifest.append({**pdf_response_data(pdf), "formId": pdf.formId, "archiveName": name})
+            archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+    return archive_file.name
+
+
+@router.post("/archive")
+async def download_pdf_archive(
+    request: PdfArchiveRequest,
+    current_user = Depends(get_current_user)
+):
+    """
+    Download several PDF documents as one zip file
+    
+    Args:
+        request: IDs of the PDF documents (e.g. a batch manifest's pdfIds)
+        current_user: Authenticated user from JWT
+    
+    Returns:
+        application/zip with the PDFs and a manifest.json
+    """
+    db = Prisma()
+    await db.connect()
+    
+    try:
+        pdf_ids = list(dict.fromkeys(request.pdf_ids))
+        pdf_documents = await db.pdfdocument.find_many(
+            where={"id": {"in": pdf_ids}},
+            include={"form": True}
+        )
+        
+        found = {pdf.id: pdf for pdf in pdf_documents}
+        missing = [pdf_id for pdf_id in pdf_ids if pdf_id not in found]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"PDFs not found: {', '.join(map(str, missing))}")
+        
+        # Verify ownership
+        if any(pdf.form.userId != current_user.id for pdf in pdf_documents):
+            raise HTTPException(status_code=403, detail="Not authorized to access these PDFs")
+        
+        ordered = [found[pdf_id] for pdf_id in pdf_ids]
+        available = await asyncio.gather(*(
+            asyncio.to_thread(storage.exists, key) for storage, key in map(storage_for, ordered)
+        ))
+        unavailable = [pdf.id for pdf, exists in zip(ordered, available) if not exists]
+        if unavailable:
+            raise HTTPException(status_code=410, detail=f"PDF files no longer available: {', '.join(map(str, unavailable))}")
+        
+        archive_path = await asyncio.to_thread(build_pdf_archive, ordered)
+        return FileResponse(
+            archive_path,
+            media_type="application/zip",
+            filename=f"DPR_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+            background=BackgroundTask(os.remove, archive_path)
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error building PDF archive: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    finally:
+        await db.disconnect()
+
+
+def content_disposition(disposition: str, filename: str) -> str:
+    """Content-Disposition header value, RFC 5987-encoded for non-ASCII names"""
+    quoted_name = quote(filename)
+    if quoted_name == filename:
+        return f'{disposition}; filename="{filename}"'
+    return f"{disposition}; filename*=utf-8''{quoted_name}"
+
+
+def parse_byte_range(http_range: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) of a single "bytes=" range, or None to send the whole file
+    
+    Raises ValueError when the range cannot be satisfied.
+    """
+    units, _, spec = http_range.replace(" ", "").partition("=")
+    if units != "bytes" or not spec or "," in spec:
+        return None
+    first, _, last = spec.partition("-")
+    if not first:
+        if not last.isdigit() or int(last) == 0:
+            raise ValueError(http_range)
+        return max(size - int(last), 0), size - 1
+    if not first.isdigit() or (last and not last.isdigit()):
+        return None
+    start, end = int(first), min(int(last) if last else size - 1, size - 1)
+    if start >= size or start > end:
+        raise ValueError(http_range)
+    return start, end
+
+
+def stream_stored_pdf(storage, key: str, size: int, http_range: str, method: str, headers: dict) -> Response:
+    """Stream a stored PDF (or a single byte range of it) through the app"""
+    try:
+        byte_range = parse_byte_range(http_range, size) if http_range else None
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range is not None:
+        status_code = 206
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    
+    if method == "HEAD":
+        return Response(status_code=status_code, media_type="application/pdf", headers=headers)
+    return StreamingResponse(
+        storage.open(key, start, end),
+        status_code=status_code,
+        media_type="application/pdf",
+        headers=headers
+    )
+
+
+@router.api_route("/{pdf_id}/download", methods=["GET", "HEAD"])
+async def download_pdf(
+    pdf_id: int,
+    request: Request,
+    inline: bool = False,
+    current_user = Depends(get_current_user)
+):
+    """
+    Download a PDF document
+    
+    Supports conditional requests (strong ETag, If-None-Match -> 304) and
+    byte ranges (Range/If-Range -> 206) for resumable downloads. With
+    PDF_SENDFILE_MODE set, the proxy in front of the app sends the file.
+    Only requests that start at the first byte count as a download.
+    
+    Args:
+        pdf_id: ID of the PDF document
+        inline: Display in the browser instead of downloading
+        current_user: Authenticated user from JWT
+    
+    Returns:
+        The PDF file (or 304 / 206 / proxy handoff)
+    """
+    db = Prisma()
+    await db.connect()
+    
+    try:
+        pdf_document = await db.pdfdocument.find_unique(
+            where={"id": pdf_id},
+            include={"form": True}
+        )
+        
+        if not pdf_document:
+            raise HTTPException(status_code=404, detail="PDF not found")
+        
+        # Verify ownership
+        if pdf_document.form.userId != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to access this PDF")
+        
+        storage, key = storage_for(pdf_document)
+        if not await asyncio.to_thread(storage.exists, key):
+            raise HTTPException(status_code=410, detail="PDF file is no longer available, please generate it again")
+        
+        etag = pdf_etag(pdf_document)
+        headers = {
+            "ETag": etag,
+            # A document's file never changes; private because it needs auth
+            "Cache-Control": "private, max-age=31536000, immutable",
+            "Accept-Ranges": "bytes"
+        }
+        
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        
+        http_range = request.headers.get("range", "")
+        if request.method == "GET" and (not http_range or http_range.replace(" ", "").startswith("bytes=0-")):
+            download_counter.increment(pdf_id)
+        
+        disposition = "inline" if inline else "attachment"
+        pdf_path = storage.local_path(key)
+        if pdf_path is None:
+            # Object storage: hand the client a short-lived URL, or stream
+            # the object through the app when presigning is disabled
+            presigned_url = await asyncio.to_thread(storage.presigned_url, key)
+            if presigned_url:
+                return RedirectResponse(presigned_url, status_code=307, headers={"Cache-Control": "no-store"})
+            headers["Content-Disposition"] = content_disposition(disposition, pdf_document.fileName)
+            return stream_stored_pdf(storage, key, pdf_document.fileSize, http_range, request.method, headers)
+        
+        if PDF_SENDFILE_MODE:
+            # The proxy handles Range and streams the file itself
+            if PDF_SENDFILE_MODE == "x-accel-redirect":
+                headers["X-Accel-Redirect"] = PDF_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + quote(key)
+            else:
+                headers["X-Sendfile"] = os.path.abspath(pdf_path)
+            headers["Content-Disposition"] = content_disposition(disposition, pdf_document.fileName)
+            return Response(media_type="application/pdf", headers=headers)
+        
+        # FileResponse answers Range/If-Range itself and uses the server's
+        # zero-copy pathsend extension when available
+        return FileResponse(
+            pdf_path,
+            media_type="application/pdf",
+            filename=pdf_document.fileName,
+            content_disposition_type=disposition,
+            headers=headers
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error downloading PDF: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    finally:
+        await db.disconnect()
+
+
 @router.get("/{pdf_id}")
 async def get_pdf_details(
     pdf_id: int,
@@ -211,11 +712,8 @@ async def get_pdf_details(
         if pdf_document.form.userId != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to access this PDF")
         
-        # Increment download count
-        await db.pdfdocument.update(
-            where={"id": pdf_id},
-            data={"downloadCount": pdf_document.downloadCount + 1}
-        )
+        # Increment download count (buffered, written in batches)
+        download_counter.increment(pdf_id)
         
         return JSONResponse(
             status_code=200,
@@ -225,13 +723,16 @@ async def get_pdf_details(
                     "id": pdf_document.id,
                     "formId": pdf_document.formId,
                     "businessName": pdf_document.form.businessName,
-                    "pdfUrl": pdf_document.fileUrl,
+                    "pdfUrl": pdf_url(pdf_document),
                     "fileName": pdf_document.fileName,
                     "fileSize": pdf_document.fileSize,
+                    "originalFileSize": pdf_document.originalFileSize,
+                    "renderMs": pdf_document.renderMs,
+                    "optimizeMs": pdf_document.optimizeMs,
                     "language": pdf_document.language,
                     "templateType": pdf_document.templateType,
                     "generatedAt": pdf_document.generatedAt.isoformat(),
-                    "downloadCount": pdf_document.downloadCount + 1
+                    "downloadCount": download_counter.current_count(pdf_document)
                 }
             }
         )
@@ -289,13 +790,13 @@ async def list_form_pdfs(
                 "pdfs": [
                     {
                         "id": pdf.id,
-                        "pdfUrl": pdf.fileUrl,
+                        "pdfUrl": pdf_url(pdf),
                         "fileName": pdf.fileName,
                         "fileSize": pdf.fileSize,
                         "language": pdf.language,
                         "templateType": pdf.templateType,
                         "generatedAt": pdf.generatedAt.isoformat(),
-                        "downloadCount": pdf.downloadCount
+                        "downloadCount": download_counter.current_count(pdf)
                     }
                     for pdf in pdfs
                 ]
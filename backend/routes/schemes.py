@@ -7,6 +7,7 @@ from prisma import Prisma
 from middleware.auth import get_current_user, CurrentUser
 from models.scheme_models import SchemeMatchRequest, SchemeMatchResponse, SchemeResponse
 from utils.ai_service import ai_service
+from utils.form_context import load_form_context
 import logging
 import json
 
@@ -252,28 +253,22 @@ async def match_government_schemes(
             await prisma.connect()
         
         # Verify form exists and belongs to current user
-        form = await prisma.dprform.find_unique(
-            where={"id": form_id},
-            include={
-                "businessDetails": True,
-                "financialDetails": True,
-            }
-        )
+        context = await load_form_context(prisma, form_id)
         
-        if not form:
+        if not context:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Form with ID {form_id} not found"
             )
         
-        if form.userId != current_user.id:
+        if context.user_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't have permission to access this form"
             )
         
         # Check if business details exist
-        if not form.businessDetails:
+        if not context.response.business_details:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Business details are required for scheme matching. Please complete the business details section first."
@@ -287,32 +282,14 @@ async def match_government_schemes(
             return SchemeMatchResponse(
                 success=True,
                 form_id=form_id,
-                business_name=form.businessName,
+                business_name=context.response.business_name,
                 total_matches=0,
                 matched_schemes=[],
                 message="No government schemes available in the database. Please contact administrator."
             )
         
-        # Prepare comprehensive form data for AI matching
-        form_data = {
-            "business_name": form.businessName,
-            "business_details": {
-                "sector": form.businessDetails.sector if form.businessDetails else "",
-                "sub_sector": form.businessDetails.subSector if form.businessDetails else "",
-                "legal_structure": form.businessDetails.legalStructure if form.businessDetails else "",
-                "location": form.businessDetails.location if form.businessDetails else "",
-                "address": form.businessDetails.address if form.businessDetails else "",
-            },
-            "financial_details": {
-                "total_investment_amount": form.financialDetails.totalInvestmentAmount if form.financialDetails else 0,
-                "land_cost": form.financialDetails.landCost if form.financialDetails else 0,
-                "building_cost": form.financialDetails.buildingCost if form.financialDetails else 0,
-                "machinery_cost": form.financialDetails.machineryCost if form.financialDetails else 0,
-                "working_capital": form.financialDetails.workingCapital if form.financialDetails else 0,
-                "own_contribution": form.financialDetails.ownContribution if form.financialDetails else 0,
-                "loan_required": form.financialDetails.loanRequired if form.financialDetails else 0,
-            }
-        }
+        # Comprehensive form data for AI matching (shared with AI generation)
+        form_data = context.prompt_data
         
         # Convert schemes to dict format for AI processing
         schemes_dict = []
@@ -367,7 +344,7 @@ async def match_government_schemes(
         return SchemeMatchResponse(
             success=True,
             form_id=form_id,
-            business_name=form.businessName,
+            business_name=context.response.business_name,
             total_matches=len(matched_schemes_response),
             matched_schemes=matched_schemes_response,
             message=f"AI-powered matching found {len(matched_schemes_response)} suitable scheme(s). Showing top {min(len(matched_schemes_response), request.max_results)}."
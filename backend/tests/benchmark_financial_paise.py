@@ -0,0 +1,105 @@
+"""
+Microbenchmark: exact integer-paise path vs the float engine
+Measures projection + summary + DB payload time and counts paise that the
+float path gets wrong after rounding to 2 decimals.
+Run from the backend directory: python tests/benchmark_financial_paise.py
+"""
+import random
+import sys
+import os
+import timeit
+from decimal import Decimal
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.financial_engine import (
+    ProjectionBatch,
+    ProjectionInputs,
+    paise_batch,
+    paise_projection_records,
+    project,
+    project_batch,
+    project_paise,
+    project_paise_batch,
+    projection_records,
+    summarize,
+    summarize_batch,
+    summarize_paise,
+    summarize_paise_batch
+)
+from test_financial_paise import random_paise_inputs
+
+ITERATIONS = 2000
+BATCH_SIZE = 100_000
+FIELDS = ("revenue", "fixedCosts", "variableCosts", "profitLoss", "cumulativeProfitLoss")
+
+
+def as_float_inputs(inputs) -> ProjectionInputs:
+    return ProjectionInputs(
+        product_price=inputs.product_price / 100,
+        monthly_sales_year1=inputs.monthly_sales_year1,
+        monthly_sales_year2=inputs.monthly_sales_year2,
+        monthly_sales_year3=inputs.monthly_sales_year3,
+        growth_rate_percentage=inputs.growth_rate_percentage,
+        fixed_costs_monthly=inputs.fixed_costs_monthly / 100,
+        variable_costs_monthly=inputs.variable_costs_monthly / 100,
+        total_investment=inputs.total_investment / 100
+    )
+
+
+def main():
+    rng = random.Random(42)
+    exact_inputs = [random_paise_inputs(rng) for _ in range(ITERATIONS)]
+    float_inputs = [as_float_inputs(item) for item in exact_inputs]
+
+    def run_float():
+        for item in float_inputs:
+            series = project(item)
+            summarize(series, item.total_investment)
+            projection_records(1, series.to_rows())
+
+    def run_paise():
+        for item in exact_inputs:
+            series = project_paise(item)
+            summarize_paise(series, item.total_investment)
+            paise_projection_records(1, series)
+
+    for name, func in (("float engine + payload", run_float), ("paise engine + payload", run_paise)):
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        print(f"{name:<28} {best / ITERATIONS * 1e6:8.1f} µs per form")
+
+    # Stored values that differ from the exact result by at least one paisa
+    mismatched = 0
+    total = 0
+    for exact_item, float_item in zip(exact_inputs, float_inputs):
+        exact = paise_projection_records(1, project_paise(exact_item))
+        approx = projection_records(1, project(float_item).to_rows())
+        for exact_row, approx_row in zip(exact, approx):
+            for field in FIELDS:
+                total += 1
+                if approx_row[field].quantize(Decimal("0.01")) != exact_row[field]:
+                    mismatched += 1
+    print(f"float values off by >= 1 paisa: {mismatched:,} of {total:,}")
+
+    batch_rng = random.Random(7)
+    batch_inputs = [random_paise_inputs(batch_rng) for _ in range(BATCH_SIZE)]
+    exact_batch = paise_batch(batch_inputs)
+    float_batch = ProjectionBatch.from_inputs([as_float_inputs(item) for item in batch_inputs])
+
+    for name, func in (
+        ("float batch (36 months)", lambda: summarize_batch(project_batch(float_batch), float_batch.total_investment)),
+        ("paise batch (36 months)", lambda: summarize_paise_batch(
+            project_paise_batch(exact_batch), exact_batch.total_investment
+        )),
+        ("paise batch (120 months)", lambda: summarize_paise_batch(
+            project_paise_batch(exact_batch, 120), exact_batch.total_investment
+        )),
+    ):
+        best = min(timeit.repeat(func, number=1, repeat=3))
+        print(f"{name:<28} {best / BATCH_SIZE * 1e6:8.1f} µs per form "
+              f"({BATCH_SIZE:,} forms in {best:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
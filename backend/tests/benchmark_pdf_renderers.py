@@ -0,0 +1,99 @@
+"""
+Benchmark: native fpdf2 DPR renderer vs Chromium (Playwright) rendering
+Renders the same fully populated DPR with both paths and reports time per
+PDF, output size and memory (Python heap for native, browser process tree
+RSS for Chromium). The Chromium half runs only when Playwright and its
+browser are installed (`playwright install chromium`).
+Run from the backend directory: python tests/benchmark_pdf_renderers.py
+"""
+import sys
+import os
+import time
+import timeit
+import tracemalloc
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.dpr_html import render_dpr_html
+from utils.pdf_native import render_dpr_pdf
+from utils.pdf_renderer import CONTEXT_OPTIONS, LAUNCH_ARGS, PDF_OPTIONS
+from test_pdf_native import sample_dpr_form, sample_schemes
+
+ITERATIONS = 50
+CHROMIUM_ITERATIONS = 10
+
+
+def process_tree_rss_mb() -> float:
+    """RSS of this process and its children (the browser), Linux only"""
+    import psutil
+    process = psutil.Process()
+    processes = [process] + process.children(recursive=True)
+    return sum(item.memory_info().rss for item in processes) / (1024 * 1024)
+
+
+def benchmark_native(form, schemes):
+    render = lambda: render_dpr_pdf(form, schemes, "english", "bank-ready")
+    pdf = render()
+    best = min(timeit.repeat(render, number=ITERATIONS, repeat=3)) / ITERATIONS
+
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{'native (fpdf2)':<24} {best * 1000:8.1f} ms per PDF  "
+          f"{len(pdf) / 1024:7.1f} KiB  peak Python heap {peak / (1024 * 1024):.1f} MiB")
+
+
+def benchmark_chromium(form, schemes):
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        print(f"{'chromium (playwright)':<24} skipped: playwright is not installed")
+        return
+
+    html = render_dpr_html(form, schemes, "english", "bank-ready")
+    with sync_playwright() as playwright:
+        try:
+            browser = playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        except Exception as e:
+            print(f"{'chromium (playwright)':<24} skipped: {str(e).splitlines()[0]}")
+            return
+        try:
+            def render() -> bytes:
+                # Same steps as a pooled render: fresh context, set_content, page.pdf
+                context = browser.new_context(**CONTEXT_OPTIONS)
+                try:
+                    page = context.new_page()
+                    page.set_content(html, wait_until="load", timeout=30000)
+                    return page.pdf(**PDF_OPTIONS)
+                finally:
+                    context.close()
+
+            pdf = render()
+            timings = []
+            for _ in range(CHROMIUM_ITERATIONS):
+                started = time.perf_counter()
+                render()
+                timings.append(time.perf_counter() - started)
+
+            try:
+                memory = f"process tree RSS {process_tree_rss_mb():.0f} MiB"
+            except ImportError:
+                memory = "install psutil for memory"
+            print(f"{'chromium (playwright)':<24} {min(timings) * 1000:8.1f} ms per PDF  "
+                  f"{len(pdf) / 1024:7.1f} KiB  {memory}")
+        finally:
+            browser.close()
+
+
+def main():
+    form = sample_dpr_form()
+    schemes = sample_schemes()
+    benchmark_native(form, schemes)
+    benchmark_chromium(form, schemes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Benchmark: hot queries with and without the composite indexes
+Copies the structure of dpr_forms, generated_content, pdf_documents and
+user_activity_log into a scratch schema, seeds it (1M forms by default),
+and runs EXPLAIN (ANALYZE, BUFFERS) for each hot query before and after
+creating the indexes declared in prisma/schema.prisma. Each plan must use
+its index once it exists.
+
+Needs DATABASE_URL pointing at a migrated PostgreSQL database; the scratch
+schema is dropped afterwards (--keep to inspect it).
+Run from the backend directory: python tests/benchmark_query_indexes.py --forms 1000000
+"""
+import argparse
+import asyncio
+import json
+import sys
+import os
+import time
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisma import Prisma
+
+SCHEMA = "index_benchmark"
+TABLES = ("dpr_forms", "generated_content", "pdf_documents", "user_activity_log")
+SECTIONS = (
+    "executive_summary", "market_analysis", "competitive_analysis", "marketing_strategy",
+    "operational_plan", "risk_analysis", "swot_analysis", "implementation_roadmap"
+)
+
+# Same definitions (and Prisma's names) as the @@index entries in schema.prisma
+INDEXES = (
+    ("dpr_forms_user_id_last_modified_idx", "dpr_forms", "user_id, last_modified DESC"),
+    ("generated_content_latest_idx", "generated_content", "form_id, section_name, version_number DESC"),
+    ("pdf_documents_form_id_generated_at_idx", "pdf_documents", "form_id, generated_at DESC"),
+    ("user_activity_log_user_id_timestamp_idx", "user_activity_log", 'user_id, "timestamp"')
+)
+
+# Seeded data: forms spread evenly over the users, three versions of each AI
+# section for every 10th form, three PDFs for every 5th form and three
+# activity log entries per form
+SEED = (
+    """
+    INSERT INTO {schema}.dpr_forms (id, user_id, business_name, status, completion_percentage, created_at, last_modified)
+    SELECT i, 1 + i % {users}, 'Business ' || i, (ARRAY['draft', 'generating', 'completed'])[1 + i % 3], i % 101,
+           now() - (i % 1000) * interval '1 hour', now() - random() * interval '365 days'
+    FROM generate_series(1, {forms}) AS i
+    """,
+    """
+    INSERT INTO {schema}.generated_content (id, form_id, section_name, generated_text, ai_model_used,
+                                            confidence_score, version_number, user_edited, generated_at)
+    SELECT row_number() OVER (), form_id, section, repeat('Generated text ', 40), 'gemini', 85, version, false,
+           now() - (3 - version) * interval '1 day'
+    FROM generate_series(10, {forms}, 10) AS form_id,
+         unnest(ARRAY[{sections}]) AS section,
+         generate_series(1, 3) AS version
+    """,
+    """
+    INSERT INTO {schema}.pdf_documents (id, form_id, file_url, file_name, file_size, language, template_type,
+                                        generated_at, download_count, storage_driver)
+    SELECT row_number() OVER (), form_id, '/uploads/dpr.pdf', 'dpr.pdf', 250000, 'english', 'professional',
+           now() - copy * interval '1 day', 0, 'local'
+    FROM generate_series(5, {forms}, 5) AS form_id, generate_series(1, 3) AS copy
+    """,
+    """
+    INSERT INTO {schema}.user_activity_log (id, user_id, activity_type, form_id, "timestamp", device_type)
+    SELECT i, 1 + i % {users}, (ARRAY['form_created', 'form_updated', 'pdf_generated'])[1 + i % 3],
+           1 + i % {forms}, now() - random() * interval '365 days', 'web'
+    FROM generate_series(1, {forms} * 3) AS i
+    """
+)
+
+# name, index it must use, query (as Prisma issues it, with literal values)
+QUERIES = (
+    ("get_user_forms", "dpr_forms_user_id_last_modified_idx",
+     "SELECT * FROM {schema}.dpr_forms WHERE user_id = {user_id} ORDER BY last_modified DESC"),
+    ("latest section version", "generated_content_latest_idx",
+     "SELECT * FROM {schema}.generated_content WHERE form_id = {content_form_id} "
+     "AND section_name = 'executive_summary' ORDER BY version_number DESC LIMIT 1"),
+    ("list_form_pdfs", "pdf_documents_form_id_generated_at_idx",
+     "SELECT * FROM {schema}.pdf_documents WHERE form_id = {pdf_form_id} ORDER BY generated_at DESC"),
+    ("user activity (30 days)", "user_activity_log_user_id_timestamp_idx",
+     "SELECT * FROM {schema}.user_activity_log WHERE user_id = {user_id} "
+     "AND \"timestamp\" >= now() - interval '30 days' ORDER BY \"timestamp\"")
+)
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def explain(db: Prisma, query: str) -> dict:
+    rows = await db.query_raw(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}")
+    result = rows[0]["QUERY PLAN"]
+    if isinstance(result, str):
+        result = json.loads(result)
+    top = result[0]
+    nodes = list(plan_nodes(top["Plan"]))
+    return {
+        "ms": top["Execution Time"],
+        # Buffer counts of a node include its children's
+        "buffers": top["Plan"].get("Shared Hit Blocks", 0) + top["Plan"].get("Shared Read Blocks", 0),
+        "nodes": [node["Node Type"] for node in nodes],
+        "indexes": {node["Index Name"] for node in nodes if "Index Name" in node}
+    }
+
+
+async def run_queries(db: Prisma, values: dict) -> dict:
+    results = {}
+    for name, _, query in QUERIES:
+        sql = query.format(schema=SCHEMA, **values)
+        await explain(db, sql)  # warm the cache
+        results[name] = await explain(db, sql)
+    return results
+
+
+async def seed(db: Prisma, forms: int, users: int):
+    await db.execute_raw(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await db.execute_raw(f"CREATE SCHEMA {SCHEMA}")
+    for table in TABLES:
+        # Columns and types only: no indexes, constraints or defaults
+        await db.execute_raw(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table})")
+
+    sections = ", ".join(f"'{section}'" for section in SECTIONS)
+    for statement in SEED:
+        started = time.perf_counter()
+        sql = statement.format(schema=SCHEMA, forms=forms, users=users, sections=sections)
+        count = await db.execute_raw(sql)
+        table = sql.split("INTO ")[1].split(" ")[0]
+        print(f"   seeded {count:>10,} rows into {table} in {time.perf_counter() - started:.1f}s")
+
+    for table in TABLES:
+        await db.execute_raw(f"ALTER TABLE {SCHEMA}.{table} ADD PRIMARY KEY (id)")
+        await db.execute_raw(f"ANALYZE {SCHEMA}.{table}")
+
+
+async def main(forms: int, users: int, keep: bool):
+    db = Prisma()
+    await db.connect()
+
+    try:
+        print(f"🌱 Seeding {forms:,} forms for {users:,} users into schema {SCHEMA}")
+        await seed(db, forms, users)
+        values = {"user_id": users // 2, "content_form_id": forms // 20 * 10, "pdf_form_id": forms // 10 * 5}
+
+        before = await run_queries(db, values)
+        for name, table, columns in INDEXES:
+            started = time.perf_counter()
+            await db.execute_raw(f"CREATE INDEX {name} ON {SCHEMA}.{table} ({columns})")
+            await db.execute_raw(f"ANALYZE {SCHEMA}.{table}")
+            print(f"   created {name} in {time.perf_counter() - started:.1f}s")
+        after = await run_queries(db, values)
+
+        print(f"\n{'query':<26} {'before ms':>10} {'after ms':>10} {'buffers':>17}  plan with index")
+        failures = []
+        for name, index, _ in QUERIES:
+            old, new = before[name], after[name]
+            uses_index = index in new["indexes"]
+            if not uses_index:
+                failures.append(name)
+            print(
+                f"{name:<26} {old['ms']:>10.2f} {new['ms']:>10.2f} {old['buffers']:>8} -> {new['buffers']:<6}  "
+                f"{'✅' if uses_index else '❌'} {' > '.join(new['nodes'])}"
+            )
+
+        if failures:
+            print(f"\n❌ Not using their index: {', '.join(failures)}")
+            sys.exit(1)
+        print("\n🎉 Every hot query uses its composite index")
+
+    finally:
+        if not keep:
+            await db.execute_raw(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await db.disconnect()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="EXPLAIN the hot queries before and after the composite indexes")
+    parser.add_argument("--forms", type=int, default=1_000_000, help="Forms to seed")
+    parser.add_argument("--users", type=int, default=100_000, help="Users the forms belong to")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded schema")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(main(args.forms, args.users, args.keep))
@@ -0,0 +1,161 @@
+"""
+Automated Tests for generated content version compaction
+"""
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.content_compaction import (
+    apply_text_delta,
+    compact_generated_content,
+    compact_section,
+    load_content_version,
+    make_text_delta
+)
+
+SUMMARY = (
+    "Acme Foods is a proprietorship manufacturing traditional pickles in Guntur.\n\n"
+    "The project requires a total investment of Rs. 25 lakh, of which Rs. 18 lakh is a term loan. "
+    "Demand for branded pickles is growing steadily across Andhra Pradesh and Telangana.\n"
+)
+
+
+def version_text(version: int) -> str:
+    return SUMMARY.replace("growing steadily", f"growing at {version + 5}% a year") + f"\nRevision {version}.\n"
+
+
+class FakeGeneratedContent:
+    """generatedcontent table of one or more sections"""
+
+    def __init__(self, rows):
+        self.rows = {row.id: row for row in rows}
+
+    async def find_many(self, where, order):
+        rows = [
+            row for row in self.rows.values()
+            if row.formId == where["formId"] and row.sectionName == where["sectionName"]
+            and row.versionNumber >= where["versionNumber"]["gte"]
+        ]
+        return sorted(rows, key=lambda row: (row.versionNumber, row.id), reverse=True)
+
+    async def update_many(self, where, data):
+        row = self.rows[where["id"]]
+        if row.generatedText is not None:
+            for name, value in data.items():
+                setattr(row, name, value)
+
+
+class FakeDb:
+    def __init__(self, rows):
+        self.generatedcontent = FakeGeneratedContent(rows)
+        self.candidate_queries = []
+
+    def tx(self):
+        db = self
+
+        class Transaction:
+            async def __aenter__(self):
+                return db
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Transaction()
+
+    async def query_raw(self, query, keep_versions, after_form, after_section, limit):
+        self.candidate_queries.append((after_form, after_section))
+        sections = sorted({
+            (row.formId, row.sectionName) for row in self.generatedcontent.rows.values()
+            if (row.formId, row.sectionName) > (after_form, after_section)
+        })
+        return [{"formId": form_id, "sectionName": section} for form_id, section in sections[:limit]]
+
+
+def section_rows(versions: int, form_id: int = 45, section: str = "executive_summary", first_id: int = 1, edited=()):
+    return [
+        SimpleNamespace(
+            id=first_id + version - 1, formId=form_id, sectionName=section, generatedText=version_text(version),
+            aiModelUsed="gemini", confidenceScore=85, versionNumber=version, userEdited=version in edited,
+            textDelta=None, deltaBaseId=None
+        )
+        for version in range(1, versions + 1)
+    ]
+
+
+def test_delta_round_trip():
+    pairs = [
+        (version_text(2), version_text(1)),
+        (SUMMARY, "Completely different text.\n"),
+        ("", SUMMARY),
+        (SUMMARY, ""),
+        ("  leading and trailing  \n\n", "  leading\tand trailing \n")
+    ]
+    for base, text in pairs:
+        assert apply_text_delta(base, make_text_delta(base, text)) == text
+
+
+def test_similar_versions_compress_well():
+    text = version_text(1)
+    assert len(make_text_delta(version_text(2), text)) < len(text.encode("utf-8")) / 4
+
+
+def test_old_versions_are_compacted_and_rebuilt():
+    rows = section_rows(8, edited={2})
+    originals = {row.versionNumber: row.generatedText for row in rows}
+    db = FakeDb(rows)
+
+    result = asyncio.run(compact_section(db, 45, "executive_summary", keep_versions=3))
+
+    # Versions 1, 3, 4 and 5; 6-8 are kept and 2 was edited by the user
+    assert result["compacted_versions"] == 4
+    assert result["delta_bytes"] < result["text_bytes"]
+    kept = {row.versionNumber for row in rows if row.generatedText is not None}
+    assert kept == {2, 6, 7, 8}
+    assert all(row.deltaBaseId == row.id + 1 for row in rows if row.generatedText is None)
+
+    for version, text in originals.items():
+        content, rebuilt = asyncio.run(load_content_version(db, 45, "executive_summary", version))
+        assert content.versionNumber == version
+        assert rebuilt == text
+    assert asyncio.run(load_content_version(db, 45, "executive_summary", 9)) is None
+
+
+def test_compaction_is_incremental():
+    rows = section_rows(6)
+    db = FakeDb(rows)
+    asyncio.run(compact_section(db, 45, "executive_summary", keep_versions=2))
+    assert asyncio.run(compact_section(db, 45, "executive_summary", keep_versions=2))["compacted_versions"] == 0
+
+    # Two more regenerations push versions 5 and 6 past the kept ones
+    for row in section_rows(8)[6:]:
+        db.generatedcontent.rows[row.id] = row
+    assert asyncio.run(compact_section(db, 45, "executive_summary", keep_versions=2))["compacted_versions"] == 2
+    for version in range(1, 9):
+        assert asyncio.run(load_content_version(db, 45, "executive_summary", version))[1] == version_text(version)
+
+
+def test_dry_run_changes_nothing():
+    rows = section_rows(4)
+    db = FakeDb(rows)
+    result = asyncio.run(compact_section(db, 45, "executive_summary", keep_versions=1, dry_run=True))
+    assert result["compacted_versions"] == 3
+    assert all(row.generatedText is not None for row in rows)
+
+
+def test_compactor_pages_through_sections():
+    rows = (
+        section_rows(3, form_id=1, first_id=1)
+        + section_rows(3, form_id=1, section="market_analysis", first_id=10)
+        + section_rows(3, form_id=2, first_id=20)
+    )
+    db = FakeDb(rows)
+
+    result = asyncio.run(compact_generated_content(db, keep_versions=2, batch_size=2))
+
+    assert result["sections"] == 3
+    assert result["compacted_versions"] == 3
+    assert db.candidate_queries == [(0, ""), (1, "market_analysis")]
@@ -0,0 +1,60 @@
+"""
+Automated Tests for buffered PDF download counters
+"""
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.download_counter import DownloadCounter
+
+
+class RecordingDb:
+    """Stands in for the Prisma client: records execute_raw calls"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = []
+
+    def is_connected(self):
+        return True
+
+    async def execute_raw(self, query, *args):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.calls.append(args)
+        return len(args[0])
+
+
+def test_increments_are_merged_into_reads():
+    counter = DownloadCounter()
+    counter.increment(1)
+    counter.increment(1)
+    counter.increment(2)
+    assert counter.current_count(SimpleNamespace(id=1, downloadCount=10)) == 12
+    assert counter.current_count(SimpleNamespace(id=3, downloadCount=4)) == 4
+
+
+def test_flush_writes_one_batched_update():
+    counter = DownloadCounter()
+    for pdf_id in (1, 1, 2, 1):
+        counter.increment(pdf_id)
+    db = RecordingDb()
+    assert asyncio.run(counter.flush(db)) == 2
+    assert db.calls == [([1, 2], [3, 1])]
+    assert counter.pending(1) == 0
+    assert asyncio.run(counter.flush(db)) == 0
+    assert len(db.calls) == 1
+
+
+def test_failed_flush_keeps_increments():
+    counter = DownloadCounter()
+    counter.increment(7, 3)
+    with pytest.raises(RuntimeError):
+        asyncio.run(counter.flush(RecordingDb(fail=True)))
+    assert counter.pending(7) == 3
@@ -0,0 +1,81 @@
+"""
+Automated Tests for server-side DPR HTML rendering
+"""
+import sys
+import os
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.dpr_html import format_inr, latest_generated_sections, markdown_to_html, render_dpr_html
+
+
+def test_format_inr_uses_indian_grouping():
+    assert format_inr(Decimal("2500000.00")) == "₹ 25,00,000"
+    assert format_inr(1234567.5) == "₹ 12,34,567.5"
+    assert format_inr(-1234567.891, 2) == "₹ -12,34,567.89"
+    assert format_inr(999) == "₹ 999"
+
+
+def test_markdown_is_converted_and_escaped():
+    html = str(markdown_to_html("## Market\n\n**Strong** demand\n- one\n- two\n\n<script>alert(1)</script>"))
+    assert "<h2>Market</h2>" in html
+    assert "<p><strong>Strong</strong> demand</p>" in html
+    assert "<ul>\n<li>one</li>\n<li>two</li>\n</ul>" in html
+    assert "<script>" not in html
+
+
+def test_links_cannot_inject_attributes():
+    html = str(markdown_to_html("[MSME](https://msme.gov.in/schemes?a=1&b=2) and [x](https://a\"onmouseover=\"alert(1))"))
+    assert '<a href="https://msme.gov.in/schemes?a=1&amp;b=2">MSME</a>' in html
+    # A quote ends the URL, so the markdown stays literal text
+    assert '<a href="https://a' not in html
+    assert "[x](https://a" in html
+
+
+def test_emphasis_does_not_rewrite_link_targets():
+    html = str(markdown_to_html("See [the *MSME* guide](https://example.org/a_b_c*d*/x__y__z) and _more_"))
+    assert '<a href="https://example.org/a_b_c*d*/x__y__z">the <em>MSME</em> guide</a>' in html
+    assert "<em>more</em>" in html
+
+
+def test_latest_version_of_each_section_is_used():
+    now = datetime(2025, 1, 1)
+    contents = [
+        SimpleNamespace(id=1, sectionName="executive_summary", versionNumber=1, generatedText="old", generatedAt=now),
+        SimpleNamespace(id=2, sectionName="market_analysis", versionNumber=1, generatedText="market", generatedAt=now),
+        SimpleNamespace(id=3, sectionName="executive_summary", versionNumber=2, generatedText="new", generatedAt=now)
+    ]
+    sections = latest_generated_sections(contents)
+    assert [section["name"] for section in sections] == ["executive_summary", "market_analysis"]
+    assert str(sections[0]["html"]) == "<p>new</p>"
+
+
+def test_render_minimal_form():
+    form = SimpleNamespace(
+        id=7,
+        businessName="Acme <Foods>",
+        status="draft",
+        completionPercentage=10,
+        createdAt=datetime(2025, 1, 1),
+        entrepreneurDetails=None,
+        businessDetails=None,
+        productDetails=None,
+        financialDetails=None,
+        revenueAssumptions=None,
+        costDetails=None,
+        staffingDetails=None,
+        timelineDetails=None,
+        generatedContents=[],
+        financialProjections=[],
+        projectionSeries=None,
+        financialSummary=None
+    )
+    html = render_dpr_html(form)
+    assert html.startswith("<!DOCTYPE html>")
+    assert "Acme &lt;Foods&gt;" in html
+    assert "DPR-7" in html
+    assert "<style>" in html and "pdf-section-title" in html
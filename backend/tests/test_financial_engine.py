@@ -0,0 +1,170 @@
+"""
+Automated Tests for the Financial Projection Engine
+Checks the vectorized engine against the original per-month loop implementation
+"""
+import pytest
+import random
+import sys
+import os
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.financial_engine import (
+    ProjectionBatch,
+    ProjectionInputs,
+    SUPPORTED_HORIZONS,
+    input_fingerprint,
+    project,
+    project_batch,
+    summarize,
+    summarize_batch,
+    summary_rows
+)
+
+
+def legacy_projections(inputs: ProjectionInputs):
+    """Original 36-month loop from routes/financial.py, kept as the reference"""
+    projections = []
+    cumulative_profit_loss = 0.0
+    for month in range(1, 37):
+        if month <= 12:
+            sales_quantity = inputs.monthly_sales_year1
+        elif month <= 24:
+            sales_quantity = inputs.monthly_sales_year2
+        else:
+            sales_quantity = inputs.monthly_sales_year3
+        revenue = inputs.product_price * sales_quantity
+        variable_costs = inputs.variable_costs_monthly
+        profit_loss = revenue - inputs.fixed_costs_monthly - variable_costs
+        cumulative_profit_loss += profit_loss
+        projections.append({
+            "month_number": month,
+            "revenue": revenue,
+            "fixed_costs": inputs.fixed_costs_monthly,
+            "variable_costs": variable_costs,
+            "profit_loss": profit_loss,
+            "cumulative_profit_loss": cumulative_profit_loss
+        })
+    return projections
+
+
+def legacy_summary(projections, total_investment):
+    """Original summary metric loops from routes/financial.py"""
+    breakeven_months = 0
+    for proj in projections:
+        if proj["cumulative_profit_loss"] > 0:
+            breakeven_months = proj["month_number"]
+            break
+    if breakeven_months == 0:
+        breakeven_months = 36
+    final_cumulative_profit = projections[-1]["cumulative_profit_loss"]
+    roi_percentage = (final_cumulative_profit / total_investment) * 100 if total_investment > 0 else 0
+    payback_period_months = 0
+    for proj in projections:
+        if proj["cumulative_profit_loss"] >= total_investment:
+            payback_period_months = proj["month_number"]
+            break
+    if payback_period_months == 0:
+        payback_period_months = 36
+    npv = 0.0
+    for proj in projections:
+        npv += proj["profit_loss"] / ((1 + 0.0083) ** proj["month_number"])
+    npv -= total_investment
+    total_revenue = sum(p["revenue"] for p in projections if p["revenue"] > 0)
+    total_profit = sum(p["profit_loss"] for p in projections)
+    profit_margin_percentage = (total_profit / total_revenue * 100) if total_revenue > 0 else 0
+    return {
+        "breakeven_months": breakeven_months,
+        "roi_percentage": round(roi_percentage, 2),
+        "payback_period_months": payback_period_months,
+        "npv": round(npv, 2),
+        "profit_margin_percentage": round(profit_margin_percentage, 2)
+    }
+
+
+def random_inputs(rng: random.Random) -> ProjectionInputs:
+    return ProjectionInputs(
+        product_price=round(rng.uniform(1, 5000), 2),
+        monthly_sales_year1=rng.randint(0, 5000),
+        monthly_sales_year2=rng.randint(0, 8000),
+        monthly_sales_year3=rng.randint(0, 12000),
+        growth_rate_percentage=round(rng.uniform(0, 25), 2),
+        fixed_costs_monthly=round(rng.uniform(0, 500000), 2),
+        variable_costs_monthly=round(rng.uniform(0, 500000), 2),
+        total_investment=round(rng.uniform(0, 5000000), 2)
+    )
+
+
+def test_default_horizon_matches_legacy_exactly():
+    """Projections and summary must be bit-identical to the old loops"""
+    rng = random.Random(2024)
+    for _ in range(500):
+        inputs = random_inputs(rng)
+        expected = legacy_projections(inputs)
+        series = project(inputs)
+        assert series.to_rows() == expected
+        assert summarize(series, inputs.total_investment) == legacy_summary(expected, inputs.total_investment)
+
+
+@pytest.mark.parametrize("horizon", SUPPORTED_HORIZONS)
+def test_batch_matches_single_form(horizon):
+    """Every row of a batch equals the single-form calculation"""
+    rng = random.Random(horizon)
+    inputs = [random_inputs(rng) for _ in range(200)]
+    batch = ProjectionBatch.from_inputs(inputs)
+    series = project_batch(batch, horizon, ramp_up=[0.6, 0.8])
+    summaries = summary_rows(summarize_batch(series, batch.total_investment))
+    for index, item in enumerate(inputs):
+        single = project(item, horizon, ramp_up=[0.6, 0.8])
+        assert series.row(index).to_rows() == single.to_rows()
+        assert summaries[index] == summarize(single, item.total_investment)
+
+
+@pytest.mark.parametrize("horizon", SUPPORTED_HORIZONS)
+def test_horizon_length_and_first_three_years(horizon):
+    inputs = random_inputs(random.Random(horizon))
+    series = project(inputs, horizon)
+    assert series.horizon == horizon
+    assert series.to_rows()[:36] == legacy_projections(inputs)
+
+
+def test_growth_rate_applies_after_year_three():
+    inputs = ProjectionInputs(
+        product_price=100.0,
+        monthly_sales_year1=10,
+        monthly_sales_year2=20,
+        monthly_sales_year3=30,
+        growth_rate_percentage=10.0,
+        fixed_costs_monthly=500.0,
+        variable_costs_monthly=200.0,
+        total_investment=10000.0
+    )
+    series = project(inputs, 60)
+    assert series.revenue[35] == pytest.approx(3000.0)
+    assert series.revenue[36] == pytest.approx(3300.0)
+    assert series.revenue[48] == pytest.approx(3630.0)
+    assert series.variable_costs[48] == pytest.approx(242.0)
+
+
+def test_ramp_up_scales_revenue_and_variable_costs():
+    inputs = random_inputs(random.Random(7))
+    series = project(inputs, ramp_up=[0.5, 0.75])
+    assert series.revenue[0] == pytest.approx(inputs.product_price * inputs.monthly_sales_year1 * 0.5)
+    assert series.variable_costs[1] == pytest.approx(inputs.variable_costs_monthly * 0.75)
+    assert series.variable_costs[2] == inputs.variable_costs_monthly
+
+
+def test_unsupported_horizon_rejected():
+    with pytest.raises(ValueError):
+        project(random_inputs(random.Random(1)), 48)
+
+
+def test_input_fingerprint_tracks_engine_inputs():
+    inputs = random_inputs(random.Random(21))
+    same = ProjectionInputs(**{**inputs.__dict__})
+    changed = ProjectionInputs(**{**inputs.__dict__, "product_price": inputs.product_price + 1})
+    assert input_fingerprint(inputs) == input_fingerprint(same)
+    assert input_fingerprint(inputs) != input_fingerprint(changed)
+    assert input_fingerprint(inputs) != input_fingerprint(inputs, 60)
+    assert input_fingerprint(inputs) != input_fingerprint(inputs, ramp_up=[0.5])
@@ -0,0 +1,95 @@
+"""
+Automated Tests for the financial goal-seek solver
+"""
+import pytest
+import random
+import sys
+import os
+from dataclasses import replace
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.financial_engine import ProjectionInputs, project, summarize
+from utils.financial_goal_seek import goal_seek
+from test_financial_engine import random_inputs
+
+INPUTS = ProjectionInputs(
+    product_price=250.0,
+    monthly_sales_year1=400,
+    monthly_sales_year2=600,
+    monthly_sales_year3=800,
+    growth_rate_percentage=5.0,
+    fixed_costs_monthly=60000.0,
+    variable_costs_monthly=20000.0,
+    total_investment=1500000.0
+)
+
+
+def summary_for(inputs):
+    return summarize(project(inputs), inputs.total_investment)
+
+
+@pytest.mark.parametrize("target_metric,target_value", [
+    ("breakeven_months", 6),
+    ("payback_period_months", 24),
+    ("roi_percentage", 40.0),
+])
+def test_minimum_price_is_tight(target_metric, target_value):
+    result = goal_seek(INPUTS, "price", target_metric, target_value)
+    assert result["feasible"]
+    price = result["solved_value"]
+
+    def met(summary):
+        if target_metric == "roi_percentage":
+            return summary["roi_percentage"] >= target_value
+        return summary[target_metric] <= target_value
+
+    assert met(summary_for(replace(INPUTS, product_price=price)))
+    # One paisa less misses the target
+    below = summary_for(replace(INPUTS, product_price=round(price - 0.01, 2)))
+    if target_metric == "roi_percentage":
+        assert below["roi_percentage"] < target_value or below["roi_percentage"] == pytest.approx(target_value, abs=0.01)
+    else:
+        assert not met(below)
+
+
+def test_maximum_fixed_costs_is_tight():
+    result = goal_seek(INPUTS, "fixed_costs", "breakeven_months", 12)
+    assert result["feasible"]
+    cost = result["solved_value"]
+    assert summary_for(replace(INPUTS, fixed_costs_monthly=cost))["breakeven_months"] <= 12
+    assert summary_for(replace(INPUTS, fixed_costs_monthly=cost + 0.01))["breakeven_months"] > 12
+
+
+def test_sales_volume_rounds_up_to_whole_units():
+    result = goal_seek(INPUTS, "sales_quantity", "payback_period_months", 20)
+    assert result["feasible"]
+    solved = result["solved_inputs"]
+    assert all(isinstance(solved[f"monthly_sales_year{year}"], int) for year in (1, 2, 3))
+    assert result["summary"]["payback_period_months"] <= 20
+
+
+def test_infeasible_target_reported():
+    result = goal_seek(replace(INPUTS, total_investment=1e12), "fixed_costs", "payback_period_months", 3)
+    assert not result["feasible"]
+    assert result["solved_value"] is None
+
+
+def test_invalid_targets_rejected():
+    with pytest.raises(ValueError):
+        goal_seek(INPUTS, "price", "breakeven_months", 48)
+    with pytest.raises(ValueError):
+        goal_seek(INPUTS, "growth", "breakeven_months", 12)
+    with pytest.raises(ValueError):
+        goal_seek(replace(INPUTS, total_investment=0.0), "price", "roi_percentage", 10)
+
+
+def test_random_forms_hit_target_in_few_iterations():
+    rng = random.Random(34)
+    for _ in range(50):
+        inputs = random_inputs(rng)
+        result = goal_seek(inputs, "price", "breakeven_months", 18, horizon_months=60)
+        assert result["feasible"]
+        assert result["summary"]["breakeven_months"] <= 18
+        assert result["iterations"] <= 10
@@ -0,0 +1,108 @@
+"""
+Automated Tests for the loan amortization and DSCR engine
+Checks the closed-form batch schedules against a month-by-month loop
+"""
+import pytest
+import random
+import sys
+import os
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.financial_engine import project
+from utils.financial_loan import (
+    LoanAnalysisCache,
+    amortize_batch,
+    analyze_loan,
+    dscr_batch,
+    loan_fingerprint,
+    scenario_grid
+)
+from test_financial_engine import random_inputs
+
+
+def loop_schedule(loan_amount, annual_rate, tenure, moratorium):
+    """Reference: straightforward monthly loop"""
+    r = annual_rate / 1200
+    emi = loan_amount / tenure if r == 0 else loan_amount * r * (1 + r) ** tenure / ((1 + r) ** tenure - 1)
+    balance = loan_amount
+    payments = []
+    for month in range(1, moratorium + tenure + 1):
+        interest = balance * r
+        principal = 0.0 if month <= moratorium else min(emi - interest, balance)
+        balance -= principal
+        payments.append((interest, principal, interest + principal, balance))
+    return emi, payments
+
+
+def test_matches_monthly_loop():
+    rng = random.Random(35)
+    cases = [
+        (rng.uniform(1e5, 5e7), rng.choice([0.0, rng.uniform(6, 16)]), rng.randint(1, 240), rng.randint(0, 12))
+        for _ in range(100)
+    ]
+    loan_amount = cases[0][0]
+    schedule = amortize_batch(
+        loan_amount,
+        [case[1] for case in cases],
+        [case[2] for case in cases],
+        [case[3] for case in cases]
+    )
+    for index, (_, rate, tenure, moratorium) in enumerate(cases):
+        emi, payments = loop_schedule(loan_amount, rate, tenure, moratorium)
+        assert schedule.emi[index] == pytest.approx(emi)
+        for month, (interest, principal, payment, balance) in enumerate(payments):
+            assert schedule.interest[index, month] == pytest.approx(interest, abs=1e-4)
+            assert schedule.principal[index, month] == pytest.approx(principal, abs=1e-4)
+            assert schedule.payment[index, month] == pytest.approx(payment, abs=1e-4)
+            assert schedule.closing_balance[index, month] == pytest.approx(balance, abs=1e-4)
+        assert (schedule.payment[index, moratorium + tenure:] == 0).all()
+
+
+def test_principal_repaid_in_full():
+    schedule = amortize_batch(2500000.0, [9.0, 0.0], [84, 60], [6, 0])
+    assert schedule.principal.sum(axis=1) == pytest.approx([2500000.0, 2500000.0])
+    assert schedule.closing_balance[0, 89] == 0.0
+    # Interest only during moratorium
+    assert schedule.principal[0, :6].sum() == 0.0
+    assert schedule.payment[0, 0] == pytest.approx(2500000.0 * 0.09 / 12)
+
+
+def test_dscr_by_project_year():
+    inputs = random_inputs(random.Random(9))
+    series = project(inputs, 60)
+    schedule = amortize_batch(1000000.0, [12.0], [24], [12])
+    dscr = dscr_batch(schedule, series.profit_loss)
+    cash = series.profit_loss.reshape(5, 12).sum(axis=1)
+    debt = schedule.payment[0].reshape(3, 12).sum(axis=1)
+    assert dscr["annual"][0, :3] == pytest.approx(cash[:3] / debt)
+    assert all(value != value for value in dscr["annual"][0, 3:])
+    assert dscr["minimum"][0] == pytest.approx(min(cash[:3] / debt))
+    assert dscr["average"][0] == pytest.approx(cash[:3].sum() / debt.sum())
+
+
+def test_scenario_grid_and_limits():
+    rates, tenures, moratoria = scenario_grid([9, 10], [60, 84], [0])
+    assert list(zip(rates, tenures, moratoria)) == [(9, 60, 0), (9, 84, 0), (10, 60, 0), (10, 84, 0)]
+    with pytest.raises(ValueError):
+        scenario_grid(list(range(50)), list(range(1, 51)), [0])
+    with pytest.raises(ValueError):
+        amortize_batch(1000.0, [10.0], [0], [0])
+
+
+def test_analysis_and_cache():
+    inputs = random_inputs(random.Random(4))
+    result = analyze_loan(inputs, 800000.0, [9.5, 11.0], [60], [0, 6], horizon_months=60)
+    assert len(result["scenarios"]) == 4
+    assert result["scenarios"][0]["emi"] < result["scenarios"][2]["emi"]
+    assert len(result["schedule"]["month_number"]) == 60
+    assert len(result["annual_dscr"]) == 5
+
+    key = loan_fingerprint(inputs, 800000.0, [9.5, 11.0], [60], [0, 6], 60)
+    assert key != loan_fingerprint(inputs, 900000.0, [9.5, 11.0], [60], [0, 6], 60)
+    cache = LoanAnalysisCache(max_size=1)
+    cache.put(key, result)
+    assert cache.get(key) is result
+    cache.put("other", {})
+    assert cache.get(key) is None
@@ -0,0 +1,188 @@
+"""
+Automated Tests for the exact integer-paise projection path
+Checks paise results against a Python Decimal reference
+"""
+import importlib
+import pytest
+import random
+import sys
+import os
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.financial_recompute as financial_recompute
+from utils.financial_engine import (
+    SUPPORTED_HORIZONS,
+    PaiseInputs,
+    ProjectionInputs,
+    input_fingerprint,
+    paise_batch,
+    paise_projection_records,
+    project,
+    project_paise,
+    project_paise_batch,
+    rupee_series,
+    summarize,
+    summarize_paise,
+    summarize_paise_batch,
+    summary_rows,
+    to_paise
+)
+
+PAISA = Decimal("0.01")
+
+
+def random_paise_inputs(rng: random.Random) -> PaiseInputs:
+    return PaiseInputs(
+        product_price=rng.randint(1, 500000),
+        monthly_sales_year1=rng.randint(0, 5000),
+        monthly_sales_year2=rng.randint(0, 8000),
+        monthly_sales_year3=rng.randint(0, 12000),
+        growth_rate_percentage=round(rng.uniform(0, 25), 2),
+        fixed_costs_monthly=rng.randint(0, 50000000),
+        variable_costs_monthly=rng.randint(0, 50000000),
+        total_investment=rng.randint(0, 500000000)
+    )
+
+
+def decimal_projections(inputs: PaiseInputs, horizon: int = 36):
+    """Reference: the 36-month loop in exact Decimal rupees"""
+    price = Decimal(inputs.product_price) / 100
+    fixed = Decimal(inputs.fixed_costs_monthly) / 100
+    variable = Decimal(inputs.variable_costs_monthly) / 100
+    quantities = (inputs.monthly_sales_year1, inputs.monthly_sales_year2, inputs.monthly_sales_year3)
+    cumulative = Decimal(0)
+    rows = []
+    for month in range(1, horizon + 1):
+        revenue = price * quantities[min((month - 1) // 12, 2)]
+        profit = revenue - fixed - variable
+        cumulative += profit
+        rows.append((revenue, fixed, variable, profit, cumulative))
+    return rows
+
+
+def test_to_paise_is_exact():
+    assert to_paise(Decimal("1234567890123.45")) == 123456789012345
+    assert to_paise(Decimal("0.10")) == 10
+    assert to_paise(Decimal("-19.99")) == -1999
+    assert to_paise(Decimal("2.005")) == 201
+
+
+def test_from_form_reads_decimal_columns_exactly():
+    form = SimpleNamespace(
+        revenueAssumptions=SimpleNamespace(
+            productPrice=Decimal("0.10"),
+            monthlySalesQuantityYear1=3,
+            monthlySalesQuantityYear2=4,
+            monthlySalesQuantityYear3=5,
+            growthRatePercentage=Decimal("10.00")
+        ),
+        costDetails=SimpleNamespace(
+            laborCostMonthly=Decimal("0.10"),
+            utilitiesCostMonthly=Decimal("0.20"),
+            rentMonthly=Decimal("0.00"),
+            marketingCostMonthly=Decimal("0.00"),
+            otherFixedCostsMonthly=Decimal("0.00"),
+            rawMaterialCostMonthly=Decimal("0.30")
+        ),
+        financialDetails=SimpleNamespace(totalInvestmentAmount=Decimal("100.00"))
+    )
+    inputs = PaiseInputs.from_form(form)
+    assert inputs.fixed_costs_monthly == 30
+    series = project_paise(inputs)
+    # 0.10 * 3 - (0.10 + 0.20) - 0.30 is exactly -0.30, not -0.30000000000000004
+    assert series.profit_loss[0] == -30
+    assert rupee_series(series).to_rows()[0]["profit_loss"] == -0.3
+
+
+def test_matches_decimal_reference_to_the_paisa():
+    rng = random.Random(33)
+    for _ in range(200):
+        inputs = random_paise_inputs(rng)
+        series = project_paise(inputs)
+        records = paise_projection_records(1, series)
+        for record, expected in zip(records, decimal_projections(inputs)):
+            actual = (
+                record["revenue"], record["fixedCosts"], record["variableCosts"],
+                record["profitLoss"], record["cumulativeProfitLoss"]
+            )
+            assert actual == tuple(value.quantize(PAISA) for value in expected)
+
+
+@pytest.mark.parametrize("horizon", SUPPORTED_HORIZONS)
+def test_factors_round_to_nearest_paisa(horizon):
+    rng = random.Random(horizon)
+    inputs = random_paise_inputs(rng)
+    series = project_paise(inputs, horizon, ramp_up=[0.35, 0.7])
+    float_series = project(
+        ProjectionInputs(**{
+            name: value / 100 if name not in (
+                "monthly_sales_year1", "monthly_sales_year2", "monthly_sales_year3", "growth_rate_percentage"
+            ) else value
+            for name, value in inputs.__dict__.items()
+        }),
+        horizon,
+        ramp_up=[0.35, 0.7]
+    )
+    assert series.revenue.dtype.kind == "i"
+    # Each month is within half a paisa of the float engine
+    assert abs(series.revenue / 100 - float_series.revenue).max() <= 0.005 + 1e-6
+    # Cumulative totals are exact sums of the stored monthly values
+    assert series.cumulative_profit_loss[-1] == int(series.profit_loss.sum())
+
+
+def test_summary_matches_float_engine():
+    rng = random.Random(5)
+    for _ in range(100):
+        inputs = random_paise_inputs(rng)
+        float_inputs = ProjectionInputs(
+            product_price=inputs.product_price / 100,
+            monthly_sales_year1=inputs.monthly_sales_year1,
+            monthly_sales_year2=inputs.monthly_sales_year2,
+            monthly_sales_year3=inputs.monthly_sales_year3,
+            growth_rate_percentage=inputs.growth_rate_percentage,
+            fixed_costs_monthly=inputs.fixed_costs_monthly / 100,
+            variable_costs_monthly=inputs.variable_costs_monthly / 100,
+            total_investment=inputs.total_investment / 100
+        )
+        exact = summarize_paise(project_paise(inputs), inputs.total_investment)
+        approx = summarize(project(float_inputs), float_inputs.total_investment)
+        assert exact["breakeven_months"] == approx["breakeven_months"]
+        assert exact["payback_period_months"] == approx["payback_period_months"]
+        assert exact["npv"] == pytest.approx(approx["npv"], abs=0.011)
+        assert exact["roi_percentage"] == pytest.approx(approx["roi_percentage"], abs=0.011)
+
+
+def test_batch_matches_single_form():
+    rng = random.Random(8)
+    inputs = [random_paise_inputs(rng) for _ in range(100)]
+    batch = paise_batch(inputs)
+    series = project_paise_batch(batch, 60, ramp_up=[0.5])
+    summaries = summary_rows(summarize_paise_batch(series, batch.total_investment))
+    for index, item in enumerate(inputs):
+        single = project_paise(item, 60, ramp_up=[0.5])
+        assert (series.row(index).cumulative_profit_loss == single.cumulative_profit_loss).all()
+        assert summaries[index] == summarize_paise(single, item.total_investment)
+
+
+def test_overflow_rejected():
+    inputs = PaiseInputs(10 ** 15, 10 ** 6, 10 ** 6, 10 ** 6, 0.0, 0, 0, 0)
+    with pytest.raises(ValueError):
+        project_paise(inputs)
+
+
+def test_fingerprint_includes_arithmetic():
+    inputs = ProjectionInputs(100.0, 1, 2, 3, 5.0, 10.0, 20.0, 1000.0)
+    assert input_fingerprint(inputs, arithmetic="paise") != input_fingerprint(inputs, arithmetic="float")
+
+
+def test_float_arithmetic_is_the_default(monkeypatch):
+    # Paise is opt-in: switching changes stored projections on the next recompute
+    monkeypatch.delenv("FINANCIAL_ARITHMETIC", raising=False)
+    try:
+        assert importlib.reload(financial_recompute).FINANCIAL_ARITHMETIC == "float"
+    finally:
+        importlib.reload(financial_recompute)
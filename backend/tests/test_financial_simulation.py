@@ -0,0 +1,67 @@
+"""
+Automated Tests for Monte Carlo financial simulation
+"""
+import pytest
+import random
+import time
+import sys
+import os
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.financial_engine import project, summarize
+from utils.financial_simulation import Distribution, MAX_SAMPLES, simulate
+from test_financial_engine import random_inputs
+
+
+def test_same_seed_reproduces_results():
+    inputs = random_inputs(random.Random(3))
+    price = Distribution(kind="uniform", low=0.9, high=1.0)
+    first = simulate(inputs, 2000, seed=42, price=price)
+    second = simulate(inputs, 2000, seed=42, price=price)
+    assert first == second
+
+
+def test_fixed_distributions_match_deterministic_engine():
+    inputs = random_inputs(random.Random(11))
+    result = simulate(inputs, 100, seed=1)
+    summary = summarize(project(inputs), inputs.total_investment)
+    assert result["breakeven_months"]["p50"] == summary["breakeven_months"]
+    assert result["npv"]["p5"] == result["npv"]["p95"] == summary["npv"]
+
+
+def test_price_drop_shifts_npv_down():
+    inputs = random_inputs(random.Random(5))
+    baseline = simulate(inputs, 1000, seed=7)
+    lower_price = simulate(inputs, 1000, seed=7, price=Distribution(kind="uniform", low=0.8, high=0.9))
+    assert lower_price["npv"]["p50"] < baseline["npv"]["p50"]
+
+
+def test_bands_are_ordered_per_month():
+    inputs = random_inputs(random.Random(9))
+    result = simulate(inputs, 1000, seed=3, sales_quantity=Distribution(kind="normal", mean=0.9, std=0.2))
+    bands = result["cumulative_profit_loss_bands"]
+    assert len(bands["p50"]) == 36
+    assert all(low <= high for low, high in zip(bands["p5"], bands["p95"]))
+
+
+def test_invalid_distribution_rejected():
+    with pytest.raises(ValueError):
+        Distribution(kind="triangular", low=1.0, mode=0.5, high=1.2)
+    with pytest.raises(ValueError):
+        Distribution(kind="lognormal")
+
+
+def test_max_samples_runs_under_one_second():
+    inputs = random_inputs(random.Random(13))
+    started = time.perf_counter()
+    simulate(
+        inputs,
+        MAX_SAMPLES,
+        seed=0,
+        price=Distribution(kind="triangular", low=0.85, mode=1.0, high=1.05),
+        sales_quantity=Distribution(kind="normal", mean=1.0, std=0.15),
+        horizon_months=120
+    )
+    assert time.perf_counter() - started < 1.0
@@ -0,0 +1,270 @@
+"""
+Automated Tests for the memoized form context
+"""
+import sys
+import os
+import asyncio
+import json
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.form_context as form_context
+from utils.form_context import FormContextCache, load_form_context, load_form_contexts
+from utils.dpr_html import render_dpr_html
+from utils.form_snapshot import (
+    LATEST_CONTENT_QUERY,
+    SNAPSHOT_VERSION,
+    build_form_snapshot,
+    latest_contents,
+    mark_snapshots_stale,
+    refresh_form_snapshot
+)
+from test_form_snapshot import snapshot_form
+
+
+def stored_snapshot(form) -> dict:
+    return json.loads(json.dumps(build_form_snapshot(form)))
+
+
+def snapshot_record(form, revision: int = 1):
+    return SimpleNamespace(formId=form.id, version=SNAPSHOT_VERSION, revision=revision, data=stored_snapshot(form))
+
+
+class FakeSnapshots:
+    """formsnapshot table"""
+
+    def __init__(self):
+        self.rows = {}
+        self.reads = 0
+
+    async def find_unique(self, where):
+        self.reads += 1
+        return self.rows.get(where["formId"])
+
+    async def find_many(self, where):
+        self.reads += 1
+        return [self.rows[form_id] for form_id in where["formId"]["in"] if form_id in self.rows]
+
+    async def update_many(self, where, data):
+        for form_id in where["formId"]["in"]:
+            if form_id in self.rows:
+                self.rows[form_id].version = data["version"]
+
+    async def upsert(self, where, data):
+        current = self.rows.get(where["formId"])
+        revision = current.revision + data["update"]["revision"]["increment"] if current else 1
+        self.rows[where["formId"]] = SimpleNamespace(
+            formId=where["formId"], version=data["create"]["version"], revision=revision,
+            # Stored as JSONB and read back as a parsed document
+            data=json.loads(json.dumps(data["create"]["data"].data))
+        )
+        return self.rows[where["formId"]]
+
+
+class FakeForms:
+    """dprform table holding whole joined forms"""
+
+    def __init__(self):
+        self.rows = {}
+
+    async def find_unique(self, where, include=None):
+        return self.rows.get(where["id"])
+
+
+class FakeDb:
+    """DprForm and FormSnapshot rows; save() refreshes the snapshot like the writers do"""
+
+    def __init__(self):
+        self.dprform = FakeForms()
+        self.formsnapshot = FakeSnapshots()
+
+    async def query_raw(self, query, *args, model=None):
+        if query == LATEST_CONTENT_QUERY:
+            return latest_contents(self.dprform.rows[args[0]].generatedContents)
+        form_ids, version = args
+        return [
+            {"formId": row.formId, "revision": row.revision}
+            for form_id, row in self.formsnapshot.rows.items()
+            if form_id in form_ids and row.version == version
+        ]
+
+    async def save(self, form):
+        self.dprform.rows[form.id] = form
+        await refresh_form_snapshot(self, form.id)
+
+
+def use_cache(monkeypatch, max_entries: int = 8) -> FormContextCache:
+    cache = FormContextCache(max_entries)
+    monkeypatch.setattr(form_context, "form_context_cache", cache)
+    return cache
+
+
+def test_prompt_data_matches_ai_service_input(monkeypatch):
+    use_cache(monkeypatch)
+    context = form_context.FormContext(stored_snapshot(snapshot_form()), 1)
+    data = context.prompt_data
+
+    assert data["business_name"] == "Acme Foods"
+    assert data["financial_details"]["total_investment_amount"] == 2500000.0
+    assert isinstance(data["revenue_assumptions"]["product_price"], float)
+    assert data["business_details"]["sector"] == "Food Processing"
+    assert data["timeline_details"] == {}
+    assert context.render_form.businessDetails.sector == "Food Processing"
+    assert context.prompt_data is data
+
+
+def test_unchanged_form_reuses_context(monkeypatch):
+    use_cache(monkeypatch)
+    db = FakeDb()
+    form = snapshot_form()
+
+    async def scenario():
+        await db.save(form)
+        first = await load_form_context(db, form.id)
+        second = await load_form_context(db, form.id)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first is second
+    assert first.user_id == 3
+    assert db.formsnapshot.reads == 1
+
+
+def test_edit_invalidates_context(monkeypatch):
+    use_cache(monkeypatch)
+    db = FakeDb()
+    form = snapshot_form()
+
+    async def scenario():
+        await db.save(form)
+        before = await load_form_context(db, form.id)
+        form.businessName = "Acme Foods & Spices"
+        form.lastModified += timedelta(seconds=1)
+        await db.save(form)
+        after = await load_form_context(db, form.id)
+        return before, after
+
+    before, after = asyncio.run(scenario())
+    assert before.prompt_data["business_name"] == "Acme Foods"
+    assert after.prompt_data["business_name"] == "Acme Foods & Spices"
+    assert db.formsnapshot.reads == 2
+
+
+def test_recalculation_invalidates_context(monkeypatch):
+    use_cache(monkeypatch)
+    db = FakeDb()
+    form = snapshot_form()
+
+    async def scenario():
+        await db.save(form)
+        before = await load_form_context(db, form.id)
+        before_html = render_dpr_html(before.render_form)
+        # financial_recompute.calculate_and_store rewrites the summary and
+        # refreshes the snapshot without touching DprForm.lastModified
+        form.financialSummary.npv = Decimal("2345678.90")
+        await refresh_form_snapshot(db, form.id)
+        after = await load_form_context(db, form.id)
+        return before, before_html, after, render_dpr_html(after.render_form)
+
+    before, before_html, after, after_html = asyncio.run(scenario())
+    assert after is not before
+    assert after.revision == before.revision + 1
+    assert after.render_form.financialSummary.npv == Decimal("2345678.90")
+    assert after_html != before_html
+    assert after_html == render_dpr_html(form)
+
+
+def test_bulk_recompute_invalidates_context(monkeypatch):
+    use_cache(monkeypatch)
+    db = FakeDb()
+    form = snapshot_form()
+
+    async def scenario():
+        await db.save(form)
+        before = await load_form_context(db, form.id)
+        # recompute_financials.py rewrites the summary and marks the snapshot stale
+        form.financialSummary.npv = Decimal("2345678.90")
+        await mark_snapshots_stale(db, [form.id])
+        after = await load_form_context(db, form.id)
+        return before, after
+
+    before, after = asyncio.run(scenario())
+    assert after.revision == before.revision + 1
+    assert after.render_form.financialSummary.npv == Decimal("2345678.90")
+    assert db.formsnapshot.rows[form.id].version == SNAPSHOT_VERSION
+
+
+def test_missing_forms(monkeypatch):
+    cache = use_cache(monkeypatch)
+    db = FakeDb()
+    form = snapshot_form()
+
+    async def scenario():
+        await db.save(form)
+        await load_form_context(db, form.id)
+        del db.dprform.rows[form.id]
+        del db.formsnapshot.rows[form.id]
+        return await load_form_context(db, form.id), await load_form_contexts(db, [form.id, 99])
+
+    assert asyncio.run(scenario()) == (None, {})
+    assert cache.get(form.id, 1) is None
+
+
+def test_batch_loads_only_changed_forms(monkeypatch):
+    use_cache(monkeypatch)
+    db = FakeDb()
+    forms = [snapshot_form() for _ in range(3)]
+
+    async def scenario():
+        for form_id, form in enumerate(forms, 1):
+            form.id = form_id
+            await db.save(form)
+        await load_form_context(db, 1)
+        return await load_form_contexts(db, [1, 2, 3])
+
+    contexts = asyncio.run(scenario())
+    assert sorted(contexts) == [1, 2, 3]
+    # Form 1 was cached; 2 and 3 came from one snapshot query
+    assert db.formsnapshot.reads == 2
+
+
+def test_older_version_never_replaces_newer():
+    cache = FormContextCache(8)
+    form = snapshot_form()
+    older = snapshot_record(form, revision=1)
+    newer = snapshot_record(form, revision=2)
+
+    current = cache.store(newer)
+    stale = cache.store(older)
+    assert stale is not current
+    assert stale.revision == 1
+    assert cache.get(form.id, 2) is current
+    assert cache.store(newer) is current
+
+
+def test_least_recently_used_forms_are_evicted():
+    cache = FormContextCache(2)
+    for form_id in (1, 2):
+        form = snapshot_form()
+        form.id = form_id
+        cache.store(snapshot_record(form))
+    cache.get(1, 1)
+    form = snapshot_form()
+    form.id = 3
+    cache.store(snapshot_record(form))
+
+    assert cache.get(1, 1) is not None
+    assert cache.get(2, 1) is None
+    assert cache.get(3, 1) is not None
+
+
+def test_disabled_cache_keeps_nothing():
+    cache = FormContextCache(0)
+    form = snapshot_form()
+    context = cache.store(snapshot_record(form))
+    assert context.form_id == form.id
+    assert cache.get(form.id, 1) is None
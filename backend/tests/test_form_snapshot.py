@@ -0,0 +1,143 @@
+"""
+Automated Tests for the denormalized form snapshot
+"""
+import sys
+import os
+import asyncio
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.form_models import CompleteFormResponse
+from utils.dpr_html import render_dpr_html
+from utils.form_snapshot import (
+    LATEST_CONTENT_QUERY,
+    SNAPSHOT_INCLUDE,
+    build_form_snapshot,
+    camel_case,
+    complete_form_response,
+    form_from_snapshot,
+    latest_contents,
+    refresh_form_snapshot
+)
+from utils.pdf_native import render_dpr_pdf
+from test_pdf_native import sample_dpr_form, sample_schemes
+
+
+def snapshot_form():
+    """Sample DPR form with the fields a database row also has"""
+    form = sample_dpr_form()
+    form.userId = 3
+    form.lastModified = datetime(2025, 11, 2, 9, 30, tzinfo=timezone.utc)
+    form.staffingDetails = SimpleNamespace(
+        totalEmployees=6, managementCount=1, technicalStaffCount=3, supportStaffCount=2,
+        averageSalary=Decimal("18000.00")
+    )
+    # An older version of a section that must not show up
+    form.generatedContents.append(SimpleNamespace(
+        id=0, sectionName="executive_summary", versionNumber=0,
+        generatedText="Outdated summary", generatedAt=datetime(2025, 1, 1)
+    ))
+    return form
+
+
+def stored(data: dict) -> dict:
+    """What comes back from the JSONB column"""
+    return json.loads(json.dumps(data))
+
+
+def test_camel_case():
+    assert camel_case("monthly_sales_quantity_year1") == "monthlySalesQuantityYear1"
+    assert camel_case("commercial_production_start_month") == "commercialProductionStartMonth"
+    assert camel_case("status") == "status"
+
+
+def test_snapshot_has_complete_form_shape():
+    form = snapshot_form()
+    snapshot = stored(build_form_snapshot(form))
+
+    response = CompleteFormResponse.model_validate(snapshot)
+    assert response == complete_form_response(form)
+    assert response.user_id == 3
+    assert response.staffing_details.average_salary == Decimal("18000.00")
+    assert response.financial_details.total_investment_amount == Decimal("2500000.00")
+    assert response.timeline_details is None
+    assert response.generated_content.sections["executive_summary"] != "Outdated summary"
+    assert len(snapshot["generated_sections"]) == 6
+    assert snapshot["projections"]["month_count"] == 36
+
+
+def test_renderers_read_snapshot_like_the_joined_form():
+    form = snapshot_form()
+    snapshot_based = form_from_snapshot(stored(build_form_snapshot(form)))
+
+    assert snapshot_based.userId == 3
+    assert snapshot_based.financialSummary.npv == Decimal("1234567.89")
+    # Same HTML, so the PDF content hash (and cache) is unaffected
+    assert render_dpr_html(snapshot_based, sample_schemes()) == render_dpr_html(form, sample_schemes())
+    assert (
+        render_dpr_pdf(snapshot_based, sample_schemes(), "english", "bank-ready")
+        == render_dpr_pdf(form, sample_schemes(), "english", "bank-ready")
+    )
+
+
+def test_minimal_form_snapshot():
+    form = snapshot_form()
+    for relation in ("entrepreneurDetails", "businessDetails", "productDetails", "financialDetails",
+                     "revenueAssumptions", "costDetails", "staffingDetails", "financialSummary"):
+        setattr(form, relation, None)
+    form.generatedContents = []
+    form.financialProjections = []
+
+    snapshot = stored(build_form_snapshot(form))
+    assert snapshot["generated_content"] is None
+    assert snapshot["financial_summary"] is None
+    assert snapshot["projections"] is None
+
+    snapshot_based = form_from_snapshot(snapshot)
+    assert snapshot_based.businessDetails is None
+    assert snapshot_based.projectionSeries is None
+    assert render_dpr_html(snapshot_based) == render_dpr_html(form)
+
+
+def test_refresh_reads_only_latest_versions():
+    form = snapshot_form()
+    latest = latest_contents(form.generatedContents)
+
+    class FakeDb:
+        def __init__(self):
+            self.calls = []
+
+        @property
+        def dprform(self):
+            return self
+
+        @property
+        def formsnapshot(self):
+            return self
+
+        async def find_unique(self, where, include):
+            self.calls.append(("find_unique", include))
+            return form
+
+        async def query_raw(self, query, *args, model):
+            self.calls.append(("query_raw", query, args))
+            return latest
+
+        async def upsert(self, where, data):
+            self.calls.append(("upsert", where, data["update"]["userId"], data["update"]["revision"]))
+            # prisma returns the Json column parsed, not the Json wrapper
+            return SimpleNamespace(formId=where["formId"], revision=2, data=stored(data["update"]["data"].data))
+
+    db = FakeDb()
+    snapshot = asyncio.run(refresh_form_snapshot(db, form.id))
+
+    assert "generatedContents" not in SNAPSHOT_INCLUDE
+    assert db.calls[0] == ("find_unique", SNAPSHOT_INCLUDE)
+    assert db.calls[1] == ("query_raw", LATEST_CONTENT_QUERY, (form.id,))
+    assert db.calls[2] == ("upsert", {"formId": form.id}, 3, {"increment": 1})
+    assert snapshot.data == stored(build_form_snapshot(form))
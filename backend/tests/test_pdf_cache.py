@@ -0,0 +1,146 @@
+"""
+Automated Tests for the content-hash PDF cache
+"""
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.pdf_cache as pdf_cache
+from utils.pdf_cache import collect_stale_pdfs, etag_matches, pdf_content_hash, pdf_etag
+from utils.pdf_storage import LocalPdfStorage
+from utils.pdf_renderer import context_options_for
+
+HTML = "<html><body><h1>Detailed Project Report (DPR)</h1></body></html>"
+
+
+def test_hash_is_deterministic():
+    first = pdf_content_hash(HTML, "english", "professional", "server")
+    assert first == pdf_content_hash(HTML, "english", "professional", "server")
+    assert len(first) == 64
+
+
+def test_hash_covers_every_input():
+    base = pdf_content_hash(HTML, "english", "professional", "server")
+    assert pdf_content_hash(HTML + " ", "english", "professional", "server") != base
+    assert pdf_content_hash(HTML, "telugu", "professional", "server") != base
+    assert pdf_content_hash(HTML, "english", "bank-ready", "server") != base
+    assert pdf_content_hash(HTML, "english", "professional", "frontend") != base
+
+
+def test_only_server_renders_disable_javascript():
+    # The frontend source renders a client-side page that needs JavaScript
+    assert context_options_for("server")["java_script_enabled"] is False
+    assert context_options_for("frontend").get("java_script_enabled", True) is True
+
+
+def test_hash_covers_optimize_mode(monkeypatch):
+    base = pdf_content_hash(HTML, "english", "professional", "server")
+    monkeypatch.setattr(pdf_cache, "PDF_OPTIMIZE", "images")
+    images = pdf_content_hash(HTML, "english", "professional", "server")
+    assert images != base
+    monkeypatch.setattr(pdf_cache, "PDF_OPTIMIZE_IMAGE_DPI", 96)
+    assert pdf_content_hash(HTML, "english", "professional", "server") != images
+
+
+def test_etag_from_content_hash():
+    document = SimpleNamespace(id=5, checksum="cd" * 32, contentHash="ab" * 32, fileSize=1024,
+                               generatedAt=datetime(2025, 1, 1))
+    assert pdf_etag(document) == '"' + "cd" * 32 + '"'
+    document.checksum = None
+    assert pdf_etag(document) == '"' + "ab" * 16 + '-5"'
+    document.contentHash = None
+    assert pdf_etag(document).startswith('"5-1024-')
+
+
+def test_if_none_match():
+    assert etag_matches('"x-5"', '"x-5"')
+    assert etag_matches('"other", W/"x-5"', '"x-5"')
+    assert etag_matches("*", '"x-5"')
+    assert not etag_matches('"x-6"', '"x-5"')
+    assert not etag_matches(None, '"x-5"')
+
+
+class FakePdfDocuments:
+    """pdfdocument table answering the filters the cleanup uses"""
+
+    def __init__(self, documents):
+        self.rows = {document.id: document for document in documents}
+        self.loaded = 0
+
+    def _matches(self, document, where) -> bool:
+        for name, condition in where.items():
+            if name == "OR":
+                if not any(self._matches(document, option) for option in condition):
+                    return False
+            elif not isinstance(condition, dict):
+                if getattr(document, name) != condition:
+                    return False
+            else:
+                value = getattr(document, name)
+                if "gt" in condition and not value > condition["gt"]:
+                    return False
+                if "lt" in condition and not value < condition["lt"]:
+                    return False
+                if "in" in condition and value not in condition["in"]:
+                    return False
+                if "not_in" in condition and value in condition["not_in"]:
+                    return False
+        return True
+
+    async def find_many(self, where, order=None, take=None):
+        documents = [document for document in self.rows.values() if self._matches(document, where)]
+        if order:
+            (name, direction), = order.items()
+            documents.sort(key=lambda document: getattr(document, name), reverse=direction == "desc")
+        documents = documents[:take]
+        self.loaded += len(documents)
+        return documents
+
+    async def delete_many(self, where):
+        for document in [document for document in self.rows.values() if self._matches(document, where)]:
+            del self.rows[document.id]
+
+
+def stored_document(storage, tmp_path, document_id: int, form_id: int, age_days: int, content: bytes):
+    source = tmp_path / f"render-{document_id}.pdf"
+    source.write_bytes(content)
+    stored = storage.save_file(str(source))
+    return SimpleNamespace(
+        id=document_id, formId=form_id, storageDriver="local", storageKey=stored.key, fileName=f"{document_id}.pdf",
+        generatedAt=datetime.now(timezone.utc) - timedelta(days=age_days)
+    )
+
+
+def test_cleanup_pages_through_expired_documents(tmp_path, monkeypatch):
+    storage = LocalPdfStorage(str(tmp_path / "store"))
+    monkeypatch.setattr(pdf_cache, "get_storage", lambda driver="local": storage)
+    documents = [
+        # Form 1: three old PDFs, the newest is kept; 2 shares its file with the kept one
+        stored_document(storage, tmp_path, 1, 1, 90, b"%PDF-one"),
+        stored_document(storage, tmp_path, 2, 1, 80, b"%PDF-kept"),
+        stored_document(storage, tmp_path, 3, 1, 70, b"%PDF-kept"),
+        # Form 2: one old and one recent PDF
+        stored_document(storage, tmp_path, 4, 2, 60, b"%PDF-four"),
+        stored_document(storage, tmp_path, 5, 2, 1, b"%PDF-five")
+    ]
+    db = SimpleNamespace(pdfdocument=FakePdfDocuments(documents))
+    orphan = tmp_path / "store" / "DPR_Old_9_20240101.pdf"
+    orphan.write_bytes(b"%PDF-orphan")
+    os.utime(orphan, (1_000_000, 1_000_000))
+
+    result = asyncio.run(collect_stale_pdfs(db, retention_days=30, keep_per_form=1, batch_size=2))
+
+    assert sorted(db.pdfdocument.rows) == [3, 5]
+    assert result["expired_documents"] == 3
+    assert result["orphaned_files"] == 1
+    assert not orphan.exists()
+    assert not os.path.exists(storage.path(documents[0].storageKey))
+    assert not os.path.exists(storage.path(documents[3].storageKey))
+    # Still used by document 3
+    assert os.path.exists(storage.path(documents[1].storageKey))
+    assert os.path.exists(storage.path(documents[4].storageKey))
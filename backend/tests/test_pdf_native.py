@@ -0,0 +1,162 @@
+"""
+Automated Tests for the native (browser-free) DPR PDF renderer
+"""
+import sys
+import os
+import re
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.pdf_native import latin1, markdown_blocks, render_dpr_pdf, uses_native_renderer
+
+SECTIONS = (
+    "executive_summary", "market_analysis", "technical_feasibility",
+    "financial_analysis", "risk_assessment", "implementation_plan"
+)
+
+
+def sample_section_text(name: str) -> str:
+    paragraph = (
+        "The unit will process locally sourced produce into packaged products for retail "
+        "and institutional buyers, with **strong demand** across the district and *steady* growth."
+    )
+    return "\n".join([
+        f"## {name.replace('_', ' ').title()}",
+        "",
+        paragraph,
+        "",
+        "- Raw material available within 50 km",
+        "- Skilled labour from nearby ITIs",
+        "- Market price around ₹ 120 per unit",
+        "",
+        "### Key points",
+        "1. Phase one covers civil works",
+        "2. Phase two installs machinery",
+        "",
+        paragraph * 3
+    ])
+
+
+def sample_dpr_form(form_id: int = 45, business_name: str = "Acme Foods"):
+    """Fully populated form as generate_pdf loads it (DPR_RENDER_INCLUDE)"""
+    now = datetime(2025, 10, 30, 16, 52)
+    cumulative = Decimal("-2500000")
+    projections = []
+    for month in range(1, 37):
+        revenue = Decimal(100000 + 2500 * month)
+        fixed, variable = Decimal(30000), Decimal(20000 + 500 * month)
+        profit = revenue - fixed - variable
+        cumulative += profit
+        projections.append(SimpleNamespace(
+            monthNumber=month, revenue=revenue, fixedCosts=fixed, variableCosts=variable,
+            profitLoss=profit, cumulativeProfitLoss=cumulative
+        ))
+
+    return SimpleNamespace(
+        id=form_id,
+        businessName=business_name,
+        status="completed",
+        completionPercentage=100,
+        createdAt=now,
+        entrepreneurDetails=SimpleNamespace(
+            fullName="Ravi Kumar", dateOfBirth=datetime(1990, 5, 17), education="B.Tech",
+            yearsOfExperience=8, technicalSkills="Food processing", previousBusinessExperience=None
+        ),
+        businessDetails=SimpleNamespace(
+            businessName=business_name, sector="Food Processing", subSector="Pickles",
+            legalStructure="Proprietorship", registrationNumber=None,
+            location="Visakhapatnam", address="Plot 12, Industrial Estate"
+        ),
+        productDetails=SimpleNamespace(
+            productName="Mango pickle", description="Traditional recipes in retail packs",
+            keyFeatures=["No preservatives", "Glass jars"], uniqueSellingPoints="Home-style taste",
+            currentCapacity=None, plannedCapacity=5000, qualityCertifications="FSSAI",
+            targetCustomers="Households and supermarkets"
+        ),
+        financialDetails=SimpleNamespace(
+            totalInvestmentAmount=Decimal("2500000.00"), landCost=Decimal("0"), buildingCost=Decimal("800000"),
+            machineryCost=Decimal("1200000"), workingCapital=Decimal("400000"), otherCosts=Decimal("100000"),
+            ownContribution=Decimal("500000"), loanRequired=Decimal("2000000")
+        ),
+        revenueAssumptions=SimpleNamespace(
+            productPrice=Decimal("120.50"), monthlySalesQuantityYear1=800, monthlySalesQuantityYear2=1000,
+            monthlySalesQuantityYear3=1200, growthRatePercentage=Decimal("5.00")
+        ),
+        costDetails=SimpleNamespace(
+            rawMaterialCostMonthly=Decimal("20000"), laborCostMonthly=Decimal("15000"),
+            utilitiesCostMonthly=Decimal("3000"), rentMonthly=Decimal("5000"),
+            marketingCostMonthly=Decimal("2000"), otherFixedCostsMonthly=Decimal("5000")
+        ),
+        staffingDetails=SimpleNamespace(totalEmployees=6),
+        timelineDetails=None,
+        generatedContents=[
+            SimpleNamespace(id=index + 1, sectionName=name, versionNumber=1,
+                            generatedText=sample_section_text(name), generatedAt=now)
+            for index, name in enumerate(SECTIONS)
+        ],
+        financialProjections=projections,
+        projectionSeries=None,
+        financialSummary=SimpleNamespace(
+            breakevenMonths=14, roiPercentage=Decimal("120.50"), paybackPeriodMonths=28,
+            npv=Decimal("1234567.89"), profitMarginPercentage=Decimal("42.10"), calculatedAt=now
+        )
+    )
+
+
+def sample_schemes():
+    return [SimpleNamespace(scheme=SimpleNamespace(
+        schemeName="PMEGP", ministry="Ministry of MSME", schemeType="subsidy",
+        subsidyPercentage=Decimal("25"), maxSubsidyAmount=Decimal("500000"),
+        description="Credit-linked subsidy for new micro enterprises"
+    ))]
+
+
+def test_renderer_selection():
+    assert uses_native_renderer("basic", "english")
+    assert uses_native_renderer("bank-ready", "english")
+    assert not uses_native_renderer("professional", "english")
+    assert not uses_native_renderer("basic", "telugu")
+
+
+def test_latin1_replaces_unsupported_characters():
+    assert latin1("₹ 12,34,567 – “ok”") == 'Rs. 12,34,567 - "ok"'
+    assert latin1("✓ Strong") == "Strong"
+    assert latin1(None) == ""
+
+
+def test_markdown_blocks():
+    blocks = markdown_blocks("## Plan\n\n**Bold** text and [link](https://example.com)\n- one\n  more\n1. two\n---")
+    assert blocks == [
+        ("heading", 2, [("Plan", "")]),
+        ("paragraph", [("Bold", "B"), (" text and link", "")]),
+        ("item", "-", [("one", ""), ("more", "")]),
+        ("item", "1.", [("two", "")]),
+        ("rule",)
+    ]
+
+
+def test_full_report_renders():
+    pdf = render_dpr_pdf(sample_dpr_form(), sample_schemes(), "english", "bank-ready")
+    assert pdf.startswith(b"%PDF-")
+    assert pdf.rstrip().endswith(b"%%EOF")
+    # Cover, eight sections and the generated content's overflow pages
+    assert len(re.findall(rb"/Type /Page\b", pdf)) >= 10
+
+
+def test_output_is_deterministic():
+    form = sample_dpr_form()
+    assert render_dpr_pdf(form, None, "english", "basic") == render_dpr_pdf(form, None, "english", "basic")
+
+
+def test_minimal_form_renders():
+    form = sample_dpr_form()
+    for relation in ("entrepreneurDetails", "businessDetails", "productDetails", "financialDetails",
+                     "revenueAssumptions", "costDetails", "staffingDetails", "financialSummary"):
+        setattr(form, relation, None)
+    form.generatedContents = []
+    form.financialProjections = []
+    assert render_dpr_pdf(form, None, "english", "basic").startswith(b"%PDF-")
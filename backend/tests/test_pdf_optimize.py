@@ -0,0 +1,94 @@
+"""
+Automated Tests for the PDF post-processing optimizer
+"""
+import sys
+import os
+
+import pytest
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.pdf_optimize import PDF_OPTIMIZE_IMAGE_DPI, _multiply, optimize_pdf
+
+pikepdf = pytest.importorskip("pikepdf")
+fpdf = pytest.importorskip("fpdf")
+Image = pytest.importorskip("PIL.Image")
+
+
+def image_pdf(tmp_path, widths_mm=(100, 190)):
+    """PDF drawing one large photo-like image once per page, at the given widths"""
+    picture = Image.effect_mandelbrot((3000, 2000), (-2, -1.2, 1, 1.2), 100).convert("RGB")
+    picture_path = tmp_path / "photo.png"
+    picture.save(picture_path)
+    document = fpdf.FPDF()
+    for width in widths_mm:
+        document.add_page()
+        document.image(str(picture_path), x=10, y=10, w=width)
+    path = tmp_path / "images.pdf"
+    document.output(str(path))
+    return str(path)
+
+
+def text_pdf(tmp_path):
+    document = fpdf.FPDF()
+    document.set_font("helvetica", size=11)
+    for page in range(5):
+        document.add_page()
+        for line in range(40):
+            document.cell(0, 6, f"Page {page + 1}, line {line + 1}: projected revenue and costs", new_x="LMARGIN", new_y="NEXT")
+    path = tmp_path / "text.pdf"
+    document.output(str(path))
+    return str(path)
+
+
+def test_matrix_concatenation():
+    scale = (2.0, 0.0, 0.0, 3.0, 0.0, 0.0)
+    translate = (1.0, 0.0, 0.0, 1.0, 10.0, 20.0)
+    assert _multiply(scale, translate) == (2.0, 0.0, 0.0, 3.0, 10.0, 20.0)
+    assert _multiply(translate, scale) == (2.0, 0.0, 0.0, 3.0, 20.0, 60.0)
+
+
+def test_off_leaves_file_untouched(tmp_path):
+    path = text_pdf(tmp_path)
+    with open(path, "rb") as source:
+        before = source.read()
+    result = optimize_pdf(path, "off")
+    assert result.original_size == result.optimized_size == len(before)
+    with open(path, "rb") as source:
+        assert source.read() == before
+
+
+def test_lossless_linearizes(tmp_path):
+    path = text_pdf(tmp_path)
+    result = optimize_pdf(path, "lossless")
+    assert result.optimized_size == os.path.getsize(path)
+    assert result.images_recompressed == 0
+    with pikepdf.open(path) as pdf:
+        assert pdf.is_linearized
+        assert len(pdf.pages) == 5
+
+
+def test_images_are_downsampled_to_placement(tmp_path):
+    path = image_pdf(tmp_path)
+    result = optimize_pdf(path, "images")
+    assert result.images_recompressed == 1
+    assert result.optimized_size < result.original_size / 2
+    assert os.path.getsize(path) == result.optimized_size
+
+    with pikepdf.open(path) as pdf:
+        assert pdf.is_linearized
+        image = next(iter(pdf.pages[0].get_images().values()))
+        # Sized for the largest placement: 190 mm wide
+        assert int(image.Width) == round(190 / 25.4 * PDF_OPTIMIZE_IMAGE_DPI)
+        assert image.Filter == "/DCTDecode"
+
+
+def test_images_drawn_small_enough_are_kept(tmp_path):
+    # 3000 px across 600 mm is 127 dpi, below the target
+    path = image_pdf(tmp_path, widths_mm=(600,))
+    with pikepdf.open(path) as pdf:
+        original_width = int(next(iter(pdf.pages[0].get_images().values())).Width)
+    optimize_pdf(path, "images")
+    with pikepdf.open(path) as pdf:
+        assert int(next(iter(pdf.pages[0].get_images().values())).Width) == original_width
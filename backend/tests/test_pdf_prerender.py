@@ -0,0 +1,156 @@
+"""
+Automated Tests for speculative background PDF pre-rendering
+"""
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.pdf_prerender as pdf_prerender
+from utils.ai_service import AVAILABLE_SECTIONS
+from utils.pdf_prerender import PdfPrerenderScheduler, is_ready_for_prerender
+
+
+class ConnectedDb:
+    """Stands in for the scheduler's Prisma client"""
+
+    def is_connected(self):
+        return True
+
+    async def disconnect(self):
+        pass
+
+
+def make_scheduler(delay: float = 0.05, min_interval: float = 0):
+    scheduler = PdfPrerenderScheduler(delay_seconds=delay, min_interval_seconds=min_interval)
+    scheduler.db = ConnectedDb()
+    return scheduler
+
+
+def recording_job(rendered: list, duration: float = 0):
+    async def job(db, form_id):
+        await asyncio.sleep(duration)
+        rendered.append(form_id)
+    return job
+
+
+@pytest.fixture
+def idle_pool(monkeypatch):
+    pool = SimpleNamespace(idle=True)
+    monkeypatch.setattr(pdf_prerender, "browser_pool", pool)
+    return pool
+
+
+def complete_form(**overrides):
+    form = SimpleNamespace(
+        completionPercentage=100,
+        generatedContents=[SimpleNamespace(sectionName=name, generatedText="text") for name in AVAILABLE_SECTIONS]
+    )
+    for name, value in overrides.items():
+        setattr(form, name, value)
+    return form
+
+
+def test_ready_only_when_complete_with_every_section():
+    assert is_ready_for_prerender(complete_form())
+    assert not is_ready_for_prerender(None)
+    assert not is_ready_for_prerender(complete_form(completionPercentage=90))
+    form = complete_form()
+    form.generatedContents = form.generatedContents[1:]
+    assert not is_ready_for_prerender(form)
+
+
+def test_edits_restart_the_quiet_period(idle_pool):
+    async def scenario():
+        rendered = []
+        scheduler = make_scheduler()
+        scheduler.start(recording_job(rendered))
+        for _ in range(5):
+            scheduler.schedule(7)
+            await asyncio.sleep(0.02)
+        assert rendered == []
+        await asyncio.sleep(0.15)
+        await scheduler.shutdown()
+        return rendered
+
+    assert asyncio.run(scenario()) == [7]
+
+
+def test_cancel_drops_pending_prerender(idle_pool):
+    async def scenario():
+        rendered = []
+        scheduler = make_scheduler()
+        scheduler.start(recording_job(rendered))
+        scheduler.schedule(7)
+        scheduler.schedule(8)
+        scheduler.cancel(7)
+        await asyncio.sleep(0.15)
+        await scheduler.shutdown()
+        return rendered
+
+    assert asyncio.run(scenario()) == [8]
+
+
+def test_waits_while_interactive_renders_use_the_pool(idle_pool):
+    async def scenario():
+        rendered = []
+        idle_pool.idle = False
+        scheduler = make_scheduler(delay=0.01)
+        scheduler.start(recording_job(rendered))
+        scheduler.schedule(7)
+        await asyncio.sleep(0.1)
+        busy_result = list(rendered)
+        idle_pool.idle = True
+        await asyncio.sleep(0.6)
+        await scheduler.shutdown()
+        return busy_result, rendered
+
+    assert asyncio.run(scenario()) == ([], [7])
+
+
+def test_prerenders_are_rate_limited(idle_pool):
+    async def scenario():
+        rendered = []
+        scheduler = make_scheduler(delay=0.01, min_interval=0.2)
+        scheduler.start(recording_job(rendered))
+        scheduler.schedule(1)
+        scheduler.schedule(2)
+        await asyncio.sleep(0.1)
+        first = list(rendered)
+        await asyncio.sleep(0.2)
+        await scheduler.shutdown()
+        return first, rendered
+
+    assert asyncio.run(scenario()) == ([1], [1, 2])
+
+
+def test_interactive_request_waits_for_running_prerender(idle_pool):
+    async def scenario():
+        rendered = []
+        scheduler = make_scheduler(delay=0.01)
+        scheduler.start(recording_job(rendered, duration=0.1))
+        scheduler.schedule(7)
+        await asyncio.sleep(0.03)
+        # Another template does not wait; the default one does
+        await scheduler.wait_for(7, "english", "basic", timeout=1)
+        other_template = list(rendered)
+        await scheduler.wait_for(7, "english", "professional", timeout=1)
+        await scheduler.shutdown()
+        return other_template, rendered
+
+    assert asyncio.run(scenario()) == ([], [7])
+
+
+def test_disabled_without_delay(idle_pool):
+    async def scenario():
+        scheduler = make_scheduler(delay=0)
+        scheduler.start(recording_job([]))
+        scheduler.schedule(7)
+        return scheduler.enabled, dict(scheduler._pending)
+
+    assert asyncio.run(scenario()) == (False, {})
@@ -0,0 +1,72 @@
+"""
+Automated Tests for the PDF browser pool
+"""
+import sys
+import os
+import asyncio
+import threading
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.pdf_renderer as pdf_renderer
+from utils.pdf_renderer import BrowserPool
+
+
+def use_fake_browsers(monkeypatch):
+    """Slots run jobs with None as the page instead of launching Chromium"""
+    monkeypatch.setattr(pdf_renderer._BrowserSlot, "render", lambda self, job, context_options: job(None))
+
+
+def test_jobs_run_on_pool_threads(monkeypatch):
+    use_fake_browsers(monkeypatch)
+
+    async def scenario():
+        pool = BrowserPool(size=2, queue_limit=4, queue_timeout=5)
+        await pool.start(warm=False)
+        results = await asyncio.gather(*(pool.run(lambda page: threading.current_thread().name) for _ in range(4)))
+        idle = pool.idle
+        await pool.shutdown()
+        return results, idle
+
+    results, idle = asyncio.run(scenario())
+    assert all(name.startswith("pdf-browser-") for name in results)
+    assert idle
+
+
+def test_cancelled_request_keeps_slot_until_render_finishes(monkeypatch):
+    use_fake_browsers(monkeypatch)
+    release = threading.Event()
+
+    async def scenario():
+        pool = BrowserPool(size=1, queue_limit=4, queue_timeout=5)
+        await pool.start(warm=False)
+
+        started = threading.Event()
+
+        def slow_job(page):
+            started.set()
+            release.wait(5)
+            return "slow"
+
+        request = asyncio.create_task(pool.run(slow_job))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        request.cancel()
+        await asyncio.gather(request, return_exceptions=True)
+
+        # The browser is still rendering the cancelled job
+        busy_after_cancel = not pool.idle
+        release.set()
+        result = await pool.run(lambda page: "next")
+        idle = pool.idle
+        await pool.shutdown()
+        return busy_after_cancel, result, idle
+
+    try:
+        busy_after_cancel, result, idle = asyncio.run(scenario())
+    finally:
+        release.set()
+    assert busy_after_cancel
+    assert result == "next"
+    assert idle
@@ -0,0 +1,122 @@
+"""
+Automated Tests for the pluggable PDF storage drivers
+"""
+import sys
+import os
+import hashlib
+
+import pytest
+
+# Add backend directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.pdf_storage import LocalPdfStorage, S3PdfStorage, content_key, local_storage_root
+
+PDF_BYTES = b"%PDF-1.7\n" + bytes(range(256)) * 64 + b"\n%%EOF\n"
+
+
+def write_pdf(tmp_path, name="report.pdf", data=PDF_BYTES):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_content_key_is_sharded():
+    checksum = hashlib.sha256(PDF_BYTES).hexdigest()
+    assert content_key(checksum) == f"{checksum[:2]}/{checksum[2:4]}/{checksum}.pdf"
+
+
+def test_local_root_does_not_depend_on_working_directory(tmp_path, monkeypatch):
+    backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    monkeypatch.chdir(tmp_path)
+    assert local_storage_root("uploads") == os.path.join(backend_dir, "uploads")
+    assert local_storage_root(str(tmp_path / "pdfs")) == str(tmp_path / "pdfs")
+    assert LocalPdfStorage().root == local_storage_root()
+
+
+def test_local_round_trip(tmp_path):
+    storage = LocalPdfStorage(str(tmp_path / "store"))
+    stored = storage.save_file(write_pdf(tmp_path))
+
+    assert stored.checksum == hashlib.sha256(PDF_BYTES).hexdigest()
+    assert stored.size == len(PDF_BYTES)
+    assert storage.exists(stored.key)
+    assert b"".join(storage.open(stored.key)) == PDF_BYTES
+    assert b"".join(storage.open(stored.key, 9, 18)) == PDF_BYTES[9:19]
+    assert b"".join(storage.open(stored.key, len(PDF_BYTES) - 6)) == b"%%EOF\n"
+
+
+def test_local_identical_files_are_stored_once(tmp_path):
+    storage = LocalPdfStorage(str(tmp_path / "store"))
+    first = storage.save_file(write_pdf(tmp_path, "a.pdf"))
+    second = storage.save_file(write_pdf(tmp_path, "b.pdf"))
+
+    assert first == second
+    assert [key for key, _, _ in storage.iter_objects()] == [first.key]
+    # Nothing is left behind in the staging directory
+    assert os.listdir(tmp_path / "store" / LocalPdfStorage.STAGING_DIR) == []
+
+
+def test_local_dedupe_refreshes_modified_time(tmp_path):
+    storage = LocalPdfStorage(str(tmp_path / "store"))
+    stored = storage.save_file(write_pdf(tmp_path, "a.pdf"))
+    path = storage.path(stored.key)
+    os.utime(path, (1_000_000, 1_000_000))
+
+    storage.save_file(write_pdf(tmp_path, "b.pdf"))
+    # Newer than any GC cutoff again
+    assert os.path.getmtime(path) > 1_000_000
+
+
+def test_local_delete_and_legacy_keys(tmp_path):
+    storage = LocalPdfStorage(str(tmp_path / "store"))
+    stored = storage.save_file(write_pdf(tmp_path))
+    # Files written before content addressing live flat in the root
+    (tmp_path / "store" / "DPR_Acme_1_20250101.pdf").write_bytes(b"%PDF-old")
+
+    keys = sorted(key for key, _, _ in storage.iter_objects())
+    assert keys == sorted([stored.key, "DPR_Acme_1_20250101.pdf"])
+    assert storage.delete(stored.key) == len(PDF_BYTES)
+    assert storage.delete(stored.key) == 0
+    assert not storage.exists(stored.key)
+
+
+def test_local_rejects_keys_outside_root(tmp_path):
+    storage = LocalPdfStorage(str(tmp_path / "store"))
+    with pytest.raises(ValueError):
+        storage.path("../secrets.pdf")
+
+
+@pytest.fixture
+def s3_endpoint():
+    """In-process S3-compatible server (stands in for MinIO)"""
+    pytest.importorskip("boto3")
+    server_module = pytest.importorskip("moto.server")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    server = server_module.ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+def test_s3_round_trip(tmp_path, s3_endpoint):
+    storage = S3PdfStorage(
+        bucket="dpr-pdfs", prefix="pdfs/", endpoint_url=s3_endpoint,
+        region="us-east-1", presign_seconds=60
+    )
+    storage.client.create_bucket(Bucket="dpr-pdfs")
+
+    stored = storage.save_file(write_pdf(tmp_path))
+    assert storage.save_file(write_pdf(tmp_path, "copy.pdf")) == stored
+    assert storage.exists(stored.key)
+    assert b"".join(storage.open(stored.key)) == PDF_BYTES
+    assert b"".join(storage.open(stored.key, 9, 18)) == PDF_BYTES[9:19]
+    assert [(key, size) for key, size, _ in storage.iter_objects()] == [(stored.key, len(PDF_BYTES))]
+    assert storage.local_path(stored.key) is None
+    assert f"pdfs/{stored.key}" in storage.presigned_url(stored.key)
+
+    assert storage.delete(stored.key) == len(PDF_BYTES)
+    assert not storage.exists(stored.key)
+    assert storage.delete(stored.key) == 0
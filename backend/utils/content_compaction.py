@@ -0,0 +1,218 @@
+"""
+Generated Content Compaction
+Retention policy for the version history of AI-generated sections.
+
+The newest CONTENT_KEEP_VERSIONS versions of every section, and every
+user-edited version, keep their full text. Older versions are compacted:
+their text is replaced by a zlib-compressed delta against the next version
+of the same section (deltaBaseId), so any version can still be rebuilt by
+walking the chain up to a version with full text.
+
+The compactor runs in batches of sections, from the app lifespan or from
+compact_generated_content.py.
+"""
+import asyncio
+import difflib
+import json
+import logging
+import os
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+from prisma import Prisma
+from prisma.fields import Base64
+
+logger = logging.getLogger(__name__)
+
+# Versions of each section kept as full text (the latest is always kept)
+CONTENT_KEEP_VERSIONS = int(os.getenv("CONTENT_KEEP_VERSIONS", "5"))
+if CONTENT_KEEP_VERSIONS < 1:
+    raise ValueError("CONTENT_KEEP_VERSIONS must be at least 1")
+
+# Sections (form, section name) compacted per batch
+CONTENT_COMPACT_BATCH_SIZE = int(os.getenv("CONTENT_COMPACT_BATCH_SIZE", "100"))
+
+# How often the app runs the compactor (0 disables it; use compact_generated_content.py instead)
+CONTENT_COMPACT_INTERVAL_HOURS = float(os.getenv("CONTENT_COMPACT_INTERVAL_HOURS", "24"))
+
+# Pause between batches of the background compactor
+CONTENT_COMPACT_BATCH_PAUSE_SECONDS = 1.0
+
+# Bump when the delta encoding changes
+DELTA_FORMAT = 1
+
+# Sections with full-text versions past the kept ones, after ($2, $3) in
+# (form_id, section_name) order. Keyset pagination in index order
+# (generated_content_latest_idx), so each batch stops after LIMIT sections;
+# compact_section ranks the versions exactly.
+COMPACTION_CANDIDATES_QUERY = """
+SELECT form_id AS "formId", section_name AS "sectionName"
+FROM (
+    SELECT form_id, section_name, user_edited, generated_text IS NOT NULL AS has_text,
+           ROW_NUMBER() OVER (PARTITION BY form_id, section_name ORDER BY version_number DESC) AS version_rank
+    FROM generated_content
+    WHERE (form_id, section_name) > ($2, $3)
+) versions
+WHERE version_rank > $1 AND has_text AND NOT user_edited
+GROUP BY form_id, section_name
+ORDER BY form_id, section_name
+LIMIT $4
+"""
+
+# Words with their trailing whitespace (joining the tokens gives the text back)
+TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+def _tokens(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text)
+
+
+def make_text_delta(base: str, text: str) -> bytes:
+    """
+    Compressed word-level delta that rebuilds text from base: [start, end]
+    copies base tokens, a string is inserted as is
+    """
+    base_tokens = _tokens(base)
+    text_tokens = _tokens(text)
+    ops: list = []
+    matcher = difflib.SequenceMatcher(None, base_tokens, text_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(text_tokens[j1:j2]))
+    payload = json.dumps({"format": DELTA_FORMAT, "ops": ops}, separators=(",", ":"), ensure_ascii=False)
+    return zlib.compress(payload.encode("utf-8"), 9)
+
+
+def apply_text_delta(base: str, delta: bytes) -> str:
+    """Text a make_text_delta(base, text) delta was made from"""
+    payload = json.loads(zlib.decompress(delta).decode("utf-8"))
+    if payload.get("format") != DELTA_FORMAT:
+        raise ValueError(f"Unsupported content delta format: {payload.get('format')}")
+    base_tokens = _tokens(base)
+    return "".join(
+        "".join(base_tokens[op[0]:op[1]]) if isinstance(op, list) else op
+        for op in payload["ops"]
+    )
+
+
+def resolve_version_texts(versions) -> Dict[int, str]:
+    """
+    Full text of each version by id; versions are one section's rows from
+    newest to oldest, starting at a version with full text
+    """
+    texts: Dict[int, str] = {}
+    for content in versions:
+        if content.generatedText is not None:
+            texts[content.id] = content.generatedText
+        elif content.deltaBaseId in texts:
+            texts[content.id] = apply_text_delta(texts[content.deltaBaseId], content.textDelta.decode())
+        else:
+            raise ValueError(f"Generated content {content.id} has no base version {content.deltaBaseId}")
+    return texts
+
+
+async def _section_versions(db: Prisma, form_id: int, section_name: str, min_version: int = 0):
+    return await db.generatedcontent.find_many(
+        where={"formId": form_id, "sectionName": section_name, "versionNumber": {"gte": min_version}},
+        order=[{"versionNumber": "desc"}, {"id": "desc"}]
+    )
+
+
+async def load_content_version(db: Prisma, form_id: int, section_name: str, version_number: int) -> Optional[Tuple[object, str]]:
+    """A section version and its full text (rebuilt if compacted); None when it does not exist"""
+    versions = await _section_versions(db, form_id, section_name, version_number)
+    content = next((content for content in versions if content.versionNumber == version_number), None)
+    if content is None:
+        return None
+    return content, resolve_version_texts(versions)[content.id]
+
+
+async def compact_section(
+    db: Prisma,
+    form_id: int,
+    section_name: str,
+    keep_versions: int = CONTENT_KEEP_VERSIONS,
+    dry_run: bool = False
+) -> dict:
+    """Compact one section's versions past the kept ones; returns counts and sizes"""
+    versions = await _section_versions(db, form_id, section_name)
+    texts = resolve_version_texts(versions)
+
+    compacted = []
+    for rank, content in enumerate(versions[1:], 2):
+        if rank > keep_versions and content.generatedText is not None and not content.userEdited:
+            # Each version's successor is the previous (newer) row
+            base = versions[rank - 2]
+            compacted.append((content, base.id, make_text_delta(texts[base.id], texts[content.id])))
+
+    if compacted and not dry_run:
+        async with db.tx() as transaction:
+            for content, base_id, delta in compacted:
+                # Only rows still holding their text, so concurrent compactors do not clash
+                await transaction.generatedcontent.update_many(
+                    where={"id": content.id, "generatedText": {"not": None}},
+                    data={"generatedText": None, "textDelta": Base64.encode(delta), "deltaBaseId": base_id}
+                )
+
+    return {
+        "compacted_versions": len(compacted),
+        "text_bytes": sum(len(texts[content.id].encode("utf-8")) for content, _, _ in compacted),
+        "delta_bytes": sum(len(delta) for _, _, delta in compacted)
+    }
+
+
+async def compact_generated_content(
+    db: Prisma,
+    keep_versions: int = CONTENT_KEEP_VERSIONS,
+    batch_size: int = CONTENT_COMPACT_BATCH_SIZE,
+    dry_run: bool = False,
+    batch_pause_seconds: float = 0
+) -> dict:
+    """
+    Apply the retention policy to every section, batch_size sections at a time
+
+    Returns totals of sections and versions compacted and the text bytes
+    replaced by delta bytes. A section that fails is logged and skipped.
+    """
+    totals = {"sections": 0, "compacted_versions": 0, "text_bytes": 0, "delta_bytes": 0, "failed_sections": 0}
+    after = (0, "")
+    while True:
+        batch = await db.query_raw(COMPACTION_CANDIDATES_QUERY, keep_versions, after[0], after[1], batch_size)
+        for candidate in batch:
+            try:
+                result = await compact_section(db, candidate["formId"], candidate["sectionName"], keep_versions, dry_run)
+            except Exception as e:
+                logger.error(
+                    f"Compacting {candidate['sectionName']} of form {candidate['formId']} failed: {str(e)}"
+                )
+                totals["failed_sections"] += 1
+                continue
+            totals["sections"] += 1
+            for name in ("compacted_versions", "text_bytes", "delta_bytes"):
+                totals[name] += result[name]
+
+        if len(batch) < batch_size:
+            break
+        after = (batch[-1]["formId"], batch[-1]["sectionName"])
+        if batch_pause_seconds > 0:
+            await asyncio.sleep(batch_pause_seconds)
+
+    return {**totals, "dry_run": dry_run}
+
+
+async def run_content_compaction_periodically(db: Prisma, interval_hours: float = CONTENT_COMPACT_INTERVAL_HOURS):
+    """Background loop started from the app lifespan"""
+    while True:
+        await asyncio.sleep(interval_hours * 3600)
+        try:
+            if not db.is_connected():
+                await db.connect()
+            result = await compact_generated_content(db, batch_pause_seconds=CONTENT_COMPACT_BATCH_PAUSE_SECONDS)
+            logger.info(
+                f"Content compaction compacted {result['compacted_versions']} versions in "
+                f"{result['sections']} sections ({result['text_bytes']} bytes of text to {result['delta_bytes']})"
+            )
+        except Exception as e:
+            logger.error(f"Content compaction failed: {str(e)}")
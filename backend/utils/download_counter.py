@@ -0,0 +1,94 @@
+"""
+Download Counter
+Buffers PdfDocument download increments in memory and writes them in one
+batched UPDATE per flush instead of one row update per view
+"""
+import asyncio
+import logging
+import os
+from typing import Dict, Optional
+from prisma import Prisma
+
+logger = logging.getLogger(__name__)
+
+# Seconds between flushes of buffered download counts
+PDF_COUNTER_FLUSH_SECONDS = float(os.getenv("PDF_COUNTER_FLUSH_SECONDS", "10"))
+
+# Adds every (id, delta) pair in one statement; concurrent flushes from other
+# workers compose because the increment happens in the database
+FLUSH_QUERY = """
+UPDATE pdf_documents AS document
+SET download_count = document.download_count + pending.delta
+FROM (SELECT unnest($1::int[]) AS id, unnest($2::int[]) AS delta) AS pending
+WHERE document.id = pending.id
+"""
+
+
+class DownloadCounter:
+    """
+    Per-process buffer of download increments keyed by PdfDocument id
+
+    Reads add pending() to the stored count, so a process's own counts are
+    exact between flushes; other workers' increments show up once flushed.
+    """
+
+    def __init__(self, flush_interval: float = PDF_COUNTER_FLUSH_SECONDS):
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._db: Optional[Prisma] = None
+
+    def increment(self, pdf_id: int, count: int = 1):
+        self._pending[pdf_id] = self._pending.get(pdf_id, 0) + count
+
+    def pending(self, pdf_id: int) -> int:
+        return self._pending.get(pdf_id, 0)
+
+    def current_count(self, pdf_document) -> int:
+        """Stored downloadCount plus increments not yet flushed"""
+        return pdf_document.downloadCount + self.pending(pdf_document.id)
+
+    async def flush(self, db: Prisma) -> int:
+        """Write buffered increments in one UPDATE; returns the rows updated"""
+        if not self._pending:
+            return 0
+        # Swap the buffer first so increments arriving during the write are kept
+        batch, self._pending = self._pending, {}
+        try:
+            if not db.is_connected():
+                await db.connect()
+            return await db.execute_raw(FLUSH_QUERY, list(batch.keys()), list(batch.values()))
+        except Exception:
+            # Put the increments back for the next flush
+            for pdf_id, count in batch.items():
+                self.increment(pdf_id, count)
+            raise
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush(self._db)
+            except Exception as e:
+                logger.error(f"Failed to flush PDF download counts: {str(e)}")
+
+    def start(self, db: Prisma):
+        """Start periodic flushing (app startup)"""
+        if self._task is None:
+            self._db = db
+            self._task = asyncio.create_task(self._run())
+
+    async def shutdown(self):
+        """Stop flushing and write what is left (app shutdown)"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._db is not None:
+            try:
+                await self.flush(self._db)
+            except Exception as e:
+                logger.error(f"Failed to flush PDF download counts on shutdown: {str(e)}")
+
+
+# Global counter instance
+download_counter = DownloadCounter()
@@ -0,0 +1,298 @@
+"""
+DPR HTML Renderer
+Builds the complete Detailed Project Report as a self-contained HTML document
+(Jinja2 template with inlined CSS) from the data generate_pdf already loads,
+so Chromium can render it with set_content instead of loading the frontend
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+import html
+import os
+import re
+from typing import List, Optional
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+from utils.financial_recompute import projection_columns_from_record, projection_columns_from_rows
+from utils.form_snapshot import latest_contents
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+# Relations generate_pdf loads for server-side rendering
+DPR_RENDER_INCLUDE = {
+    "entrepreneurDetails": True,
+    "businessDetails": True,
+    "productDetails": True,
+    "financialDetails": True,
+    "revenueAssumptions": True,
+    "costDetails": True,
+    "staffingDetails": True,
+    "timelineDetails": True,
+    "generatedContents": True,
+    "financialProjections": {"order_by": {"monthNumber": "asc"}},
+    "projectionSeries": True,
+    "financialSummary": True
+}
+
+
+# ============================================================
+# Formatting filters
+# ============================================================
+
+def format_inr(value, decimals: Optional[int] = None) -> str:
+    """
+    Rupee amount with Indian digit grouping, e.g. ₹ 12,34,567.5
+
+    decimals=None shows up to two decimals only when the amount has paise.
+    """
+    if value is None:
+        return ""
+    amount = Decimal(str(value))
+    trim = decimals is None
+    if trim:
+        decimals = 0 if amount == amount.to_integral_value() else 2
+    sign = "-" if amount < 0 else ""
+    text = f"{abs(amount):.{decimals}f}"
+    whole, _, fraction = text.partition(".")
+    if len(whole) > 3:
+        head, tail = whole[:-3], whole[-3:]
+        groups = []
+        while len(head) > 2:
+            groups.insert(0, head[-2:])
+            head = head[:-2]
+        if head:
+            groups.insert(0, head)
+        whole = ",".join(groups + [tail])
+    if fraction and trim:
+        fraction = fraction.rstrip("0")
+    return f"₹ {sign}{whole}" + (f".{fraction}" if fraction else "")
+
+
+def format_date(value) -> str:
+    """Date in en-IN order (dd/mm/yyyy)"""
+    if not isinstance(value, (date, datetime)):
+        return "" if value is None else str(value)
+    return value.strftime("%d/%m/%Y")
+
+
+def format_datetime(value) -> str:
+    if not isinstance(value, datetime):
+        return format_date(value)
+    return value.strftime("%d/%m/%Y, %I:%M %p")
+
+
+_INLINE_CODE = re.compile(r"`([^`]+)`")
+_BOLD = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1")
+_ITALIC = re.compile(r"(?<![\w*])([*_])(?=\S)(.+?)(?<=\S)\1(?![\w*])")
+_LINK = re.compile(r"\[([^\]]+)\]\((https?://[^)\s\"'<>]+)\)")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+_UNORDERED = re.compile(r"^\s*[-*+]\s+(.*)$")
+_ORDERED = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+_RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+
+
+def _inline(text: str) -> str:
+    """Escape text and apply inline markdown (code, bold, italics, links)"""
+    stashed: List[str] = []
+
+    def stash(markup: str) -> str:
+        stashed.append(markup)
+        return f"\x00{len(stashed) - 1}\x00"
+
+    text = _INLINE_CODE.sub(lambda match: stash(f"<code>{match.group(1)}</code>"), html.escape(text, quote=False))
+    # Stash the opening tag so emphasis applies to the label but never to the href
+    text = _LINK.sub(
+        lambda match: stash(f'<a href="{html.escape(html.unescape(match.group(2)), quote=True)}">') + f"{match.group(1)}</a>",
+        text
+    )
+    text = _BOLD.sub(r"<strong>\2</strong>", text)
+    text = _ITALIC.sub(r"<em>\2</em>", text)
+    return re.sub(r"\x00(\d+)\x00", lambda match: stashed[int(match.group(1))], text)
+
+
+def markdown_to_html(text: Optional[str]) -> Markup:
+    """
+    Convert AI-generated markdown to HTML
+
+    Covers what the generated sections use: headings, paragraphs, bullet and
+    numbered lists, rules, fenced code and inline emphasis. All text is
+    escaped, so raw HTML in the content is shown literally.
+    """
+    if not text:
+        return Markup("")
+
+    output: List[str] = []
+    paragraph: List[str] = []
+    list_tag: Optional[str] = None
+    in_code = False
+    code_lines: List[str] = []
+
+    def flush_paragraph():
+        if paragraph:
+            output.append(f"<p>{_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+
+    def close_list():
+        nonlocal list_tag
+        if list_tag:
+            output.append(f"</{list_tag}>")
+            list_tag = None
+
+    for line in text.replace("\r\n", "\n").split("\n"):
+        if line.strip().startswith("```"):
+            if in_code:
+                output.append(f"<pre><code>{html.escape(chr(10).join(code_lines), quote=False)}</code></pre>")
+                code_lines.clear()
+                in_code = False
+            else:
+                flush_paragraph()
+                close_list()
+                in_code = True
+            continue
+        if in_code:
+            code_lines.append(line)
+            continue
+
+        stripped = line.strip()
+        if not stripped:
+            flush_paragraph()
+            close_list()
+            continue
+
+        heading = _HEADING.match(stripped)
+        if heading:
+            flush_paragraph()
+            close_list()
+            level = len(heading.group(1))
+            output.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+            continue
+
+        if _RULE.match(stripped):
+            flush_paragraph()
+            close_list()
+            output.append("<hr>")
+            continue
+
+        item = _UNORDERED.match(line)
+        tag = "ul"
+        if not item:
+            item = _ORDERED.match(line)
+            tag = "ol"
+        if item:
+            flush_paragraph()
+            if list_tag != tag:
+                close_list()
+                output.append(f"<{tag}>")
+                list_tag = tag
+            output.append(f"<li>{_inline(item.group(1))}</li>")
+            continue
+
+        if list_tag and line[:1].isspace():
+            # Continuation of the previous list item
+            output[-1] = output[-1][:-len("</li>")] + " " + _inline(stripped) + "</li>"
+            continue
+
+        close_list()
+        paragraph.append(stripped)
+
+    if in_code:
+        output.append(f"<pre><code>{html.escape(chr(10).join(code_lines), quote=False)}</code></pre>")
+    flush_paragraph()
+    close_list()
+    return Markup("\n".join(output))
+
+
+@lru_cache(maxsize=1)
+def _environment() -> Environment:
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(["html"])
+    )
+    environment.filters["inr"] = format_inr
+    environment.filters["date"] = format_date
+    environment.filters["datetime"] = format_datetime
+    return environment
+
+
+@lru_cache(maxsize=None)
+def _stylesheet(name: str) -> Markup:
+    with open(os.path.join(TEMPLATES_DIR, name), encoding="utf-8") as css_file:
+        return Markup(css_file.read())
+
+
+# ============================================================
+# Context building
+# ============================================================
+
+def latest_generated_sections(generated_contents) -> List[dict]:
+    """Highest version of every generated section, in the order sections were first created"""
+    return [
+        {
+            "name": content.sectionName,
+            "text": content.generatedText,
+            "html": markdown_to_html(content.generatedText),
+            "generated_at": content.generatedAt
+        }
+        for content in latest_contents(generated_contents)
+    ]
+
+
+def annual_projection_rows(form) -> List[dict]:
+    """Stored monthly projections (columnar or rows) summed per project year"""
+    if form.projectionSeries:
+        columns = projection_columns_from_record(form.projectionSeries)
+    elif form.financialProjections:
+        columns = projection_columns_from_rows(sorted(form.financialProjections, key=lambda p: p.monthNumber))
+    else:
+        return []
+
+    rows = []
+    for start in range(0, len(columns["month_number"]), 12):
+        year = slice(start, start + 12)
+        rows.append({
+            "year": start // 12 + 1,
+            "revenue": round(sum(columns["revenue"][year]), 2),
+            "fixed_costs": round(sum(columns["fixed_costs"][year]), 2),
+            "variable_costs": round(sum(columns["variable_costs"][year]), 2),
+            "profit_loss": round(sum(columns["profit_loss"][year]), 2),
+            "cumulative_profit_loss": columns["cumulative_profit_loss"][year][-1]
+        })
+    return rows
+
+
+def viability_assessment(summary) -> dict:
+    """Same thresholds as the frontend DPR preview"""
+    roi = float(summary.roiPercentage)
+    npv = float(summary.npv)
+    if roi > 100 and npv > 0:
+        return {"level": "strong", "message": "✓ Project shows strong financial viability with positive ROI and NPV."}
+    if roi > 50 and npv > 0:
+        return {"level": "moderate", "message": "⚠ Project shows moderate financial viability. Review assumptions carefully."}
+    return {"level": "weak", "message": "⚠ Project requires careful review of financial assumptions and risk factors."}
+
+
+def build_dpr_context(form, schemes=None, language: str = "english", template_type: str = "professional") -> dict:
+    """Template context from a form loaded with DPR_RENDER_INCLUDE and its selected schemes"""
+    sections = latest_generated_sections(form.generatedContents)
+    summary = form.financialSummary
+    key_features = form.productDetails.keyFeatures if form.productDetails else None
+
+    return {
+        "form": form,
+        "business_name": form.businessDetails.businessName if form.businessDetails else form.businessName,
+        "language": language,
+        "template_type": template_type,
+        "key_features": key_features if isinstance(key_features, list) else None,
+        "summary": summary,
+        "viability": viability_assessment(summary) if summary else None,
+        "annual_projections": annual_projection_rows(form),
+        "schemes": [selected.scheme for selected in (schemes or []) if selected.scheme],
+        "generated_sections": sections,
+        "generated_at": max((section["generated_at"] for section in sections), default=None)
+    }
+
+
+def render_dpr_html(form, schemes=None, language: str = "english", template_type: str = "professional") -> str:
+    """Complete, self-contained DPR HTML document for PDF rendering"""
+    context = build_dpr_context(form, schemes, language, template_type)
+    return _environment().get_template("dpr/report.html").render(css=_stylesheet("dpr/report.css"), **context)
@@ -0,0 +1,620 @@
+"""
+Financial Projection Engine
+Vectorized (NumPy) month-by-month projections and summary metrics for DPR forms.
+All calculations run on a batch of N forms at once; single-form helpers are
+thin wrappers over a batch of one.
+"""
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+import hashlib
+import json
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+# Default projection horizon used by the DPR templates
+DEFAULT_HORIZON_MONTHS = 36
+
+# Horizons offered to users (3, 5 and 10 years)
+SUPPORTED_HORIZONS = (36, 60, 120)
+
+# 10% annual discount rate expressed monthly (simplified, as in the original engine)
+DISCOUNT_RATE_MONTHLY = 0.0083
+
+# Bump whenever projection formulas change so stored input fingerprints no
+# longer match and results get recalculated
+ENGINE_VERSION = 1
+
+# Arithmetic used for stored projections:
+# - float: float64 rupees (original engine behaviour)
+# - paise: exact int64 paise; only ramp-up/growth factors are rounded to the paisa
+ARITHMETIC_MODES = ("float", "paise")
+
+PAISE_PER_RUPEE = 100
+
+# Largest magnitude allowed anywhere in the paise path (headroom below int64)
+_MAX_PAISE = 2 ** 62
+
+
+@dataclass(frozen=True)
+class ProjectionInputs:
+    """Scalar inputs the projection engine needs from a DPR form"""
+    product_price: float
+    monthly_sales_year1: int
+    monthly_sales_year2: int
+    monthly_sales_year3: int
+    growth_rate_percentage: float
+    fixed_costs_monthly: float
+    variable_costs_monthly: float
+    total_investment: float
+
+    @classmethod
+    def from_form(cls, form) -> "ProjectionInputs":
+        """
+        Build engine inputs from a Prisma DprForm that includes
+        financialDetails, revenueAssumptions and costDetails
+        """
+        revenue_assumptions = form.revenueAssumptions
+        cost_details = form.costDetails
+
+        # Summed in the same order as the original engine so float results match
+        fixed_monthly = (
+            float(cost_details.laborCostMonthly) +
+            float(cost_details.utilitiesCostMonthly) +
+            float(cost_details.rentMonthly) +
+            float(cost_details.marketingCostMonthly) +
+            float(cost_details.otherFixedCostsMonthly)
+        )
+
+        return cls(
+            product_price=float(revenue_assumptions.productPrice),
+            monthly_sales_year1=revenue_assumptions.monthlySalesQuantityYear1,
+            monthly_sales_year2=revenue_assumptions.monthlySalesQuantityYear2,
+            monthly_sales_year3=revenue_assumptions.monthlySalesQuantityYear3,
+            growth_rate_percentage=float(revenue_assumptions.growthRatePercentage),
+            fixed_costs_monthly=fixed_monthly,
+            variable_costs_monthly=float(cost_details.rawMaterialCostMonthly),
+            total_investment=float(form.financialDetails.totalInvestmentAmount)
+        )
+
+
+@dataclass
+class ProjectionBatch:
+    """Engine inputs for N forms, one array element per form"""
+    product_price: np.ndarray
+    monthly_sales_year1: np.ndarray
+    monthly_sales_year2: np.ndarray
+    monthly_sales_year3: np.ndarray
+    growth_rate_percentage: np.ndarray
+    fixed_costs_monthly: np.ndarray
+    variable_costs_monthly: np.ndarray
+    total_investment: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.product_price)
+
+    @classmethod
+    def from_inputs(cls, inputs: Sequence[ProjectionInputs]) -> "ProjectionBatch":
+        """Stack per-form inputs into column arrays"""
+        return cls(**{
+            field.name: np.array([getattr(item, field.name) for item in inputs], dtype=np.float64)
+            for field in fields(ProjectionInputs)
+        })
+
+    @classmethod
+    def from_forms(cls, forms) -> "ProjectionBatch":
+        """Build a batch from Prisma DprForms (see ProjectionInputs.from_form)"""
+        return cls.from_inputs([ProjectionInputs.from_form(form) for form in forms])
+
+
+@dataclass
+class ProjectionSeries:
+    """Monthly projection series for one form, one array element per month"""
+    month_number: np.ndarray
+    revenue: np.ndarray
+    fixed_costs: np.ndarray
+    variable_costs: np.ndarray
+    profit_loss: np.ndarray
+    cumulative_profit_loss: np.ndarray
+
+    @property
+    def horizon(self) -> int:
+        return len(self.month_number)
+
+    def to_rows(self) -> List[dict]:
+        """Convert the series into the list-of-dicts shape used by the API"""
+        return [
+            {
+                "month_number": int(month),
+                "revenue": float(revenue),
+                "fixed_costs": float(fixed),
+                "variable_costs": float(variable),
+                "profit_loss": float(profit),
+                "cumulative_profit_loss": float(cumulative)
+            }
+            for month, revenue, fixed, variable, profit, cumulative in zip(
+                self.month_number.tolist(),
+                self.revenue.tolist(),
+                self.fixed_costs.tolist(),
+                self.variable_costs.tolist(),
+                self.profit_loss.tolist(),
+                self.cumulative_profit_loss.tolist()
+            )
+        ]
+
+    def as_batch(self) -> "BatchProjectionSeries":
+        """View this series as a batch of one"""
+        return BatchProjectionSeries(
+            month_number=self.month_number,
+            revenue=self.revenue[np.newaxis, :],
+            fixed_costs=self.fixed_costs[np.newaxis, :],
+            variable_costs=self.variable_costs[np.newaxis, :],
+            profit_loss=self.profit_loss[np.newaxis, :],
+            cumulative_profit_loss=self.cumulative_profit_loss[np.newaxis, :]
+        )
+
+
+@dataclass
+class BatchProjectionSeries:
+    """Monthly projection series for N forms, shape (N, horizon) per metric"""
+    month_number: np.ndarray
+    revenue: np.ndarray
+    fixed_costs: np.ndarray
+    variable_costs: np.ndarray
+    profit_loss: np.ndarray
+    cumulative_profit_loss: np.ndarray
+
+    @property
+    def horizon(self) -> int:
+        return len(self.month_number)
+
+    def __len__(self) -> int:
+        return self.revenue.shape[0]
+
+    def row(self, index: int) -> ProjectionSeries:
+        """Projection series of a single form in the batch"""
+        return ProjectionSeries(
+            month_number=self.month_number,
+            revenue=self.revenue[index],
+            fixed_costs=self.fixed_costs[index],
+            variable_costs=self.variable_costs[index],
+            profit_loss=self.profit_loss[index],
+            cumulative_profit_loss=self.cumulative_profit_loss[index]
+        )
+
+
+def input_fingerprint(
+    inputs: ProjectionInputs,
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    ramp_up: Optional[Sequence[float]] = None,
+    arithmetic: str = "float"
+) -> str:
+    """
+    Deterministic hash of everything that determines a form's projections.
+    Stored with FinancialSummary so unchanged inputs can skip recalculation.
+    """
+    payload = {
+        "engine_version": ENGINE_VERSION,
+        "arithmetic": arithmetic,
+        "inputs": asdict(inputs),
+        "horizon_months": horizon_months,
+        "ramp_up": [float(factor) for factor in ramp_up] if ramp_up else None
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def validate_horizon(horizon_months: int) -> int:
+    """Raise ValueError for horizons the engine does not offer"""
+    if horizon_months not in SUPPORTED_HORIZONS:
+        raise ValueError(
+            f"Unsupported projection horizon {horizon_months}. "
+            f"Allowed: {', '.join(str(h) for h in SUPPORTED_HORIZONS)} months"
+        )
+    return horizon_months
+
+
+@lru_cache(maxsize=len(SUPPORTED_HORIZONS))
+def _month_numbers(horizon_months: int) -> np.ndarray:
+    months = np.arange(1, horizon_months + 1, dtype=np.int64)
+    months.setflags(write=False)
+    return months
+
+
+@lru_cache(maxsize=len(SUPPORTED_HORIZONS))
+def _year_index(horizon_months: int) -> np.ndarray:
+    """Zero-based project year for every month"""
+    years = (_month_numbers(horizon_months) - 1) // 12
+    years.setflags(write=False)
+    return years
+
+
+@lru_cache(maxsize=len(SUPPORTED_HORIZONS))
+def _discount_factors(horizon_months: int) -> np.ndarray:
+    """(1 + r) ** month for every month, computed once per horizon"""
+    factors = np.power(1 + DISCOUNT_RATE_MONTHLY, _month_numbers(horizon_months).astype(np.float64))
+    factors.setflags(write=False)
+    return factors
+
+
+def _ramp_up_factors(horizon_months: int, ramp_up: Sequence[float]) -> np.ndarray:
+    """
+    Capacity utilisation per month. The curve covers the first len(ramp_up)
+    months; later months run at full capacity.
+    """
+    factors = np.ones(horizon_months, dtype=np.float64)
+    curve = np.asarray(ramp_up, dtype=np.float64)[:horizon_months]
+    if np.any(curve < 0):
+        raise ValueError("Ramp-up factors must be non-negative")
+    factors[:len(curve)] = curve
+    return factors
+
+
+def _growth_factors(horizon_months: int, growth_rate_percentage: np.ndarray) -> np.ndarray:
+    """
+    Compounded annual growth applied from year 4 onwards, shape (N, horizon).
+    Years 1-3 use the explicit sales quantities from the form, so their factor is 1.
+    """
+    growth_years = np.maximum(_year_index(horizon_months) - 2, 0).astype(np.float64)
+    return np.power((1 + growth_rate_percentage / 100)[:, np.newaxis], growth_years)
+
+
+def monthly_sales_quantities(batch: ProjectionBatch, horizon_months: int) -> np.ndarray:
+    """Planned monthly sales quantity before ramp-up is applied, shape (N, horizon)"""
+    by_year = np.stack(
+        [batch.monthly_sales_year1, batch.monthly_sales_year2, batch.monthly_sales_year3],
+        axis=1
+    )
+    quantities = by_year[:, np.minimum(_year_index(horizon_months), 2)]
+    if horizon_months > 36:
+        quantities = quantities * _growth_factors(horizon_months, batch.growth_rate_percentage)
+    return quantities
+
+
+def project_batch(
+    batch: ProjectionBatch,
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    ramp_up: Optional[Sequence[float]] = None
+) -> BatchProjectionSeries:
+    """
+    Calculate month-by-month projections for every form in the batch
+
+    Formula breakdown:
+    - Revenue = Product Price × Monthly Sales Quantity × Ramp-up
+    - Fixed Costs = Sum of all fixed monthly costs
+    - Variable Costs = Raw materials, scaled with ramp-up and post-year-3 growth
+    - Profit/Loss = Revenue - Fixed Costs - Variable Costs
+    - Cumulative Profit/Loss = Running total of profit/loss
+    """
+    validate_horizon(horizon_months)
+    shape = (len(batch), horizon_months)
+
+    revenue = batch.product_price[:, np.newaxis] * monthly_sales_quantities(batch, horizon_months)
+    fixed_costs = np.broadcast_to(batch.fixed_costs_monthly[:, np.newaxis], shape)
+    variable_costs = np.broadcast_to(batch.variable_costs_monthly[:, np.newaxis], shape)
+    if ramp_up:
+        utilisation = _ramp_up_factors(horizon_months, ramp_up)
+        revenue = revenue * utilisation
+        variable_costs = variable_costs * utilisation
+    if horizon_months > 36:
+        variable_costs = variable_costs * _growth_factors(horizon_months, batch.growth_rate_percentage)
+
+    profit_loss = revenue - fixed_costs - variable_costs
+    # cumsum accumulates sequentially, matching a running Python total exactly
+    cumulative_profit_loss = np.cumsum(profit_loss, axis=1)
+
+    return BatchProjectionSeries(
+        month_number=_month_numbers(horizon_months),
+        revenue=revenue,
+        fixed_costs=fixed_costs,
+        variable_costs=variable_costs,
+        profit_loss=profit_loss,
+        cumulative_profit_loss=cumulative_profit_loss
+    )
+
+
+def project(
+    inputs: ProjectionInputs,
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    ramp_up: Optional[Sequence[float]] = None
+) -> ProjectionSeries:
+    """Calculate month-by-month projections for a single form"""
+    return project_batch(ProjectionBatch.from_inputs([inputs]), horizon_months, ramp_up).row(0)
+
+
+def _first_month(mask: np.ndarray, months: np.ndarray, default: int) -> np.ndarray:
+    """First month per row where mask is True, or default when it never is"""
+    return np.where(mask.any(axis=1), months[np.argmax(mask, axis=1)], default)
+
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator × 100 where denominator > 0, else 0"""
+    ratio = np.zeros_like(numerator, dtype=np.float64)
+    np.divide(numerator, denominator, out=ratio, where=denominator > 0)
+    return ratio * 100
+
+
+def summarize_batch(series: BatchProjectionSeries, total_investment: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calculate financial summary metrics for every form in the batch
+
+    Metrics:
+    - Break-even month: First month where cumulative profit > 0
+    - ROI: (Total profit over the horizon / Total investment) × 100
+    - Payback period: Months until cumulative profit = investment
+    - NPV: Simplified (using 10% discount rate)
+    - Profit margin: Average monthly profit margin
+
+    Values are unrounded; use summary_rows() for the API/DB representation.
+    """
+    horizon = series.horizon
+    months = series.month_number
+    cumulative = series.cumulative_profit_loss
+    total_investment = np.asarray(total_investment, dtype=np.float64)
+
+    # Sequential sums (last column of cumsum) keep results bit-identical
+    # to the original per-month loops
+    npv = np.cumsum(series.profit_loss / _discount_factors(horizon), axis=1)[:, -1] - total_investment
+    total_revenue = np.cumsum(np.where(series.revenue > 0, series.revenue, 0.0), axis=1)[:, -1]
+    total_profit = cumulative[:, -1]
+
+    return {
+        "breakeven_months": _first_month(cumulative > 0, months, horizon),
+        "roi_percentage": _safe_ratio(cumulative[:, -1], total_investment),
+        "payback_period_months": _first_month(cumulative >= total_investment[:, np.newaxis], months, horizon),
+        "npv": npv,
+        "profit_margin_percentage": _safe_ratio(total_profit, total_revenue)
+    }
+
+
+def summary_rows(metrics: Dict[str, np.ndarray]) -> List[dict]:
+    """Convert batch summary arrays into rounded per-form dicts"""
+    return [
+        {
+            "breakeven_months": int(breakeven),
+            "roi_percentage": round(roi, 2),
+            "payback_period_months": int(payback),
+            "npv": round(npv, 2),
+            "profit_margin_percentage": round(margin, 2)
+        }
+        for breakeven, roi, payback, npv, margin in zip(
+            metrics["breakeven_months"].tolist(),
+            metrics["roi_percentage"].tolist(),
+            metrics["payback_period_months"].tolist(),
+            metrics["npv"].tolist(),
+            metrics["profit_margin_percentage"].tolist()
+        )
+    ]
+
+
+def summarize(series: ProjectionSeries, total_investment: float) -> dict:
+    """Calculate financial summary metrics for a single form"""
+    metrics = summarize_batch(series.as_batch(), np.array([total_investment], dtype=np.float64))
+    return summary_rows(metrics)[0]
+
+
+# ============================================================
+# Database record helpers
+# ============================================================
+
+def projection_records(form_id: int, projections: List[dict]) -> List[dict]:
+    """FinancialProjection create_many payload for one form"""
+    return [
+        {
+            "formId": form_id,
+            "monthNumber": proj["month_number"],
+            "revenue": Decimal(str(proj["revenue"])),
+            "fixedCosts": Decimal(str(proj["fixed_costs"])),
+            "variableCosts": Decimal(str(proj["variable_costs"])),
+            "profitLoss": Decimal(str(proj["profit_loss"])),
+            "cumulativeProfitLoss": Decimal(str(proj["cumulative_profit_loss"]))
+        }
+        for proj in projections
+    ]
+
+
+def summary_record(summary_metrics: dict, fingerprint: Optional[str] = None) -> dict:
+    """FinancialSummary create/update payload (without formId)"""
+    return {
+        "breakevenMonths": summary_metrics["breakeven_months"],
+        "roiPercentage": Decimal(str(summary_metrics["roi_percentage"])),
+        "paybackPeriodMonths": summary_metrics["payback_period_months"],
+        "npv": Decimal(str(summary_metrics["npv"])),
+        "profitMarginPercentage": Decimal(str(summary_metrics["profit_margin_percentage"])),
+        "inputFingerprint": fingerprint,
+        "calculatedAt": datetime.now(timezone.utc)
+    }
+
+
+# ============================================================
+# Exact fixed-point path (integer paise)
+# ============================================================
+
+def to_paise(value) -> int:
+    """Exact conversion of a Decimal(15, 2) amount (or int/str) to integer paise"""
+    return int((Decimal(value) * PAISE_PER_RUPEE).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+@dataclass(frozen=True)
+class PaiseInputs:
+    """Engine inputs with every money amount in integer paise"""
+    product_price: int
+    monthly_sales_year1: int
+    monthly_sales_year2: int
+    monthly_sales_year3: int
+    growth_rate_percentage: float
+    fixed_costs_monthly: int
+    variable_costs_monthly: int
+    total_investment: int
+
+    @classmethod
+    def from_form(cls, form) -> "PaiseInputs":
+        """Build exact inputs straight from the form's Decimal columns"""
+        revenue_assumptions = form.revenueAssumptions
+        cost_details = form.costDetails
+
+        return cls(
+            product_price=to_paise(revenue_assumptions.productPrice),
+            monthly_sales_year1=revenue_assumptions.monthlySalesQuantityYear1,
+            monthly_sales_year2=revenue_assumptions.monthlySalesQuantityYear2,
+            monthly_sales_year3=revenue_assumptions.monthlySalesQuantityYear3,
+            growth_rate_percentage=float(revenue_assumptions.growthRatePercentage),
+            fixed_costs_monthly=sum(
+                to_paise(amount) for amount in (
+                    cost_details.laborCostMonthly,
+                    cost_details.utilitiesCostMonthly,
+                    cost_details.rentMonthly,
+                    cost_details.marketingCostMonthly,
+                    cost_details.otherFixedCostsMonthly
+                )
+            ),
+            variable_costs_monthly=to_paise(cost_details.rawMaterialCostMonthly),
+            total_investment=to_paise(form.financialDetails.totalInvestmentAmount)
+        )
+
+
+def paise_batch(inputs: Sequence[PaiseInputs]) -> ProjectionBatch:
+    """Stack exact inputs into an int64 batch (growth rate stays float)"""
+    return ProjectionBatch(**{
+        field.name: np.array(
+            [getattr(item, field.name) for item in inputs],
+            dtype=np.float64 if field.name == "growth_rate_percentage" else np.int64
+        )
+        for field in fields(PaiseInputs)
+    })
+
+
+def _check_paise_range(*bounds: float):
+    if max(bounds) >= _MAX_PAISE:
+        raise ValueError("Amounts are too large for exact paise arithmetic")
+
+
+def project_paise_batch(
+    batch: ProjectionBatch,
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    ramp_up: Optional[Sequence[float]] = None
+) -> BatchProjectionSeries:
+    """
+    Exact month-by-month projections for an int64 paise batch (see paise_batch)
+
+    Same formulas as project_batch. Without ramp-up or post-year-3 growth every
+    value is an exact integer; fractional factors are rounded to the nearest paisa.
+    """
+    validate_horizon(horizon_months)
+    shape = (len(batch), horizon_months)
+
+    by_year = np.stack(
+        [batch.monthly_sales_year1, batch.monthly_sales_year2, batch.monthly_sales_year3],
+        axis=1
+    )
+    quantities = by_year[:, np.minimum(_year_index(horizon_months), 2)]
+
+    factors = None
+    if ramp_up:
+        factors = _ramp_up_factors(horizon_months, ramp_up)
+    if horizon_months > 36:
+        growth = _growth_factors(horizon_months, batch.growth_rate_percentage)
+        factors = growth if factors is None else growth * factors
+
+    max_factor = float(np.max(factors)) if factors is not None else 1.0
+    max_price = float(np.max(np.abs(batch.product_price), initial=0))
+    max_quantity = float(np.max(np.abs(by_year), initial=0))
+    max_cost = float(np.max(np.abs(batch.fixed_costs_monthly), initial=0)) + \
+        float(np.max(np.abs(batch.variable_costs_monthly), initial=0)) * max_factor
+    _check_paise_range(horizon_months * (max_price * max_quantity * max_factor + max_cost))
+
+    revenue = batch.product_price[:, np.newaxis] * quantities
+    fixed_costs = np.broadcast_to(batch.fixed_costs_monthly[:, np.newaxis], shape)
+    variable_costs = np.broadcast_to(batch.variable_costs_monthly[:, np.newaxis], shape)
+    if factors is not None:
+        revenue = np.rint(revenue * factors).astype(np.int64)
+        variable_costs = np.rint(variable_costs * factors).astype(np.int64)
+
+    profit_loss = revenue - fixed_costs - variable_costs
+    cumulative_profit_loss = np.cumsum(profit_loss, axis=1)
+
+    return BatchProjectionSeries(
+        month_number=_month_numbers(horizon_months),
+        revenue=revenue,
+        fixed_costs=fixed_costs,
+        variable_costs=variable_costs,
+        profit_loss=profit_loss,
+        cumulative_profit_loss=cumulative_profit_loss
+    )
+
+
+def project_paise(
+    inputs: PaiseInputs,
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    ramp_up: Optional[Sequence[float]] = None
+) -> ProjectionSeries:
+    """Exact month-by-month projections for a single form, in paise"""
+    return project_paise_batch(paise_batch([inputs]), horizon_months, ramp_up).row(0)
+
+
+def summarize_paise_batch(series: BatchProjectionSeries, total_investment: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Summary metrics for a paise batch, in the same units as summarize_batch
+    (rupees and percentages, unrounded)
+
+    Ratios are taken between exact integer totals; only NPV involves
+    discounting and is computed in float before rounding.
+    """
+    horizon = series.horizon
+    months = series.month_number
+    cumulative = series.cumulative_profit_loss
+    total_investment = np.asarray(total_investment, dtype=np.int64)
+
+    npv_paise = np.cumsum(series.profit_loss / _discount_factors(horizon), axis=1)[:, -1] - total_investment
+    total_revenue = np.where(series.revenue > 0, series.revenue, 0).sum(axis=1)
+    total_profit = cumulative[:, -1]
+
+    return {
+        "breakeven_months": _first_month(cumulative > 0, months, horizon),
+        "roi_percentage": _safe_ratio(total_profit.astype(np.float64), total_investment.astype(np.float64)),
+        "payback_period_months": _first_month(cumulative >= total_investment[:, np.newaxis], months, horizon),
+        "npv": npv_paise / PAISE_PER_RUPEE,
+        "profit_margin_percentage": _safe_ratio(total_profit.astype(np.float64), total_revenue.astype(np.float64))
+    }
+
+
+def summarize_paise(series: ProjectionSeries, total_investment: int) -> dict:
+    """Summary metrics for a single form's paise series"""
+    metrics = summarize_paise_batch(series.as_batch(), np.array([total_investment], dtype=np.int64))
+    return summary_rows(metrics)[0]
+
+
+def rupee_series(series: ProjectionSeries) -> ProjectionSeries:
+    """Float rupee view of a paise series for API responses and charts"""
+    return ProjectionSeries(
+        month_number=series.month_number,
+        revenue=series.revenue / PAISE_PER_RUPEE,
+        fixed_costs=series.fixed_costs / PAISE_PER_RUPEE,
+        variable_costs=series.variable_costs / PAISE_PER_RUPEE,
+        profit_loss=series.profit_loss / PAISE_PER_RUPEE,
+        cumulative_profit_loss=series.cumulative_profit_loss / PAISE_PER_RUPEE
+    )
+
+
+def paise_projection_records(form_id: int, series: ProjectionSeries) -> List[dict]:
+    """FinancialProjection create_many payload from a paise series, without string round trips"""
+    return [
+        {
+            "formId": form_id,
+            "monthNumber": month,
+            "revenue": Decimal(revenue).scaleb(-2),
+            "fixedCosts": Decimal(fixed).scaleb(-2),
+            "variableCosts": Decimal(variable).scaleb(-2),
+            "profitLoss": Decimal(profit).scaleb(-2),
+            "cumulativeProfitLoss": Decimal(cumulative).scaleb(-2)
+        }
+        for month, revenue, fixed, variable, profit, cumulative in zip(
+            series.month_number.tolist(),
+            series.revenue.tolist(),
+            series.fixed_costs.tolist(),
+            series.variable_costs.tolist(),
+            series.profit_loss.tolist(),
+            series.cumulative_profit_loss.tolist()
+        )
+    ]
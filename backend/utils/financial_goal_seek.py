@@ -0,0 +1,266 @@
+"""
+Financial Goal Seek
+Finds the input value (price, sales volume or a cost) that hits a target
+break-even month, payback period or ROI, using the in-memory batch engine
+"""
+from dataclasses import asdict, replace
+import math
+from typing import Callable, Optional, Sequence, Tuple
+import numpy as np
+from utils.financial_engine import (
+    DEFAULT_HORIZON_MONTHS,
+    ProjectionBatch,
+    ProjectionInputs,
+    project,
+    project_batch,
+    summarize,
+    validate_horizon
+)
+
+# Inputs the solver can vary:
+# - price: minimum product price
+# - sales_quantity: minimum multiplier on all three years' monthly sales
+# - fixed_costs / variable_costs: maximum monthly cost
+GOAL_SEEK_VARIABLES = ("price", "sales_quantity", "fixed_costs", "variable_costs")
+
+# Metrics that can be targeted (months are "at or before", ROI is "at least")
+GOAL_SEEK_TARGETS = ("breakeven_months", "payback_period_months", "roi_percentage")
+
+# Candidates evaluated per iteration; each iteration narrows the bracket by this factor
+GRID_POINTS = 64
+
+# Bracket search tries value * 2**k for k up to this
+MAX_DOUBLINGS = 48
+
+MAX_ITERATIONS = 20
+
+_MONEY_TOLERANCE = 0.001
+_MULTIPLIER_TOLERANCE = 1e-7
+
+
+def _target_predicate(
+    target_metric: str,
+    target_value: float,
+    horizon_months: int,
+    ramp_up: Optional[Sequence[float]]
+) -> Callable[[ProjectionBatch], np.ndarray]:
+    """Vectorized check of whether each scenario in a batch meets the target"""
+    if target_metric not in GOAL_SEEK_TARGETS:
+        raise ValueError(f"Unknown target '{target_metric}'. Allowed: {', '.join(GOAL_SEEK_TARGETS)}")
+
+    if target_metric == "roi_percentage":
+        def meets(batch: ProjectionBatch) -> np.ndarray:
+            if np.any(batch.total_investment <= 0):
+                raise ValueError("ROI targets require a positive total investment")
+            final = project_batch(batch, horizon_months, ramp_up).cumulative_profit_loss[:, -1]
+            return final / batch.total_investment * 100 >= target_value
+        return meets
+
+    month = int(target_value)
+    if month != target_value or not 1 <= month <= horizon_months:
+        raise ValueError(f"Target month must be a whole number between 1 and {horizon_months}")
+
+    def meets(batch: ProjectionBatch) -> np.ndarray:
+        cumulative = project_batch(batch, horizon_months, ramp_up).cumulative_profit_loss[:, :month]
+        if target_metric == "breakeven_months":
+            return (cumulative > 0).any(axis=1)
+        return (cumulative >= batch.total_investment[:, np.newaxis]).any(axis=1)
+    return meets
+
+
+def _candidate_batch(inputs: ProjectionInputs, variable: str, values: np.ndarray) -> ProjectionBatch:
+    """One scenario per candidate value of the solved variable"""
+    base = ProjectionBatch.from_inputs([inputs])
+    batch = ProjectionBatch(**{
+        name: np.repeat(column, len(values)) for name, column in asdict(base).items()
+    })
+    if variable == "price":
+        return replace(batch, product_price=values)
+    if variable == "sales_quantity":
+        return replace(
+            batch,
+            monthly_sales_year1=batch.monthly_sales_year1 * values,
+            monthly_sales_year2=batch.monthly_sales_year2 * values,
+            monthly_sales_year3=batch.monthly_sales_year3 * values
+        )
+    if variable == "fixed_costs":
+        return replace(batch, fixed_costs_monthly=values)
+    return replace(batch, variable_costs_monthly=values)
+
+
+def _find_boundary(
+    flipped: Callable[[np.ndarray], np.ndarray],
+    scale: float,
+    tolerance: float
+) -> Tuple[float, Optional[float], int, int]:
+    """
+    Bracket and bisect the point where a monotone predicate turns True
+
+    Every iteration evaluates GRID_POINTS candidates in one engine batch.
+    Returns (low, high, iterations, evaluations) with flipped(low) False and
+    flipped(high) True; high is None when it never turns True.
+    """
+    candidates = np.concatenate(([0.0], scale * 2.0 ** np.arange(MAX_DOUBLINGS)))
+    results = flipped(candidates)
+    evaluations = len(candidates)
+    if not results.any():
+        return float(candidates[-1]), None, 1, evaluations
+
+    first = int(np.argmax(results))
+    if first == 0:
+        return 0.0, 0.0, 1, evaluations
+    low, high = float(candidates[first - 1]), float(candidates[first])
+
+    iterations = 1
+    while high - low > tolerance and iterations < MAX_ITERATIONS:
+        grid = np.linspace(low, high, GRID_POINTS + 2)[1:-1]
+        results = flipped(grid)
+        evaluations += len(grid)
+        iterations += 1
+        if results.any():
+            first = int(np.argmax(results))
+            high = float(grid[first])
+            if first > 0:
+                low = float(grid[first - 1])
+        else:
+            low = float(grid[-1])
+
+    return low, high, iterations, evaluations
+
+
+def _snap_to_paisa(
+    meets: Callable[[ProjectionBatch], np.ndarray],
+    inputs: ProjectionInputs,
+    variable: str,
+    value: float,
+    maximize: bool
+) -> float:
+    """Best whole-paisa value next to the converged boundary that still meets the target"""
+    paise = math.floor(value * 100) if maximize else math.ceil(value * 100)
+    candidates = np.array([paise - 1, paise, paise + 1], dtype=np.float64) / 100
+    candidates = candidates[candidates >= 0]
+    passing = candidates[meets(_candidate_batch(inputs, variable, candidates))]
+    if not len(passing):
+        return float(candidates[0] if maximize else candidates[-1])
+    return float(passing.max() if maximize else passing.min())
+
+
+def _solved_inputs(inputs: ProjectionInputs, variable: str, value: float) -> ProjectionInputs:
+    if variable == "price":
+        return replace(inputs, product_price=value)
+    if variable == "sales_quantity":
+        # Whole units, rounded up so the target is still met
+        return replace(
+            inputs,
+            monthly_sales_year1=float(math.ceil(inputs.monthly_sales_year1 * value - 1e-9)),
+            monthly_sales_year2=float(math.ceil(inputs.monthly_sales_year2 * value - 1e-9)),
+            monthly_sales_year3=float(math.ceil(inputs.monthly_sales_year3 * value - 1e-9))
+        )
+    if variable == "fixed_costs":
+        return replace(inputs, fixed_costs_monthly=value)
+    return replace(inputs, variable_costs_monthly=value)
+
+
+def _current_value(inputs: ProjectionInputs, variable: str) -> float:
+    return {
+        "price": inputs.product_price,
+        "sales_quantity": 1.0,
+        "fixed_costs": inputs.fixed_costs_monthly,
+        "variable_costs": inputs.variable_costs_monthly
+    }[variable]
+
+
+def goal_seek(
+    inputs: ProjectionInputs,
+    variable: str,
+    target_metric: str,
+    target_value: float,
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    ramp_up: Optional[Sequence[float]] = None
+) -> dict:
+    """
+    Solve for the price, sales multiplier or cost that meets a target
+
+    Price and sales volume are solved for the minimum value that meets the
+    target; fixed and variable costs for the maximum. The answer is rounded to
+    the paisa (or whole units for sales) in the direction that keeps the target
+    met, and the returned summary is calculated from the solved inputs.
+    Nothing is written to the database.
+    """
+    if variable not in GOAL_SEEK_VARIABLES:
+        raise ValueError(f"Unknown variable '{variable}'. Allowed: {', '.join(GOAL_SEEK_VARIABLES)}")
+    validate_horizon(horizon_months)
+    meets = _target_predicate(target_metric, target_value, horizon_months, ramp_up)
+
+    if variable == "sales_quantity" and not any((
+        inputs.monthly_sales_year1, inputs.monthly_sales_year2, inputs.monthly_sales_year3
+    )):
+        raise ValueError("Sales volume can only be solved for forms with non-zero monthly sales")
+
+    is_cost = variable in ("fixed_costs", "variable_costs")
+    current = _current_value(inputs, variable)
+    scale = max(abs(current), 1.0)
+    tolerance = _MULTIPLIER_TOLERANCE if variable == "sales_quantity" else _MONEY_TOLERANCE
+
+    def flipped(values: np.ndarray) -> np.ndarray:
+        results = meets(_candidate_batch(inputs, variable, values))
+        # Costs: search for the first value that no longer meets the target
+        return ~results if is_cost else results
+
+    low, high, iterations, evaluations = _find_boundary(flipped, scale, tolerance)
+
+    if is_cost:
+        if high == 0.0:
+            solved = None
+            message = "Target cannot be met even with zero cost"
+        elif high is None:
+            solved = None
+            message = "Target is met for any cost in the searched range"
+        else:
+            solved = _snap_to_paisa(meets, inputs, variable, low, maximize=True)
+            message = f"Maximum monthly {variable.replace('_', ' ')} that meet the target"
+    elif high is None:
+        solved = None
+        message = f"Target cannot be met by increasing {variable.replace('_', ' ')}"
+    elif variable == "sales_quantity":
+        solved = high
+        message = "Minimum sales volume that meets the target"
+    else:
+        solved = _snap_to_paisa(meets, inputs, variable, high, maximize=False)
+        message = "Minimum product price that meets the target"
+
+    result = {
+        "variable": variable,
+        "target_metric": target_metric,
+        "target_value": target_value,
+        "feasible": solved is not None,
+        "message": message,
+        "current_value": round(current, 2),
+        "solved_value": None,
+        "change_percentage": None,
+        "solved_inputs": None,
+        "summary": None,
+        "iterations": iterations,
+        "evaluations": evaluations
+    }
+    if solved is None:
+        return result
+
+    solved_inputs = _solved_inputs(inputs, variable, solved)
+    result.update({
+        "solved_value": round(solved, 4) if variable == "sales_quantity" else solved,
+        "change_percentage": round((solved - current) / current * 100, 2) if current else None,
+        "solved_inputs": {
+            "product_price": solved_inputs.product_price,
+            "monthly_sales_year1": int(solved_inputs.monthly_sales_year1),
+            "monthly_sales_year2": int(solved_inputs.monthly_sales_year2),
+            "monthly_sales_year3": int(solved_inputs.monthly_sales_year3),
+            "fixed_costs_monthly": solved_inputs.fixed_costs_monthly,
+            "variable_costs_monthly": solved_inputs.variable_costs_monthly
+        },
+        "summary": summarize(
+            project(solved_inputs, horizon_months, ramp_up),
+            solved_inputs.total_investment
+        )
+    })
+    return result
@@ -0,0 +1,289 @@
+"""
+Loan Amortization and DSCR Engine
+Builds month-by-month debt service schedules for many (rate, tenure,
+moratorium) combinations at once and scores them against projected cash flow
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import itertools
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from utils.financial_engine import (
+    DEFAULT_HORIZON_MONTHS,
+    ProjectionInputs,
+    input_fingerprint,
+    project
+)
+
+# Upper bound on rate x tenure x moratorium combinations per request
+MAX_LOAN_SCENARIOS = 500
+
+MAX_TENURE_MONTHS = 360
+MAX_MORATORIUM_MONTHS = 36
+
+# Analyses kept in memory, keyed by loan fingerprint
+LOAN_CACHE_SIZE = int(os.getenv("FINANCIAL_LOAN_CACHE_SIZE", "256"))
+
+
+@dataclass(frozen=True)
+class AmortizationSchedule:
+    """
+    Debt service schedules, shape (N, months) per array
+
+    Interest is serviced monthly during the moratorium; the principal is then
+    repaid in equal monthly instalments (EMI) over the tenure. Months after
+    the loan is closed are zero.
+    """
+    annual_interest_rate: np.ndarray
+    tenure_months: np.ndarray
+    moratorium_months: np.ndarray
+    emi: np.ndarray
+    opening_balance: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    payment: np.ndarray
+    closing_balance: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.emi)
+
+    @property
+    def months(self) -> int:
+        return self.payment.shape[1]
+
+    def to_columns(self, index: int = 0) -> Dict[str, list]:
+        """One scenario's schedule as arrays per metric, rounded to paise"""
+        last = int(self.moratorium_months[index] + self.tenure_months[index])
+        return {
+            "month_number": list(range(1, last + 1)),
+            "opening_balance": self.opening_balance[index, :last].round(2).tolist(),
+            "interest": self.interest[index, :last].round(2).tolist(),
+            "principal": self.principal[index, :last].round(2).tolist(),
+            "payment": self.payment[index, :last].round(2).tolist(),
+            "closing_balance": self.closing_balance[index, :last].round(2).tolist()
+        }
+
+
+def amortize_batch(
+    loan_amount: float,
+    annual_interest_rates: Sequence[float],
+    tenure_months: Sequence[int],
+    moratorium_months: Sequence[int]
+) -> AmortizationSchedule:
+    """
+    Amortization schedules for N scenarios (equal-length sequences)
+
+    Balances use the closed form P(1+r)^k - EMI((1+r)^k - 1)/r, so no month is
+    computed in a Python loop.
+    """
+    rates = np.asarray(annual_interest_rates, dtype=np.float64)
+    tenures = np.asarray(tenure_months, dtype=np.int64)
+    moratoria = np.asarray(moratorium_months, dtype=np.int64)
+    if not len(rates) == len(tenures) == len(moratoria):
+        raise ValueError("Rates, tenures and moratoria must have the same length")
+    if loan_amount < 0 or np.any(rates < 0):
+        raise ValueError("Loan amount and interest rates must be non-negative")
+    if np.any(tenures < 1) or np.any(moratoria < 0):
+        raise ValueError("Tenure must be at least 1 month and moratorium non-negative")
+
+    monthly = rates[:, np.newaxis] / 1200
+    tenures_2d = tenures[:, np.newaxis]
+    moratoria_2d = moratoria[:, np.newaxis]
+    months = np.arange(1, int((tenures + moratoria).max()) + 1)
+
+    # Instalment number within the repayment phase (<= 0 during moratorium)
+    instalment = months[np.newaxis, :] - moratoria_2d
+    repaying = (instalment >= 1) & (instalment <= tenures_2d)
+    moratorium = instalment < 1
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        compounded_tenure = np.power(1 + monthly, tenures_2d)
+        emi = np.where(
+            monthly > 0,
+            loan_amount * monthly * compounded_tenure / (compounded_tenure - 1),
+            loan_amount / tenures_2d
+        )
+
+        def balance_after(paid: np.ndarray) -> np.ndarray:
+            paid = np.clip(paid, 0, tenures_2d)
+            grown = np.power(1 + monthly, paid)
+            balance = np.where(
+                monthly > 0,
+                loan_amount * grown - emi * (grown - 1) / monthly,
+                loan_amount - emi * paid
+            )
+            # Floating point leaves a few paise of dust on the final instalment
+            return np.where(paid >= tenures_2d, 0.0, np.maximum(balance, 0.0))
+
+        opening = np.where(repaying | moratorium, balance_after(instalment - 1), 0.0)
+        closing = np.where(repaying | moratorium, balance_after(instalment), 0.0)
+
+    interest = np.where(repaying | moratorium, opening * monthly, 0.0)
+    principal = opening - closing
+    payment = interest + principal
+
+    return AmortizationSchedule(
+        annual_interest_rate=rates,
+        tenure_months=tenures,
+        moratorium_months=moratoria,
+        emi=emi[:, 0],
+        opening_balance=opening,
+        interest=interest,
+        principal=principal,
+        payment=payment,
+        closing_balance=closing
+    )
+
+
+def dscr_batch(schedule: AmortizationSchedule, profit_loss: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Annual debt service coverage ratio for every scenario
+
+    Cash available for debt service is the projected monthly profit/loss
+    (before interest and repayments). DSCR for a project year is that year's
+    cash flow divided by its debt service; years without debt service are NaN.
+    Only years covered by the projection horizon are scored.
+    """
+    horizon = len(profit_loss)
+    years = horizon // 12
+    payment = np.zeros((len(schedule), horizon))
+    covered = min(horizon, schedule.months)
+    payment[:, :covered] = schedule.payment[:, :covered]
+
+    annual_debt_service = payment[:, :years * 12].reshape(len(schedule), years, 12).sum(axis=2)
+    annual_cash_flow = np.asarray(profit_loss, dtype=np.float64)[:years * 12].reshape(years, 12).sum(axis=1)
+
+    serviced = annual_debt_service > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annual = np.where(serviced, annual_cash_flow[np.newaxis, :] / annual_debt_service, np.nan)
+        total_debt_service = annual_debt_service.sum(axis=1)
+        total_cash_flow = np.where(serviced, annual_cash_flow[np.newaxis, :], 0.0).sum(axis=1)
+        average = np.where(total_debt_service > 0, total_cash_flow / total_debt_service, np.nan)
+
+    minimum = np.full(len(schedule), np.nan)
+    has_service = serviced.any(axis=1)
+    minimum[has_service] = np.nanmin(annual[has_service], axis=1)
+
+    return {
+        "annual": annual,
+        "minimum": minimum,
+        "average": average,
+        "years_below_one": ((annual < 1) & serviced).sum(axis=1)
+    }
+
+
+def scenario_grid(
+    annual_interest_rates: Sequence[float],
+    tenure_months: Sequence[int],
+    moratorium_months: Sequence[int]
+) -> Tuple[List[float], List[int], List[int]]:
+    """Every rate x tenure x moratorium combination, in request order"""
+    combinations = list(itertools.product(annual_interest_rates, tenure_months, moratorium_months))
+    if not combinations:
+        raise ValueError("At least one interest rate, tenure and moratorium is required")
+    if len(combinations) > MAX_LOAN_SCENARIOS:
+        raise ValueError(f"At most {MAX_LOAN_SCENARIOS} loan scenarios can be compared at once")
+    rates, tenures, moratoria = zip(*combinations)
+    return list(rates), list(tenures), list(moratoria)
+
+
+def loan_fingerprint(
+    inputs: ProjectionInputs,
+    loan_amount: float,
+    annual_interest_rates: Sequence[float],
+    tenure_months: Sequence[int],
+    moratorium_months: Sequence[int],
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    ramp_up: Optional[Sequence[float]] = None,
+    include_schedule: bool = True
+) -> str:
+    """Projection input fingerprint extended with the loan terms being compared"""
+    payload = {
+        "projection": input_fingerprint(inputs, horizon_months, ramp_up),
+        "loan_amount": float(loan_amount),
+        "rates": [float(rate) for rate in annual_interest_rates],
+        "tenures": [int(tenure) for tenure in tenure_months],
+        "moratoria": [int(months) for months in moratorium_months],
+        "include_schedule": include_schedule
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _ratio(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def analyze_loan(
+    inputs: ProjectionInputs,
+    loan_amount: float,
+    annual_interest_rates: Sequence[float],
+    tenure_months: Sequence[int],
+    moratorium_months: Sequence[int],
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    ramp_up: Optional[Sequence[float]] = None,
+    include_schedule: bool = True
+) -> dict:
+    """
+    Compare loan scenarios against a form's projected cash flow
+
+    Returns one summary per rate x tenure x moratorium combination, and the
+    full schedule and annual DSCR of the first combination when requested.
+    """
+    rates, tenures, moratoria = scenario_grid(annual_interest_rates, tenure_months, moratorium_months)
+    schedule = amortize_batch(loan_amount, rates, tenures, moratoria)
+    series = project(inputs, horizon_months, ramp_up)
+    dscr = dscr_batch(schedule, series.profit_loss)
+
+    total_interest = schedule.interest.sum(axis=1)
+    total_payment = schedule.payment.sum(axis=1)
+
+    scenarios = [
+        {
+            "annual_interest_rate": rates[index],
+            "tenure_months": tenures[index],
+            "moratorium_months": moratoria[index],
+            "emi": round(float(schedule.emi[index]), 2),
+            "total_interest": round(float(total_interest[index]), 2),
+            "total_payment": round(float(total_payment[index]), 2),
+            "min_dscr": _ratio(dscr["minimum"][index]),
+            "average_dscr": _ratio(dscr["average"][index]),
+            "years_below_one": int(dscr["years_below_one"][index])
+        }
+        for index in range(len(schedule))
+    ]
+
+    return {
+        "loan_amount": round(float(loan_amount), 2),
+        "horizon_months": horizon_months,
+        "scenarios": scenarios,
+        "schedule": schedule.to_columns(0) if include_schedule else None,
+        "annual_dscr": [_ratio(value) for value in dscr["annual"][0]] if include_schedule else None
+    }
+
+
+class LoanAnalysisCache:
+    """Small in-process LRU of loan analyses keyed by loan fingerprint"""
+
+    def __init__(self, max_size: int = LOAN_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, value: dict):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+# Global cache instance
+loan_analysis_cache = LoanAnalysisCache()
@@ -0,0 +1,302 @@
+"""
+Financial Recompute Service
+Calculates and stores financial projections for a form, and keeps them fresh
+by recomputing in the background (debounced) after financial sections change
+"""
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Sequence
+from prisma import Json, Prisma
+from utils.financial_engine import (
+    ARITHMETIC_MODES,
+    DEFAULT_HORIZON_MONTHS,
+    PaiseInputs,
+    ProjectionInputs,
+    ProjectionSeries,
+    input_fingerprint,
+    paise_projection_records,
+    project,
+    project_paise,
+    projection_records,
+    rupee_series,
+    summarize,
+    summarize_paise,
+    summary_record
+)
+from utils.form_snapshot import refresh_form_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Form sections whose changes invalidate stored projections
+FINANCIAL_INPUT_SECTIONS = ("financial_details", "revenue_assumptions", "cost_details")
+
+# Quiet period after the last section save before recomputing
+RECOMPUTE_DEBOUNCE_SECONDS = float(os.getenv("FINANCIAL_RECOMPUTE_DEBOUNCE_SECONDS", "2.0"))
+
+# Where projections are stored:
+# - rows: one FinancialProjection row per month
+# - columnar: one FinancialProjectionSeries row per form (arrays per metric)
+# - both: write both representations (readers prefer columnar)
+PROJECTION_STORAGE_MODES = ("rows", "columnar", "both")
+PROJECTION_STORAGE = os.getenv("FINANCIAL_PROJECTION_STORAGE", "both")
+if PROJECTION_STORAGE not in PROJECTION_STORAGE_MODES:
+    raise ValueError(
+        f"FINANCIAL_PROJECTION_STORAGE must be one of: {', '.join(PROJECTION_STORAGE_MODES)}"
+    )
+
+# Arithmetic for stored projections (see financial_engine.ARITHMETIC_MODES);
+# paise is opt-in because it rounds stored amounts differently from float
+FINANCIAL_ARITHMETIC = os.getenv("FINANCIAL_ARITHMETIC", "float")
+if FINANCIAL_ARITHMETIC not in ARITHMETIC_MODES:
+    raise ValueError(
+        f"FINANCIAL_ARITHMETIC must be one of: {', '.join(ARITHMETIC_MODES)}"
+    )
+
+# Relations needed to calculate projections for a form
+CALCULATION_INCLUDE = {
+    "financialDetails": True,
+    "revenueAssumptions": True,
+    "costDetails": True,
+    "financialSummary": True
+}
+
+
+def summary_metrics_from_record(summary) -> dict:
+    """Stored FinancialSummary row in the shape returned by summarize()"""
+    return {
+        "breakeven_months": summary.breakevenMonths,
+        "roi_percentage": float(summary.roiPercentage),
+        "payback_period_months": summary.paybackPeriodMonths,
+        "npv": float(summary.npv),
+        "profit_margin_percentage": float(summary.profitMarginPercentage)
+    }
+
+
+def projection_series_record(form_id: int, series: ProjectionSeries) -> dict:
+    """FinancialProjectionSeries create/update payload, values rounded to paise"""
+    def column(values) -> Json:
+        return Json([round(value, 2) for value in values.tolist()])
+
+    return {
+        "formId": form_id,
+        "monthCount": series.horizon,
+        "revenue": column(series.revenue),
+        "fixedCosts": column(series.fixed_costs),
+        "variableCosts": column(series.variable_costs),
+        "profitLoss": column(series.profit_loss),
+        "cumulativeProfitLoss": column(series.cumulative_profit_loss)
+    }
+
+
+def projection_columns_from_record(record) -> Dict[str, list]:
+    """Stored FinancialProjectionSeries as arrays per metric"""
+    return {
+        "month_number": list(range(1, record.monthCount + 1)),
+        "revenue": record.revenue,
+        "fixed_costs": record.fixedCosts,
+        "variable_costs": record.variableCosts,
+        "profit_loss": record.profitLoss,
+        "cumulative_profit_loss": record.cumulativeProfitLoss
+    }
+
+
+def projection_columns_from_rows(projections) -> Dict[str, list]:
+    """FinancialProjection rows (ordered by month) as arrays per metric"""
+    return {
+        "month_number": [p.monthNumber for p in projections],
+        "revenue": [float(p.revenue) for p in projections],
+        "fixed_costs": [float(p.fixedCosts) for p in projections],
+        "variable_costs": [float(p.variableCosts) for p in projections],
+        "profit_loss": [float(p.profitLoss) for p in projections],
+        "cumulative_profit_loss": [float(p.cumulativeProfitLoss) for p in projections]
+    }
+
+
+def has_calculation_inputs(form) -> bool:
+    """True when the form has every section the projection engine needs"""
+    return bool(form.financialDetails and form.revenueAssumptions and form.costDetails)
+
+
+async def calculate_and_store(
+    db: Prisma,
+    form,
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    ramp_up: Optional[Sequence[float]] = None,
+    force: bool = False
+) -> dict:
+    """
+    Calculate projections for a form loaded with CALCULATION_INCLUDE and store them
+
+    Skips computation and the DB rewrite when the stored input fingerprint
+    matches. Returns the summary metrics, projection count and cache_hit flag.
+    """
+    inputs = ProjectionInputs.from_form(form)
+    fingerprint = input_fingerprint(inputs, horizon_months, ramp_up, FINANCIAL_ARITHMETIC)
+
+    stored_summary = form.financialSummary
+    if not force and stored_summary and stored_summary.inputFingerprint == fingerprint:
+        if stored_summary.isStale:
+            await db.financialsummary.update(
+                where={"formId": form.id},
+                data={"isStale": False}
+            )
+        return {
+            "summary": summary_metrics_from_record(stored_summary),
+            "projections_count": horizon_months,
+            "cache_hit": True
+        }
+
+    if FINANCIAL_ARITHMETIC == "paise":
+        paise_inputs = PaiseInputs.from_form(form)
+        paise_series = project_paise(paise_inputs, horizon_months, ramp_up)
+        summary_metrics = summarize_paise(paise_series, paise_inputs.total_investment)
+        series = rupee_series(paise_series)
+        projection_data = paise_projection_records(form.id, paise_series)
+    else:
+        series = project(inputs, horizon_months, ramp_up)
+        summary_metrics = summarize(series, inputs.total_investment)
+        projection_data = projection_records(form.id, series.to_rows())
+
+    summary_data = {
+        **summary_record(summary_metrics, fingerprint),
+        "horizonMonths": horizon_months,
+        "rampUp": Json(list(ramp_up)) if ramp_up else None,
+        "isStale": False
+    }
+
+    # Replace projections and summary atomically so readers never see a
+    # partially written projection set
+    async with db.tx() as transaction:
+        await transaction.financialprojection.delete_many(
+            where={"formId": form.id}
+        )
+        await transaction.financialprojectionseries.delete_many(
+            where={"formId": form.id}
+        )
+
+        if PROJECTION_STORAGE in ("rows", "both"):
+            # Single multi-row insert instead of one create per month
+            await transaction.financialprojection.create_many(
+                data=projection_data
+            )
+
+        if PROJECTION_STORAGE in ("columnar", "both"):
+            await transaction.financialprojectionseries.create(
+                data=projection_series_record(form.id, series)
+            )
+
+        await transaction.financialsummary.upsert(
+            where={"formId": form.id},
+            data={
+                "create": {"formId": form.id, **summary_data},
+                "update": summary_data
+            }
+        )
+
+        # The form snapshot carries the summary and projections for PDFs
+        await refresh_form_snapshot(transaction, form.id)
+
+    return {
+        "summary": summary_metrics,
+        "projections_count": series.horizon,
+        "cache_hit": False
+    }
+
+
+async def recompute_form_financials(db: Prisma, form_id: int) -> Optional[dict]:
+    """
+    Recalculate a form's projections with the horizon and ramp-up used last time
+
+    Returns None when the form is gone or lacks the sections needed.
+    """
+    form = await db.dprform.find_unique(
+        where={"id": form_id},
+        include=CALCULATION_INCLUDE
+    )
+    if not form or not has_calculation_inputs(form):
+        return None
+
+    stored_summary = form.financialSummary
+    horizon_months = stored_summary.horizonMonths if stored_summary else DEFAULT_HORIZON_MONTHS
+    ramp_up = stored_summary.rampUp if stored_summary else None
+
+    return await calculate_and_store(db, form, horizon_months, ramp_up)
+
+
+class FinancialRecomputeScheduler:
+    """Debounced background recomputation of financial projections per form"""
+
+    def __init__(self, delay_seconds: float = RECOMPUTE_DEBOUNCE_SECONDS):
+        self.delay_seconds = delay_seconds
+        self.db = Prisma()
+        self._pending: Dict[int, asyncio.Task] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    async def mark_stale(self, form_id: int):
+        """Flag stored results as stale and schedule a recompute"""
+        if not self.db.is_connected():
+            await self.db.connect()
+        await self.db.financialsummary.update_many(
+            where={"formId": form_id},
+            data={"isStale": True}
+        )
+        self.schedule(form_id)
+
+    def schedule(self, form_id: int):
+        """(Re)start the debounce timer for a form"""
+        pending = self._pending.get(form_id)
+        if pending and not pending.done():
+            pending.cancel()
+        self._pending[form_id] = asyncio.create_task(self._recompute_after_delay(form_id))
+
+    async def _recompute_after_delay(self, form_id: int):
+        try:
+            await asyncio.sleep(self.delay_seconds)
+        except asyncio.CancelledError:
+            return
+
+        lock = self._locks.setdefault(form_id, asyncio.Lock())
+        try:
+            # Shield the write so a newer save cannot cancel it half way;
+            # the newer save's own task recomputes afterwards if needed
+            await asyncio.shield(self._recompute(form_id, lock))
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if self._pending.get(form_id) is asyncio.current_task():
+                del self._pending[form_id]
+                if not lock.locked():
+                    self._locks.pop(form_id, None)
+
+    async def _recompute(self, form_id: int, lock: asyncio.Lock):
+        async with lock:
+            try:
+                if not self.db.is_connected():
+                    await self.db.connect()
+                result = await recompute_form_financials(self.db, form_id)
+                if result and not result["cache_hit"]:
+                    logger.info(f"Background recompute of financial projections for form {form_id} completed")
+            except Exception as e:
+                logger.error(f"Background recompute failed for form {form_id}: {str(e)}")
+
+    async def shutdown(self):
+        """Cancel pending recomputes and disconnect (app shutdown)"""
+        tasks: List[asyncio.Task] = list(self._pending.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pending.clear()
+
+        # Let shielded writes that are already running finish
+        for lock in list(self._locks.values()):
+            async with lock:
+                pass
+        self._locks.clear()
+
+        if self.db.is_connected():
+            await self.db.disconnect()
+
+
+# Global scheduler instance
+financial_recompute_scheduler = FinancialRecomputeScheduler()
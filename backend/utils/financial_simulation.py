@@ -0,0 +1,156 @@
+"""
+Monte Carlo Sensitivity Analysis
+Runs thousands of vectorized scenarios through the batch projection engine to
+show how break-even, payback and NPV respond to price, volume and cost risk
+"""
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Sequence
+import numpy as np
+from utils.financial_engine import (
+    DEFAULT_HORIZON_MONTHS,
+    ProjectionBatch,
+    ProjectionInputs,
+    project_batch,
+    summarize_batch
+)
+
+# Supported distribution shapes for scenario multipliers
+DISTRIBUTIONS = ("fixed", "normal", "uniform", "triangular")
+
+# Percentiles reported for every simulated metric
+PERCENTILES = (5, 25, 50, 75, 95)
+
+MAX_SAMPLES = 20000
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """
+    Distribution of a multiplier applied to a base input (1.0 = form value)
+
+    - fixed: always `mean`
+    - normal: N(mean, std), clipped at 0
+    - uniform: U(low, high)
+    - triangular: Tri(low, mode, high)
+    """
+    kind: str = "fixed"
+    mean: float = 1.0
+    std: float = 0.0
+    low: float = 1.0
+    high: float = 1.0
+    mode: float = 1.0
+
+    def __post_init__(self):
+        if self.kind not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution '{self.kind}'. Allowed: {', '.join(DISTRIBUTIONS)}")
+        if self.kind == "uniform" and self.low > self.high:
+            raise ValueError("Uniform distribution requires low <= high")
+        if self.kind == "triangular" and not self.low <= self.mode <= self.high:
+            raise ValueError("Triangular distribution requires low <= mode <= high")
+
+    def sample(self, rng: np.random.Generator, n_samples: int) -> np.ndarray:
+        if self.kind == "fixed":
+            return np.full(n_samples, self.mean, dtype=np.float64)
+        if self.kind == "normal":
+            return np.clip(rng.normal(self.mean, self.std, n_samples), 0.0, None)
+        if self.kind == "uniform":
+            return rng.uniform(self.low, self.high, n_samples)
+        if self.low == self.high:
+            return np.full(n_samples, self.low, dtype=np.float64)
+        return rng.triangular(self.low, self.mode, self.high, n_samples)
+
+
+FIXED = Distribution()
+
+
+def scenario_batch(
+    inputs: ProjectionInputs,
+    n_samples: int,
+    rng: np.random.Generator,
+    price: Distribution = FIXED,
+    sales_quantity: Distribution = FIXED,
+    fixed_costs: Distribution = FIXED,
+    variable_costs: Distribution = FIXED
+) -> ProjectionBatch:
+    """Draw n_samples scenarios of a form's inputs as one engine batch"""
+    base = ProjectionBatch.from_inputs([inputs])
+    volume = sales_quantity.sample(rng, n_samples)
+    return replace(
+        base,
+        product_price=base.product_price * price.sample(rng, n_samples),
+        monthly_sales_year1=base.monthly_sales_year1 * volume,
+        monthly_sales_year2=base.monthly_sales_year2 * volume,
+        monthly_sales_year3=base.monthly_sales_year3 * volume,
+        growth_rate_percentage=np.repeat(base.growth_rate_percentage, n_samples),
+        fixed_costs_monthly=base.fixed_costs_monthly * fixed_costs.sample(rng, n_samples),
+        variable_costs_monthly=base.variable_costs_monthly * variable_costs.sample(rng, n_samples),
+        total_investment=np.repeat(base.total_investment, n_samples)
+    )
+
+
+def _distribution_stats(values: np.ndarray) -> Dict[str, float]:
+    """Mean, range and percentiles of a simulated metric"""
+    percentiles = np.percentile(values, PERCENTILES)
+    stats = {
+        "mean": round(float(values.mean()), 2),
+        "min": round(float(values.min()), 2),
+        "max": round(float(values.max()), 2)
+    }
+    stats.update({f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, percentiles)})
+    return stats
+
+
+def simulate(
+    inputs: ProjectionInputs,
+    n_samples: int,
+    seed: Optional[int] = None,
+    price: Distribution = FIXED,
+    sales_quantity: Distribution = FIXED,
+    fixed_costs: Distribution = FIXED,
+    variable_costs: Distribution = FIXED,
+    horizon_months: int = DEFAULT_HORIZON_MONTHS,
+    ramp_up: Optional[Sequence[float]] = None
+) -> dict:
+    """
+    Run a Monte Carlo simulation over the projection engine
+
+    Returns percentile bands of cumulative profit/loss per month and the
+    distributions of break-even month, payback period and NPV. Scenarios that
+    never break even (or pay back) count as the horizon in the month
+    distributions; see probability_within_horizon. The same seed always
+    reproduces the same result.
+    """
+    if not 1 <= n_samples <= MAX_SAMPLES:
+        raise ValueError(f"n_samples must be between 1 and {MAX_SAMPLES}")
+
+    rng = np.random.default_rng(seed)
+    batch = scenario_batch(inputs, n_samples, rng, price, sales_quantity, fixed_costs, variable_costs)
+    series = project_batch(batch, horizon_months, ramp_up)
+    metrics = summarize_batch(series, batch.total_investment)
+
+    cumulative = series.cumulative_profit_loss
+    bands = np.percentile(cumulative, PERCENTILES, axis=0).round(2)
+
+    breaks_even = (cumulative > 0).any(axis=1)
+    pays_back = (cumulative >= batch.total_investment[:, np.newaxis]).any(axis=1)
+
+    return {
+        "n_samples": n_samples,
+        "seed": seed,
+        "horizon_months": horizon_months,
+        "cumulative_profit_loss_bands": {
+            f"p{p}": band.tolist() for p, band in zip(PERCENTILES, bands)
+        },
+        "breakeven_months": {
+            **_distribution_stats(metrics["breakeven_months"]),
+            "probability_within_horizon": round(float(breaks_even.mean()), 4)
+        },
+        "payback_period_months": {
+            **_distribution_stats(metrics["payback_period_months"]),
+            "probability_within_horizon": round(float(pays_back.mean()), 4)
+        },
+        "npv": {
+            **_distribution_stats(metrics["npv"]),
+            "probability_positive": round(float((metrics["npv"] > 0).mean()), 4)
+        }
+    }
@@ -0,0 +1,160 @@
+"""
+Form Context
+Everything the AI prompts, scheme matching and PDF rendering derive from a
+form, built once per form version and memoized per process.
+
+A context is keyed by (form_id, snapshot revision): every snapshot refresh
+bumps the revision, including the ones that leave DprForm.lastModified alone
+(financial recalculation, generated content), so looking one up reads only
+the revision and the snapshot document is loaded and converted only when
+it changed since the cached version. Back-to-back section regenerations
+therefore reuse the same context.
+"""
+import os
+from collections import OrderedDict
+from decimal import Decimal
+from functools import cached_property
+from typing import Dict, Optional, Sequence
+from prisma import Prisma
+from prisma.models import FormSnapshot
+from models.form_models import CompleteFormResponse
+from utils.form_snapshot import SNAPSHOT_VERSION, form_from_snapshot, load_snapshot_records
+
+# Forms whose latest context is kept in memory (0 disables the cache)
+FORM_CONTEXT_CACHE_SIZE = int(os.getenv("FORM_CONTEXT_CACHE_SIZE", "256"))
+if FORM_CONTEXT_CACHE_SIZE < 0:
+    raise ValueError("FORM_CONTEXT_CACHE_SIZE must be 0 or more")
+
+# Current snapshot revision of each form (current layout version only)
+SNAPSHOT_REVISION_QUERY = """
+SELECT form_id AS "formId", revision
+FROM form_snapshots
+WHERE form_id = ANY($1::int[]) AND version = $2
+"""
+
+# Section -> fields passed to the AI prompts and scheme matching
+PROMPT_FIELDS = {
+    "entrepreneur_details": (
+        "full_name", "education", "years_of_experience", "previous_business_experience", "technical_skills"
+    ),
+    "business_details": ("business_name", "sector", "sub_sector", "legal_structure", "location", "address"),
+    "product_details": (
+        "product_name", "description", "key_features", "target_customers", "planned_capacity",
+        "unique_selling_points", "quality_certifications"
+    ),
+    "financial_details": (
+        "total_investment_amount", "land_cost", "building_cost", "machinery_cost", "working_capital",
+        "own_contribution", "loan_required"
+    ),
+    "revenue_assumptions": (
+        "product_price", "monthly_sales_quantity_year1", "monthly_sales_quantity_year2", "monthly_sales_quantity_year3"
+    ),
+    "cost_details": ("marketing_cost_monthly",),
+    "staffing_details": ("total_employees",),
+    "timeline_details": (
+        "land_acquisition_months", "construction_months", "machinery_installation_months",
+        "trial_production_months", "commercial_production_start_month"
+    )
+}
+
+
+def build_prompt_data(response: CompleteFormResponse) -> dict:
+    """form_data dict for AIService.generate_section and ai_match_schemes (amounts as floats)"""
+    form_data = {"business_name": response.business_name}
+    for section, fields in PROMPT_FIELDS.items():
+        details = getattr(response, section)
+        form_data[section] = {
+            name: float(value) if isinstance(value, Decimal) else value
+            for name, value in ((name, getattr(details, name)) for name in fields)
+        } if details else {}
+    return form_data
+
+
+class FormContext:
+    """One version of a form, with the views derived from it built on first use"""
+
+    def __init__(self, snapshot: dict, revision: int):
+        self.snapshot = snapshot
+        self.revision = revision
+        self.form_id: int = snapshot["id"]
+        self.user_id: int = snapshot["user_id"]
+
+    @cached_property
+    def response(self) -> CompleteFormResponse:
+        return CompleteFormResponse.model_validate(self.snapshot)
+
+    @cached_property
+    def prompt_data(self) -> dict:
+        """Shared; callers must not modify it"""
+        return build_prompt_data(self.response)
+
+    @cached_property
+    def render_form(self):
+        """Attribute-style form for the DPR renderers (shared, read-only)"""
+        return form_from_snapshot(self.snapshot)
+
+
+class FormContextCache:
+    """Latest FormContext per form, least recently used forms evicted first"""
+
+    def __init__(self, max_entries: int = FORM_CONTEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, FormContext]" = OrderedDict()
+
+    def get(self, form_id: int, revision: int) -> Optional[FormContext]:
+        context = self._entries.get(form_id)
+        if context is None or context.revision != revision:
+            return None
+        self._entries.move_to_end(form_id)
+        return context
+
+    def store(self, snapshot: FormSnapshot) -> FormContext:
+        """
+        Context for a stored snapshot; cached unless an equal or newer
+        revision already is (a write racing with a slower read must not be undone)
+        """
+        context = FormContext(snapshot.data, snapshot.revision)
+        if self.max_entries == 0:
+            return context
+        current = self._entries.get(context.form_id)
+        if current is not None and current.revision >= context.revision:
+            return current if current.revision == context.revision else context
+        self._entries[context.form_id] = context
+        self._entries.move_to_end(context.form_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return context
+
+    def discard(self, form_id: int):
+        self._entries.pop(form_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+# Global form context cache instance
+form_context_cache = FormContextCache()
+
+
+async def load_form_context(db: Prisma, form_id: int) -> Optional[FormContext]:
+    """A form's current context (None when the form does not exist)"""
+    return (await load_form_contexts(db, [form_id])).get(form_id)
+
+
+async def load_form_contexts(db: Prisma, form_ids: Sequence[int]) -> Dict[int, FormContext]:
+    """Current contexts of several forms by id (missing forms are left out)"""
+    contexts = {}
+    for row in await db.query_raw(SNAPSHOT_REVISION_QUERY, list(form_ids), SNAPSHOT_VERSION):
+        context = form_context_cache.get(row["formId"], row["revision"])
+        if context is not None:
+            contexts[row["formId"]] = context
+
+    stale = [form_id for form_id in form_ids if form_id not in contexts]
+    if stale:
+        snapshots = await load_snapshot_records(db, stale)
+        for form_id in stale:
+            if form_id in snapshots:
+                contexts[form_id] = form_context_cache.store(snapshots[form_id])
+            else:
+                form_context_cache.discard(form_id)
+    return contexts
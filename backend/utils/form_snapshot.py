@@ -0,0 +1,286 @@
+"""
+Form Snapshot
+One denormalized JSONB document per form, in the CompleteFormResponse
+shape, so complete-form reads and PDF rendering load a single row instead
+of joining DprForm with every section and mapping each field.
+
+Writers refresh the snapshot in the same transaction as their change
+(refresh_form_snapshot), or mark it stale when they change many forms at
+once (mark_snapshots_stale); readers rebuild a missing, outdated or stale
+one on first use (load_form_snapshot). Besides the CompleteFormResponse
+fields, the document holds what the DPR renderers need: the latest version of each
+generated section, the financial summary and the monthly projections.
+"""
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence
+from prisma import Json, Prisma
+from prisma.models import FormSnapshot, GeneratedContent
+from models.form_models import (
+    BusinessDetailsResponse,
+    CompleteFormResponse,
+    CostDetailsResponse,
+    EntrepreneurDetailsResponse,
+    FinancialDetailsResponse,
+    ProductDetailsResponse,
+    RevenueAssumptionsResponse,
+    StaffingDetailsResponse,
+    TimelineDetailsResponse
+)
+
+# Bump when the document layout changes; older snapshots are rebuilt on read
+SNAPSHOT_VERSION = 1
+
+# Version of snapshots marked stale by bulk writers (mark_snapshots_stale)
+STALE_SNAPSHOT_VERSION = 0
+
+# Relations a snapshot is built from (generated content separately, latest
+# versions only: LATEST_CONTENT_QUERY)
+SNAPSHOT_INCLUDE = {
+    "entrepreneurDetails": True,
+    "businessDetails": True,
+    "productDetails": True,
+    "financialDetails": True,
+    "revenueAssumptions": True,
+    "costDetails": True,
+    "staffingDetails": True,
+    "timelineDetails": True,
+    "financialProjections": {"order_by": {"monthNumber": "asc"}},
+    "projectionSeries": True,
+    "financialSummary": True
+}
+
+# CompleteFormResponse field -> (DprForm relation, response model)
+SECTION_MODELS = {
+    "entrepreneur_details": ("entrepreneurDetails", EntrepreneurDetailsResponse),
+    "business_details": ("businessDetails", BusinessDetailsResponse),
+    "product_details": ("productDetails", ProductDetailsResponse),
+    "financial_details": ("financialDetails", FinancialDetailsResponse),
+    "revenue_assumptions": ("revenueAssumptions", RevenueAssumptionsResponse),
+    "cost_details": ("costDetails", CostDetailsResponse),
+    "staffing_details": ("staffingDetails", StaffingDetailsResponse),
+    "timeline_details": ("timelineDetails", TimelineDetailsResponse)
+}
+
+SUMMARY_FIELDS = ("breakeven_months", "roi_percentage", "payback_period_months", "npv", "profit_margin_percentage")
+DECIMAL_SUMMARY_FIELDS = ("roi_percentage", "npv", "profit_margin_percentage")
+PROJECTION_COLUMNS = ("revenue", "fixed_costs", "variable_costs", "profit_loss", "cumulative_profit_loss")
+
+# Highest version of each section of a form, in the order sections were
+# first created, without reading the text of older versions. Walks
+# generated_content_latest_idx (form_id, section_name, version_number DESC).
+LATEST_CONTENT_QUERY = """
+SELECT id, form_id AS "formId", section_name AS "sectionName", generated_text AS "generatedText",
+       ai_model_used AS "aiModelUsed", confidence_score AS "confidenceScore",
+       version_number AS "versionNumber", user_edited AS "userEdited", generated_at AS "generatedAt"
+FROM (
+    SELECT *,
+           ROW_NUMBER() OVER (PARTITION BY section_name ORDER BY version_number DESC, id DESC) AS version_rank,
+           MIN(id) OVER (PARTITION BY section_name) AS first_id
+    FROM generated_content
+    WHERE form_id = $1
+) versions
+WHERE version_rank = 1
+ORDER BY first_id
+"""
+
+
+def camel_case(name: str) -> str:
+    """snake_case response field -> camelCase Prisma field"""
+    first, *rest = name.split("_")
+    return first + "".join(part.capitalize() for part in rest)
+
+
+def latest_contents(generated_contents) -> list:
+    """Highest version of every generated section, in the order sections were first created"""
+    latest = {}
+    for content in sorted(generated_contents or [], key=lambda c: c.id):
+        current = latest.get(content.sectionName)
+        if current is None or content.versionNumber >= current.versionNumber:
+            latest[content.sectionName] = content
+    return list(latest.values())
+
+
+def complete_form_response(form, generated_contents=None) -> CompleteFormResponse:
+    """
+    CompleteFormResponse from a form loaded with its section relations
+
+    generated_contents defaults to form.generatedContents (any versions).
+    """
+    response_data = {
+        "id": form.id,
+        "user_id": form.userId,
+        "business_name": form.businessName,
+        "status": form.status,
+        "completion_percentage": form.completionPercentage,
+        "created_at": form.createdAt,
+        "last_modified": form.lastModified
+    }
+
+    for field, (relation, model) in SECTION_MODELS.items():
+        record = getattr(form, relation)
+        if record:
+            response_data[field] = model(**{name: getattr(record, camel_case(name)) for name in model.model_fields})
+
+    contents = latest_contents(form.generatedContents if generated_contents is None else generated_contents)
+    if contents:
+        response_data["generated_content"] = {
+            "sections": {content.sectionName: content.generatedText for content in contents},
+            "generated_at": max(content.generatedAt for content in contents)
+        }
+
+    return CompleteFormResponse(**response_data)
+
+
+def _projection_columns(form) -> Optional[dict]:
+    if form.projectionSeries:
+        series = form.projectionSeries
+        return {"month_count": series.monthCount, **{name: getattr(series, camel_case(name)) for name in PROJECTION_COLUMNS}}
+    if form.financialProjections:
+        rows = sorted(form.financialProjections, key=lambda p: p.monthNumber)
+        return {
+            "month_count": len(rows),
+            **{name: [float(getattr(row, camel_case(name))) for row in rows] for name in PROJECTION_COLUMNS}
+        }
+    return None
+
+
+def build_form_snapshot(form, generated_contents=None) -> dict:
+    """
+    Snapshot document for a form loaded with SNAPSHOT_INCLUDE and its
+    generated content (form.generatedContents when not given)
+    """
+    if generated_contents is None:
+        generated_contents = form.generatedContents
+    data = complete_form_response(form, generated_contents).model_dump(mode="json")
+
+    data["generated_sections"] = [
+        {
+            "id": content.id,
+            "section_name": content.sectionName,
+            "generated_text": content.generatedText,
+            "version_number": content.versionNumber,
+            "generated_at": content.generatedAt.isoformat()
+        }
+        for content in latest_contents(generated_contents)
+    ]
+
+    summary = form.financialSummary
+    data["financial_summary"] = {
+        **{
+            name: str(getattr(summary, camel_case(name))) if name in DECIMAL_SUMMARY_FIELDS
+            else getattr(summary, camel_case(name))
+            for name in SUMMARY_FIELDS
+        },
+        "calculated_at": summary.calculatedAt.isoformat()
+    } if summary else None
+
+    data["projections"] = _projection_columns(form)
+    return data
+
+
+def form_from_snapshot(data: dict):
+    """
+    Snapshot as the attribute-style form object the DPR renderers read
+    (same fields as a DprForm loaded with dpr_html.DPR_RENDER_INCLUDE)
+    """
+    response = CompleteFormResponse.model_validate(data)
+
+    form = SimpleNamespace(**{camel_case(name): getattr(response, name) for name in (
+        "id", "user_id", "business_name", "status", "completion_percentage", "created_at", "last_modified"
+    )})
+    for field, (relation, _) in SECTION_MODELS.items():
+        section = getattr(response, field)
+        setattr(form, relation, SimpleNamespace(**{camel_case(name): value for name, value in section}) if section else None)
+
+    form.generatedContents = [
+        SimpleNamespace(
+            id=content["id"],
+            sectionName=content["section_name"],
+            generatedText=content["generated_text"],
+            versionNumber=content["version_number"],
+            generatedAt=datetime.fromisoformat(content["generated_at"])
+        )
+        for content in data.get("generated_sections") or []
+    ]
+
+    summary = data.get("financial_summary")
+    form.financialSummary = SimpleNamespace(
+        **{
+            camel_case(name): Decimal(summary[name]) if name in DECIMAL_SUMMARY_FIELDS else summary[name]
+            for name in SUMMARY_FIELDS
+        },
+        calculatedAt=datetime.fromisoformat(summary["calculated_at"])
+    ) if summary else None
+
+    projections = data.get("projections")
+    form.projectionSeries = SimpleNamespace(
+        monthCount=projections["month_count"],
+        **{camel_case(name): projections[name] for name in PROJECTION_COLUMNS}
+    ) if projections else None
+    form.financialProjections = []
+    return form
+
+
+async def find_latest_contents(db: Prisma, form_id: int) -> List[GeneratedContent]:
+    """Latest version of every generated section of a form (LATEST_CONTENT_QUERY)"""
+    return await db.query_raw(LATEST_CONTENT_QUERY, form_id, model=GeneratedContent)
+
+
+async def refresh_form_snapshot(db: Prisma, form_id: int) -> Optional[FormSnapshot]:
+    """
+    Rebuild and store a form's snapshot; pass the transaction of the write
+    that changed the form so both commit together
+
+    Every refresh bumps the snapshot's revision. Returns the stored
+    snapshot, or None when the form does not exist.
+    """
+    form = await db.dprform.find_unique(where={"id": form_id}, include=SNAPSHOT_INCLUDE)
+    if form is None:
+        return None
+
+    data = build_form_snapshot(form, await find_latest_contents(db, form_id))
+    record = {"userId": form.userId, "version": SNAPSHOT_VERSION, "data": Json(data)}
+    return await db.formsnapshot.upsert(
+        where={"formId": form_id},
+        data={
+            "create": {"formId": form_id, **record},
+            "update": {**record, "revision": {"increment": 1}}
+        }
+    )
+
+
+async def mark_snapshots_stale(db: Prisma, form_ids: Sequence[int]) -> int:
+    """
+    Mark several forms' snapshots for a rebuild on their next read, in one
+    statement (for bulk writers that cannot afford a refresh per form)
+    """
+    return await db.formsnapshot.update_many(
+        where={"formId": {"in": list(form_ids)}},
+        data={"version": STALE_SNAPSHOT_VERSION}
+    )
+
+
+async def load_snapshot_records(db: Prisma, form_ids: Sequence[int]) -> Dict[int, FormSnapshot]:
+    """Current snapshots of several forms by id, rebuilding missing or outdated ones (missing forms are left out)"""
+    snapshots = {
+        snapshot.formId: snapshot
+        for snapshot in await db.formsnapshot.find_many(where={"formId": {"in": list(form_ids)}})
+        if snapshot.version == SNAPSHOT_VERSION
+    }
+    for form_id in form_ids:
+        if form_id not in snapshots:
+            snapshot = await refresh_form_snapshot(db, form_id)
+            if snapshot is not None:
+                snapshots[form_id] = snapshot
+    return snapshots
+
+
+async def load_form_snapshot(db: Prisma, form_id: int) -> Optional[dict]:
+    """A form's snapshot document (None when the form does not exist)"""
+    snapshot = await db.formsnapshot.find_unique(where={"formId": form_id})
+    if snapshot is None or snapshot.version != SNAPSHOT_VERSION:
+        snapshot = await refresh_form_snapshot(db, form_id)
+    return snapshot.data if snapshot else None
+
@@ -0,0 +1,236 @@
+"""
+PDF Cache
+Content-addressed reuse of generated PDFs and retention-based cleanup of
+old PDF files (in PDF storage) and their PdfDocument rows
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+import hashlib
+import itertools
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+from prisma import Prisma
+from utils.pdf_optimize import PDF_OPTIMIZE, PDF_OPTIMIZE_IMAGE_DPI, PDF_OPTIMIZE_JPEG_QUALITY
+from utils.pdf_renderer import PDF_OPTIONS, context_options_for
+from utils.pdf_storage import get_storage, storage_for
+
+logger = logging.getLogger(__name__)
+
+# Bump when rendering changes in a way the HTML does not capture
+PDF_RENDERER_VERSION = 1
+
+# Retention policy: PDFs older than PDF_RETENTION_DAYS are deleted, except the
+# newest PDF_KEEP_PER_FORM of every form
+PDF_RETENTION_DAYS = int(os.getenv("PDF_RETENTION_DAYS", "30"))
+PDF_KEEP_PER_FORM = int(os.getenv("PDF_KEEP_PER_FORM", "3"))
+
+# Documents (and stored files) the cleanup loads per batch
+PDF_GC_BATCH_SIZE = int(os.getenv("PDF_GC_BATCH_SIZE", "500"))
+
+# How often the app runs the cleanup (0 disables it; use gc_pdfs.py instead)
+PDF_GC_INTERVAL_HOURS = float(os.getenv("PDF_GC_INTERVAL_HOURS", "24"))
+
+
+def pdf_content_hash(html: str, language: str, template_type: str, render_source: str) -> str:
+    """
+    Deterministic hash of everything that determines a PDF's content
+
+    The server-rendered HTML already captures the form, generated content,
+    projections, summary and selected schemes; the remaining inputs are the
+    render and optimization options.
+    """
+    payload = {
+        "renderer_version": PDF_RENDERER_VERSION,
+        "render_source": render_source,
+        "language": language,
+        "template_type": template_type,
+        "context_options": context_options_for(render_source),
+        "pdf_options": PDF_OPTIONS,
+        "optimize": {
+            "mode": PDF_OPTIMIZE,
+            **({"image_dpi": PDF_OPTIMIZE_IMAGE_DPI, "jpeg_quality": PDF_OPTIMIZE_JPEG_QUALITY}
+               if PDF_OPTIMIZE == "images" else {})
+        },
+        "html": hashlib.sha256(html.encode("utf-8")).hexdigest()
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def pdf_etag(pdf_document) -> str:
+    """
+    Strong ETag for a stored PDF
+
+    A document's file never changes after it is written. The file checksum
+    identifies its bytes; older documents use the content hash plus the
+    document id, or id, size and generation time.
+    """
+    if pdf_document.checksum:
+        return f'"{pdf_document.checksum}"'
+    if pdf_document.contentHash:
+        return f'"{pdf_document.contentHash[:32]}-{pdf_document.id}"'
+    return f'"{pdf_document.id}-{pdf_document.fileSize}-{int(pdf_document.generatedAt.timestamp())}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+async def find_cached_pdf(db: Prisma, form_id: int, content_hash: str):
+    """Newest PdfDocument of the form with this content hash whose file still exists"""
+    pdf_document = await db.pdfdocument.find_first(
+        where={"formId": form_id, "contentHash": content_hash},
+        order={"generatedAt": "desc"}
+    )
+    if pdf_document:
+        storage, key = storage_for(pdf_document)
+        if await asyncio.to_thread(storage.exists, key):
+            return pdf_document
+    return None
+
+
+def _storage_reference(pdf_document) -> tuple:
+    return (pdf_document.storageDriver or "local", pdf_document.storageKey or pdf_document.fileName)
+
+
+def _next_objects(objects, limit: int) -> list:
+    """Up to limit more (key, size, modified) entries from a storage listing (runs in a thread)"""
+    return list(itertools.islice(objects, limit))
+
+
+def _delete_files(references, dry_run: bool) -> Tuple[int, int]:
+    """Delete (driver, key) files, returning (files deleted, bytes freed) (runs in a thread)"""
+    deleted_files = 0
+    freed_bytes = 0
+    if not dry_run:
+        for driver, key in references:
+            freed = get_storage(driver).delete(key)
+            freed_bytes += freed
+            deleted_files += 1 if freed else 0
+    return deleted_files, freed_bytes
+
+
+async def _referenced(db: Prisma, references: set, exclude_ids=()) -> set:
+    """
+    The (driver, key) references some PdfDocument row (other than
+    exclude_ids) still points to; only rows for these keys are loaded
+    """
+    keys = list({key for _, key in references})
+    if not keys:
+        return set()
+    documents = await db.pdfdocument.find_many(
+        where={
+            "id": {"not_in": list(exclude_ids)},
+            "OR": [
+                {"storageKey": {"in": keys}},
+                {"storageKey": None, "fileName": {"in": keys}}
+            ]
+        }
+    )
+    return {_storage_reference(document) for document in documents} & references
+
+
+async def _newest_document_ids(db: Prisma, form_ids: List[int], keep_per_form: int) -> set:
+    """Ids of the newest keep_per_form documents of each form"""
+    if keep_per_form <= 0:
+        return set()
+    keep_ids = set()
+    kept_per_form: Dict[int, int] = {}
+    for document in await db.pdfdocument.find_many(
+        where={"formId": {"in": form_ids}},
+        order={"generatedAt": "desc"}
+    ):
+        if kept_per_form.get(document.formId, 0) < keep_per_form:
+            keep_ids.add(document.id)
+            kept_per_form[document.formId] = kept_per_form.get(document.formId, 0) + 1
+    return keep_ids
+
+
+async def collect_stale_pdfs(
+    db: Prisma,
+    retention_days: int = PDF_RETENTION_DAYS,
+    keep_per_form: int = PDF_KEEP_PER_FORM,
+    dry_run: bool = False,
+    batch_size: int = PDF_GC_BATCH_SIZE
+) -> dict:
+    """
+    Delete PDFs past the retention period (keeping each form's newest ones)
+    and orphaned files in PDF storage
+
+    Expired documents and stored files are processed batch_size at a time;
+    only the rows of the batch (and of the same forms and files) are loaded.
+    Content-addressed files can be shared by several documents, so a file
+    is only removed once no document uses it. Returns counts of deleted
+    documents and files and the bytes freed.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    totals = {"expired_documents": 0, "orphaned_files": 0, "deleted_files": 0, "freed_bytes": 0}
+
+    # Expired documents, in id order
+    after_id = 0
+    while True:
+        batch = await db.pdfdocument.find_many(
+            where={"id": {"gt": after_id}, "generatedAt": {"lt": cutoff}},
+            order={"id": "asc"},
+            take=batch_size
+        )
+        if not batch:
+            break
+        after_id = batch[-1].id
+
+        keep_ids = await _newest_document_ids(db, list({document.formId for document in batch}), keep_per_form)
+        expired = [document for document in batch if document.id not in keep_ids]
+        if expired:
+            expired_ids = [document.id for document in expired]
+            if not dry_run:
+                # Remove rows first so no request is handed a file that is about to go
+                await db.pdfdocument.delete_many(where={"id": {"in": expired_ids}})
+            references = {_storage_reference(document) for document in expired}
+            unreferenced = references - await _referenced(db, references, expired_ids)
+            deleted_files, freed_bytes = await asyncio.to_thread(_delete_files, unreferenced, dry_run)
+            totals["expired_documents"] += len(expired)
+            totals["deleted_files"] += deleted_files
+            totals["freed_bytes"] += freed_bytes
+
+        if len(batch) < batch_size:
+            break
+
+    # Files left behind by failed generations or deleted forms
+    storage = get_storage()
+    objects = iter(storage.iter_objects())
+    while True:
+        listing = await asyncio.to_thread(_next_objects, objects, batch_size)
+        if not listing:
+            break
+        old = {(storage.name, key) for key, _, modified in listing if modified < cutoff.timestamp()}
+        orphaned = old - await _referenced(db, old)
+        deleted_files, freed_bytes = await asyncio.to_thread(_delete_files, orphaned, dry_run)
+        totals["orphaned_files"] += len(orphaned)
+        totals["deleted_files"] += deleted_files
+        totals["freed_bytes"] += freed_bytes
+
+    return {**totals, "dry_run": dry_run}
+
+
+async def run_pdf_gc_periodically(db: Prisma, interval_hours: float = PDF_GC_INTERVAL_HOURS):
+    """Background loop started from the app lifespan"""
+    while True:
+        await asyncio.sleep(interval_hours * 3600)
+        try:
+            if not db.is_connected():
+                await db.connect()
+            result = await collect_stale_pdfs(db)
+            logger.info(
+                f"PDF cleanup removed {result['expired_documents']} expired documents and "
+                f"{result['orphaned_files']} orphaned files ({result['freed_bytes']} bytes)"
+            )
+        except Exception as e:
+            logger.error(f"PDF cleanup failed: {str(e)}")
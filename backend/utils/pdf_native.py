@@ -0,0 +1,613 @@
+"""
+Native DPR PDF Renderer
+Writes the Detailed Project Report straight to PDF with fpdf2 (pure Python),
+without a browser. Used for the template types in PDF_NATIVE_TEMPLATES;
+the content and section order follow templates/dpr/report.html.
+"""
+import os
+import re
+from typing import List, Optional, Tuple
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from utils.dpr_html import build_dpr_context, format_date, format_datetime, format_inr
+
+# Template types rendered natively (the rest go through Chromium)
+PDF_NATIVE_TEMPLATES = tuple(
+    name.strip() for name in os.getenv("PDF_NATIVE_TEMPLATES", "basic,bank-ready").split(",") if name.strip()
+)
+
+# The built-in PDF fonts only cover Latin-1, so Telugu reports always use Chromium
+PDF_NATIVE_LANGUAGES = ("english",)
+
+Color = Tuple[int, int, int]
+
+# (text, font style) pieces of a paragraph, e.g. ("bold words", "B")
+Runs = List[Tuple[str, str]]
+
+# Accent colour per template (cover band / headings), as in report.css
+TEMPLATE_ACCENTS = {
+    "basic": (102, 126, 234),
+    "professional": (102, 126, 234),
+    "bank-ready": (31, 58, 95)
+}
+
+TEXT: Color = (51, 51, 51)
+MUTED: Color = (102, 102, 102)
+FAINT: Color = (153, 153, 153)
+RULE: Color = (221, 221, 221)
+NEGATIVE: Color = (220, 53, 69)
+POSITIVE: Color = (40, 167, 69)
+VIABILITY_COLORS = {"strong": POSITIVE, "moderate": (184, 134, 11), "weak": NEGATIVE}
+
+# Characters outside Latin-1 that reports commonly contain
+_LATIN1_REPLACEMENTS = str.maketrans({
+    "₹": "Rs.",
+    "‘": "'",
+    "’": "'",
+    "“": '"',
+    "”": '"',
+    "–": "-",
+    "—": "-",
+    "•": "-",
+    "…": "...",
+    " ": " ",
+    "✓": "",
+    "⚠": ""
+})
+
+
+def uses_native_renderer(template_type: str, language: str) -> bool:
+    return template_type in PDF_NATIVE_TEMPLATES and language in PDF_NATIVE_LANGUAGES
+
+
+def latin1(text) -> str:
+    """Text the built-in fonts can show (unsupported characters become '?')"""
+    if text is None:
+        return ""
+    return str(text).translate(_LATIN1_REPLACEMENTS).strip().encode("latin-1", "replace").decode("latin-1")
+
+
+class _DprPdf(FPDF):
+    """A4 document with the DPR's heading, field and table styles"""
+
+    def __init__(self, business_name: str, accent: Color):
+        super().__init__(orientation="portrait", unit="mm", format="A4")
+        self.business_name = latin1(business_name)
+        self.accent = accent
+        self._widths = {}
+        self.set_margins(15, 20, 15)
+        self.set_auto_page_break(True, margin=20)
+        self.set_title(f"DPR - {self.business_name}")
+        self.set_creator("MSME DPR Generator")
+
+    def footer(self):
+        if self.page_no() == 1:
+            return
+        self.set_y(-14)
+        self.set_font("Times", "", 8)
+        self.set_text_color(*FAINT)
+        self.cell(0, 5, f"{self.business_name} - Detailed Project Report", align="L")
+        self.cell(0, 5, f"Page {self.page_no()}", align="R", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    def section_title(self, text: str):
+        self.add_page()
+        self.set_font("Times", "B", 18)
+        self.set_text_color(*self.accent)
+        self.cell(0, 10, latin1(text), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.set_draw_color(*self.accent)
+        self.set_line_width(0.8)
+        self.line(self.l_margin, self.get_y(), self.w - self.r_margin, self.get_y())
+        self.ln(5)
+
+    def subsection_title(self, text: str):
+        if self.will_page_break(20):
+            self.add_page()
+        self.ln(2)
+        self.set_fill_color(*self.accent)
+        self.rect(self.l_margin, self.get_y() + 1, 1.2, 6, style="F")
+        self.set_x(self.l_margin + 3)
+        self.set_font("Times", "B", 13)
+        self.set_text_color(*TEXT)
+        self.cell(0, 8, latin1(text), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.ln(1)
+
+    def field(self, label: str, value, default: str = "Not specified"):
+        text = latin1(value) if value not in (None, "") else default
+        if self.will_page_break(12):
+            self.add_page()
+        top = self.get_y()
+        start_page = self.page_no()
+        self.set_x(self.l_margin + 3)
+        self.set_font("Times", "B", 9)
+        self.set_text_color(*MUTED)
+        self.cell(0, 5, latin1(label).upper(), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.set_text_color(0, 0, 0)
+        self.paragraph([(text, "")], 11, 5.5, indent=3 + self.c_margin)
+        if self.page_no() == start_page:
+            self.set_draw_color(224, 224, 224)
+            self.set_line_width(0.5)
+            self.line(self.l_margin, top, self.l_margin, self.get_y())
+        self.ln(2)
+
+    def note(self, text: str, color: Color = MUTED, style: str = "I"):
+        self.set_text_color(*color)
+        self.paragraph([(latin1(text), style)], 10, 5)
+        self.ln(2)
+
+    def paragraph(self, runs: Runs, size: float, line_height: float, indent: float = 0):
+        """
+        Word-wrap styled runs within the margins and draw them line by line
+
+        fpdf2's multi_cell/write_html break lines character by character, which
+        dominated render time; measuring whole words (cached) and drawing each
+        same-style stretch of a line with one text() call is several times faster.
+        """
+        left = self.l_margin + indent
+        max_width = self.epw - indent
+        words = []
+        for text, style in runs:
+            words.extend((word, style, self._word_width(word, style, size)) for word in text.split())
+
+        lines = []
+        line, width = [], 0.0
+        for word in words:
+            extra = word[2] + (self._word_width(" ", word[1], size) if line else 0)
+            if line and width + extra > max_width:
+                lines.append(line)
+                line, width, extra = [], 0.0, word[2]
+            line.append(word)
+            width += extra
+        if line:
+            lines.append(line)
+
+        for line in lines:
+            if self.will_page_break(line_height):
+                self.add_page()
+            x = left
+            baseline = self.get_y() + line_height * 0.75
+            index = 0
+            while index < len(line):
+                style = line[index][1]
+                end = index
+                while end < len(line) and line[end][1] == style:
+                    end += 1
+                stretch = " ".join(word for word, _, _ in line[index:end])
+                self.set_font("Times", style, size)
+                self.text(x, baseline, stretch)
+                x += self._word_width(stretch, style, size) + self._word_width(" ", style, size)
+                index = end
+            self.set_y(self.get_y() + line_height)
+
+    def _word_width(self, word: str, style: str, size: float) -> float:
+        key = (word, style, size)
+        width = self._widths.get(key)
+        if width is None:
+            self.set_font("Times", style, size)
+            width = self._widths[key] = self.get_string_width(word)
+        return width
+
+    def no_data(self, text: str):
+        self.note(text, FAINT)
+
+    def table(self, headings: List[str], rows: List[List[str]], negative: List[List[bool]], row_height: float = 7):
+        """Bordered table: first column left-aligned, the rest right-aligned figures"""
+        widths = [20] + [(self.epw - 20) / (len(headings) - 1)] * (len(headings) - 1)
+        self.set_draw_color(*RULE)
+        self.set_line_width(0.2)
+
+        def draw_row(values, style, fill: Optional[Color], colors):
+            if self.will_page_break(row_height):
+                self.add_page()
+            x, y = self.l_margin, self.get_y()
+            for column, (value, width) in enumerate(zip(values, widths)):
+                if fill:
+                    self.set_fill_color(*fill)
+                self.rect(x, y, width, row_height, style="DF" if fill else "D")
+                self.set_text_color(*colors[column])
+                text_width = self._word_width(value, style, 9)
+                offset = 2 if column == 0 else width - 2 - text_width
+                self.set_font("Times", style, 9)
+                self.text(x + offset, y + row_height * 0.68, value)
+                x += width
+            self.set_y(y + row_height)
+
+        draw_row(headings, "B", self.accent, [(255, 255, 255)] * len(headings))
+        for index, (values, flags) in enumerate(zip(rows, negative)):
+            draw_row(
+                [value or "" for value in values],
+                "",
+                (248, 249, 250) if index % 2 else None,
+                [NEGATIVE if flag else (0, 0, 0) for flag in flags]
+            )
+        self.set_text_color(0, 0, 0)
+        self.ln(4)
+
+    def bar_chart(self, title: str, labels: List[str], series: List[Tuple[str, Color, List[float]]], height: float = 60):
+        """Grouped bar chart with a zero baseline (bars below it are losses)"""
+        if self.will_page_break(height + 20):
+            self.add_page()
+        self.set_font("Times", "B", 10)
+        self.set_text_color(*TEXT)
+        self.cell(0, 6, latin1(title), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+        values = [value for _, _, points in series for value in points]
+        top_value = max(max(values), 0) or 1
+        bottom_value = min(min(values), 0)
+        span = top_value - bottom_value
+
+        left = self.l_margin + 2
+        width = self.epw - 4
+        top = self.get_y() + 2
+        baseline = top + height * top_value / span
+        group_width = width / len(labels)
+        bar_width = group_width * 0.7 / len(series)
+
+        self.set_draw_color(*RULE)
+        self.set_line_width(0.2)
+        self.line(left, top, left, top + height)
+        self.line(left, baseline, left + width, baseline)
+
+        for group, label in enumerate(labels):
+            group_left = left + group * group_width + group_width * 0.15
+            for index, (_, color, points) in enumerate(series):
+                value = points[group]
+                bar_height = height * abs(value) / span
+                self.set_fill_color(*(color if value >= 0 else NEGATIVE))
+                self.rect(
+                    group_left + index * bar_width,
+                    baseline - bar_height if value >= 0 else baseline,
+                    bar_width * 0.9,
+                    bar_height,
+                    style="F"
+                )
+            self.set_xy(left + group * group_width, top + height + 1)
+            self.set_font("Times", "", 8)
+            self.set_text_color(*MUTED)
+            self.cell(group_width, 4, latin1(label), align="C")
+
+        # Legend
+        self.set_xy(left, top + height + 6)
+        for name, color, _ in series:
+            self.set_fill_color(*color)
+            self.rect(self.get_x(), self.get_y() + 1, 3, 3, style="F")
+            self.set_x(self.get_x() + 4)
+            self.cell(self.get_string_width(name) + 6, 5, name)
+        self.set_xy(self.l_margin, top + height + 13)
+
+
+def _cover(pdf: _DprPdf, context: dict, template_type: str):
+    form = context["form"]
+    pdf.add_page()
+    if template_type == "basic":
+        pdf.set_draw_color(*pdf.accent)
+        pdf.set_line_width(1)
+        pdf.rect(10, 10, pdf.w - 20, pdf.h - 20)
+        text_color = (0, 0, 0)
+    else:
+        pdf.set_fill_color(*pdf.accent)
+        pdf.rect(0, 0, pdf.w, pdf.h, style="F")
+        text_color = (255, 255, 255)
+
+    pdf.set_text_color(*text_color)
+    pdf.set_y(90)
+    pdf.set_font("Times", "B", 28)
+    pdf.multi_cell(0, 12, "DETAILED PROJECT REPORT (DPR)", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(6)
+    pdf.set_font("Times", "B", 20)
+    pdf.multi_cell(0, 10, latin1(context["business_name"]), align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_draw_color(*text_color)
+    pdf.set_line_width(0.8)
+    pdf.line(40, pdf.get_y() + 4, pdf.w - 40, pdf.get_y() + 4)
+
+    pdf.set_y(pdf.get_y() + 20)
+    entrepreneur = form.entrepreneurDetails.fullName if form.entrepreneurDetails else "N/A"
+    for label, value in (
+        ("Prepared for:", entrepreneur),
+        ("Date:", format_date(form.createdAt)),
+        ("DPR Reference:", f"DPR-{form.id}")
+    ):
+        pdf.set_x(pdf.w * 0.3)
+        pdf.set_font("Times", "B", 12)
+        pdf.cell(35, 8, label)
+        pdf.set_font("Times", "", 12)
+        pdf.cell(0, 8, latin1(value), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+
+def _money(value) -> Optional[str]:
+    return None if value is None else latin1(format_inr(value))
+
+
+def _business_sections(pdf: _DprPdf, context: dict):
+    form = context["form"]
+    business = form.businessDetails
+    financial = form.financialDetails
+
+    pdf.section_title("1. Executive Summary")
+    pdf.field("Business Name", context["business_name"])
+    pdf.field("Sector", business.sector if business else None)
+    pdf.field("Sub-Sector", business.subSector if business else None)
+    pdf.field("Total Investment", _money(financial.totalInvestmentAmount) if financial else None)
+    pdf.field("Project Status", f"{form.status} ({form.completionPercentage}% complete)")
+
+    pdf.section_title("2. Entrepreneur Information")
+    entrepreneur = form.entrepreneurDetails
+    if entrepreneur:
+        pdf.subsection_title("Personal Details")
+        pdf.field("Full Name", entrepreneur.fullName)
+        pdf.field("Date of Birth", format_date(entrepreneur.dateOfBirth))
+        pdf.subsection_title("Educational & Professional Background")
+        pdf.field("Education", entrepreneur.education)
+        pdf.field("Years of Experience", f"{entrepreneur.yearsOfExperience} years")
+        pdf.field("Technical Skills", entrepreneur.technicalSkills)
+        pdf.field("Previous Business Experience", entrepreneur.previousBusinessExperience)
+    else:
+        pdf.no_data("Entrepreneur details not available")
+
+    pdf.section_title("3. Business Overview")
+    if business:
+        pdf.subsection_title("Basic Information")
+        pdf.field("Business Name", business.businessName)
+        pdf.field("Sector", business.sector)
+        pdf.field("Sub-Sector", business.subSector)
+        pdf.subsection_title("Legal Structure")
+        pdf.field("Legal Structure", business.legalStructure)
+        if business.registrationNumber:
+            pdf.field("Registration Number", business.registrationNumber)
+        pdf.subsection_title("Operational Details")
+        pdf.field("Location", business.location)
+        pdf.field("Address", business.address)
+        if form.staffingDetails:
+            pdf.field("Number of Employees", form.staffingDetails.totalEmployees)
+    else:
+        pdf.no_data("Business details not available")
+
+    pdf.section_title("4. Product/Service Details")
+    product = form.productDetails
+    if product:
+        key_features = context["key_features"]
+        pdf.subsection_title("Product Overview")
+        pdf.field("Product Name", product.productName)
+        pdf.field("Description", product.description)
+        pdf.field("Key Features", ", ".join(map(str, key_features)) if key_features else None)
+        pdf.field("Unique Selling Points", product.uniqueSellingPoints)
+        pdf.subsection_title("Capacity & Quality")
+        pdf.field("Current Capacity", product.currentCapacity)
+        pdf.field("Planned Capacity", product.plannedCapacity)
+        if product.qualityCertifications:
+            pdf.field("Quality Certifications", product.qualityCertifications)
+        pdf.subsection_title("Market")
+        pdf.field("Target Customers", product.targetCustomers)
+    else:
+        pdf.no_data("Product details not available")
+
+
+def _financial_sections(pdf: _DprPdf, context: dict):
+    form = context["form"]
+
+    pdf.section_title("5. Financial Requirements")
+    financial = form.financialDetails
+    if financial:
+        pdf.subsection_title("Investment Breakdown")
+        pdf.field("Total Investment Amount", _money(financial.totalInvestmentAmount))
+        pdf.field("Land Cost", _money(financial.landCost))
+        pdf.field("Building Cost", _money(financial.buildingCost))
+        pdf.field("Machinery Cost", _money(financial.machineryCost))
+        pdf.field("Working Capital", _money(financial.workingCapital))
+        pdf.field("Other Costs", _money(financial.otherCosts))
+        pdf.subsection_title("Funding Structure")
+        pdf.field("Own Contribution", _money(financial.ownContribution))
+        pdf.field("Loan Required", _money(financial.loanRequired))
+    else:
+        pdf.no_data("Financial details not available")
+
+    revenue = form.revenueAssumptions
+    if revenue:
+        pdf.subsection_title("Revenue Assumptions")
+        pdf.field("Price per Unit", _money(revenue.productPrice))
+        pdf.field("Monthly Sales (Year 1)", f"{revenue.monthlySalesQuantityYear1} units")
+        pdf.field("Monthly Sales (Year 2)", f"{revenue.monthlySalesQuantityYear2} units")
+        pdf.field("Monthly Sales (Year 3)", f"{revenue.monthlySalesQuantityYear3} units")
+        pdf.field("Annual Growth Rate", f"{revenue.growthRatePercentage}%")
+
+    cost = form.costDetails
+    if cost:
+        pdf.subsection_title("Cost Structure (Monthly)")
+        pdf.field("Raw Material Cost", _money(cost.rawMaterialCostMonthly))
+        pdf.field("Labor Cost", _money(cost.laborCostMonthly))
+        pdf.field("Utilities", _money(cost.utilitiesCostMonthly))
+        pdf.field("Rent", _money(cost.rentMonthly))
+        pdf.field("Marketing", _money(cost.marketingCostMonthly))
+        pdf.field("Other Fixed Costs", _money(cost.otherFixedCostsMonthly))
+
+    summary = context["summary"]
+    if summary:
+        pdf.section_title("5.5. Financial Analysis Summary")
+        pdf.note(
+            "This section provides calculated financial metrics based on the investment and revenue "
+            f"projections. Calculated on: {format_datetime(summary.calculatedAt)}"
+        )
+        pdf.subsection_title("Key Financial Metrics")
+        pdf.field("Break-even Period", f"{summary.breakevenMonths} months")
+        pdf.field("Return on Investment (ROI)", f"{float(summary.roiPercentage):.2f}%")
+        pdf.field("Payback Period", f"{summary.paybackPeriodMonths} months")
+        pdf.field("Net Present Value (NPV)", latin1(format_inr(summary.npv, 2)))
+        pdf.field("Profit Margin", f"{float(summary.profitMarginPercentage):.2f}%")
+
+        years = context["annual_projections"]
+        if years:
+            pdf.subsection_title("Annual Projections")
+            columns = ("revenue", "fixed_costs", "variable_costs", "profit_loss", "cumulative_profit_loss")
+            pdf.table(
+                ["Year", "Revenue", "Fixed Costs", "Variable Costs", "Profit / Loss", "Cumulative"],
+                [[f"Year {year['year']}"] + [_money(year[column]) for column in columns] for year in years],
+                [[False, False, False, False, year["profit_loss"] < 0, year["cumulative_profit_loss"] < 0] for year in years]
+            )
+            pdf.bar_chart(
+                "Revenue, costs and profit by year",
+                [f"Year {year['year']}" for year in years],
+                [
+                    ("Revenue", pdf.accent, [year["revenue"] for year in years]),
+                    ("Total Costs", (160, 160, 160), [year["fixed_costs"] + year["variable_costs"] for year in years]),
+                    ("Profit / Loss", POSITIVE, [year["profit_loss"] for year in years])
+                ]
+            )
+
+        viability = context["viability"]
+        pdf.subsection_title("Financial Viability Assessment")
+        pdf.note(viability["message"], VIABILITY_COLORS[viability["level"]], style="B")
+
+    if context["schemes"]:
+        pdf.section_title("5.6. Applicable Government Schemes")
+        for scheme in context["schemes"]:
+            pdf.subsection_title(scheme.schemeName)
+            pdf.field("Ministry", scheme.ministry)
+            pdf.field("Scheme Type", scheme.schemeType)
+            if scheme.subsidyPercentage:
+                subsidy = f"{float(scheme.subsidyPercentage):.2f}%"
+                if scheme.maxSubsidyAmount:
+                    subsidy += f" (max {_money(scheme.maxSubsidyAmount)})"
+                pdf.field("Subsidy", subsidy)
+            pdf.field("Description", scheme.description)
+
+
+_INLINE = re.compile(r"(\*\*.+?\*\*|__.+?__|`[^`]+`|(?<![\w*])[*_](?=\S).+?(?<=\S)[*_](?![\w*]))")
+_LINK = re.compile(r"\[([^\]]+)\]\([^)\s]+\)")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+_LIST_ITEM = re.compile(r"^\s*([-*+]|\d+[.)])\s+(.*)$")
+_RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+
+# Heading size and colour by level (h1-h6), as in report.css
+_HEADING_STYLES = {1: (16, None), 2: (14, (118, 75, 162)), 3: (12, TEXT)}
+
+
+def inline_runs(text: str) -> Runs:
+    """Split a line of markdown into (text, style) runs: bold, italic and plain"""
+    runs = []
+    for part in _INLINE.split(_LINK.sub(r"\1", latin1(text))):
+        if not part:
+            continue
+        if part[:2] in ("**", "__") and part[-2:] == part[:2] and len(part) > 4:
+            runs.append((part[2:-2], "B"))
+        elif part[0] == "`" and part[-1] == "`":
+            runs.append((part[1:-1], ""))
+        elif part[0] in "*_" and part[-1] == part[0] and len(part) > 2:
+            runs.append((part[1:-1], "I"))
+        else:
+            runs.append((part, ""))
+    return runs
+
+
+def markdown_blocks(text: Optional[str]) -> List[tuple]:
+    """
+    Block structure of AI-generated markdown, matching markdown_to_html
+
+    Yields ("heading", level, runs), ("paragraph", runs), ("item", marker,
+    runs), ("code", lines) and ("rule",) tuples.
+    """
+    blocks = []
+    paragraph: List[str] = []
+    code: Optional[List[str]] = None
+
+    def flush():
+        if paragraph:
+            blocks.append(("paragraph", inline_runs(" ".join(paragraph))))
+            paragraph.clear()
+
+    for line in (text or "").replace("\r\n", "\n").split("\n"):
+        if line.strip().startswith("```"):
+            if code is None:
+                flush()
+                code = []
+            else:
+                blocks.append(("code", code))
+                code = None
+            continue
+        if code is not None:
+            code.append(line)
+            continue
+
+        stripped = line.strip()
+        heading = _HEADING.match(stripped)
+        item = _LIST_ITEM.match(line)
+        if not stripped:
+            flush()
+        elif heading:
+            flush()
+            blocks.append(("heading", len(heading.group(1)), inline_runs(heading.group(2))))
+        elif _RULE.match(stripped):
+            flush()
+            blocks.append(("rule",))
+        elif item:
+            flush()
+            marker = "-" if item.group(1) in "-*+" else item.group(1)
+            blocks.append(("item", marker, inline_runs(item.group(2))))
+        elif blocks and blocks[-1][0] == "item" and not paragraph and line[:1].isspace():
+            # Continuation of the previous list item
+            blocks[-1] = ("item", blocks[-1][1], blocks[-1][2] + inline_runs(" " + stripped))
+        else:
+            paragraph.append(stripped)
+
+    if code is not None:
+        blocks.append(("code", code))
+    flush()
+    return blocks
+
+
+def _markdown(pdf: _DprPdf, text: Optional[str]):
+    for block in markdown_blocks(text):
+        kind = block[0]
+        if kind == "heading":
+            size, color = _HEADING_STYLES.get(block[1], (11, (68, 68, 68)))
+            if pdf.will_page_break(16):
+                pdf.add_page()
+            pdf.ln(2)
+            pdf.set_text_color(*(color or pdf.accent))
+            pdf.paragraph([(text, "B") for text, _ in block[2]], size, size * 0.5)
+            pdf.ln(1)
+        elif kind == "paragraph":
+            pdf.set_text_color(*TEXT)
+            pdf.paragraph(block[1], 11, 5.5)
+            pdf.ln(2)
+        elif kind == "item":
+            pdf.set_text_color(*TEXT)
+            pdf.set_font("Times", "", 11)
+            pdf.text(pdf.l_margin + 3, pdf.get_y() + 5.5 * 0.75, block[1])
+            pdf.paragraph(block[2], 11, 5.5, indent=9)
+            pdf.ln(0.5)
+        elif kind == "code":
+            pdf.set_text_color(*MUTED)
+            for line in block[1]:
+                pdf.paragraph([(latin1(line) or " ", "")], 9.5, 4.5, indent=4)
+            pdf.ln(2)
+        else:
+            pdf.set_draw_color(*RULE)
+            pdf.set_line_width(0.3)
+            pdf.line(pdf.l_margin, pdf.get_y() + 2, pdf.w - pdf.r_margin, pdf.get_y() + 2)
+            pdf.ln(5)
+
+
+def _generated_sections(pdf: _DprPdf, context: dict):
+    pdf.section_title("6. Project Description")
+    sections = context["generated_sections"]
+    if not sections:
+        pdf.no_data("AI-generated content not available")
+        return
+
+    for section in sections:
+        _markdown(pdf, section["text"])
+        pdf.ln(4)
+    pdf.note(f"Generated on: {format_datetime(context['generated_at'])}")
+
+
+def render_dpr_pdf(form, schemes=None, language: str = "english", template_type: str = "basic") -> bytes:
+    """Complete DPR as PDF bytes, from the same data as render_dpr_html"""
+    context = build_dpr_context(form, schemes, language, template_type)
+    pdf = _DprPdf(context["business_name"], TEMPLATE_ACCENTS.get(template_type, TEMPLATE_ACCENTS["basic"]))
+    # Fixed creation date so unchanged data gives byte-identical output
+    pdf.set_creation_date(form.createdAt)
+
+    _cover(pdf, context, template_type)
+    _business_sections(pdf, context)
+    _financial_sections(pdf, context)
+    _generated_sections(pdf, context)
+    return bytes(pdf.output())
@@ -0,0 +1,191 @@
+"""
+PDF Optimizer
+Optional post-processing of rendered PDFs to make them smaller and faster
+to open on slow connections. Modes (PDF_OPTIMIZE):
+- off: PDFs are stored as rendered
+- lossless: recompress streams, pack objects into object streams and
+  linearize (first page viewable before the whole file has arrived)
+- images: lossless, plus downsampling images drawn above
+  PDF_OPTIMIZE_IMAGE_DPI and re-encoding them as JPEG when that is smaller
+
+Needs pikepdf (qpdf bindings, with Pillow), which is only imported when a
+mode other than off is used. Fonts are left alone: Chromium and fpdf2 both
+embed subsets already.
+"""
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass
+from io import BytesIO
+
+logger = logging.getLogger(__name__)
+
+PDF_OPTIMIZE_MODES = ("off", "lossless", "images")
+PDF_OPTIMIZE = os.getenv("PDF_OPTIMIZE", "off").lower()
+if PDF_OPTIMIZE not in PDF_OPTIMIZE_MODES:
+    raise ValueError(f"PDF_OPTIMIZE must be one of: {', '.join(PDF_OPTIMIZE_MODES)}")
+
+# Images drawn at a higher resolution than this are downsampled to it
+PDF_OPTIMIZE_IMAGE_DPI = int(os.getenv("PDF_OPTIMIZE_IMAGE_DPI", "150"))
+
+# JPEG quality for re-encoded images
+PDF_OPTIMIZE_JPEG_QUALITY = int(os.getenv("PDF_OPTIMIZE_JPEG_QUALITY", "75"))
+
+# Only downsample when it saves a meaningful share of the pixels
+DOWNSAMPLE_THRESHOLD = 1.2
+
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+@dataclass
+class OptimizeResult:
+    original_size: int
+    optimized_size: int
+    duration_ms: int
+    images_recompressed: int = 0
+
+
+def _multiply(first, second):
+    """Concatenate two PDF transformation matrices (first, then second)"""
+    a1, b1, c1, d1, e1, f1 = first
+    a2, b2, c2, d2, e2, f2 = second
+    return (
+        a1 * a2 + b1 * c2, a1 * b2 + b1 * d2,
+        c1 * a2 + d1 * c2, c1 * b2 + d1 * d2,
+        e1 * a2 + f1 * c2 + e2, e1 * b2 + f1 * d2 + f2
+    )
+
+
+def image_placements(pdf) -> dict:
+    """
+    Largest size (in points) each image XObject is drawn at, by object id
+
+    Walks every page's content stream (and the form XObjects it draws),
+    tracking the current transformation matrix up to each image "Do".
+    """
+    import pikepdf
+
+    placements = {}
+
+    def walk(content, resources, ctm, seen):
+        stack = []
+        xobjects = resources.get("/XObject", {}) if resources is not None else {}
+        for operands, operator in pikepdf.parse_content_stream(content):
+            operator = str(operator)
+            if operator == "q":
+                stack.append(ctm)
+            elif operator == "Q":
+                ctm = stack.pop() if stack else IDENTITY
+            elif operator == "cm":
+                ctm = _multiply(tuple(float(value) for value in operands), ctm)
+            elif operator == "Do":
+                xobject = xobjects.get(str(operands[0]))
+                if xobject is None:
+                    continue
+                subtype = xobject.get("/Subtype")
+                if subtype == "/Image":
+                    size = (math.hypot(ctm[0], ctm[1]), math.hypot(ctm[2], ctm[3]))
+                    previous = placements.get(xobject.objgen, (0.0, 0.0))
+                    placements[xobject.objgen] = (max(previous[0], size[0]), max(previous[1], size[1]))
+                elif subtype == "/Form" and xobject.objgen not in seen:
+                    matrix = tuple(float(value) for value in xobject.get("/Matrix", IDENTITY))
+                    walk(xobject, xobject.get("/Resources", resources), _multiply(matrix, ctm), seen | {xobject.objgen})
+
+    for page in pdf.pages:
+        walk(page, page.obj.get("/Resources"), IDENTITY, frozenset())
+    return placements
+
+
+def _recompress_image(image, placement, dpi: int, quality: int) -> bool:
+    """Downsample and/or JPEG-encode one image in place; True if it changed"""
+    import pikepdf
+    from PIL import Image
+
+    if image.get("/ImageMask") or "/Mask" in image or "/Decode" in image:
+        return False
+    if image.get("/BitsPerComponent") != 8:
+        return False
+    colorspace = image.get("/ColorSpace")
+    if isinstance(colorspace, pikepdf.Array) and len(colorspace) == 2 and colorspace[0] == "/ICCBased":
+        components = int(colorspace[1].get("/N", 0))
+    elif colorspace in ("/DeviceRGB", "/DeviceGray"):
+        components = 3 if colorspace == "/DeviceRGB" else 1
+    else:
+        return False
+    if components not in (1, 3):
+        return False
+
+    width, height = int(image.Width), int(image.Height)
+    # Pixels needed to show the image at the target resolution
+    target_width = max(1, round(placement[0] / 72 * dpi))
+    target_height = max(1, round(placement[1] / 72 * dpi))
+    downsample = width > target_width * DOWNSAMPLE_THRESHOLD and height > target_height * DOWNSAMPLE_THRESHOLD
+    already_jpeg = image.get("/Filter") == "/DCTDecode"
+    if already_jpeg and not downsample:
+        # Re-encoding a JPEG at the same size only loses quality
+        return False
+
+    picture = pikepdf.PdfImage(image).as_pil_image()
+    picture = picture.convert("RGB" if components == 3 else "L")
+    if downsample:
+        picture = picture.resize((target_width, target_height), Image.LANCZOS)
+
+    encoded = BytesIO()
+    picture.save(encoded, "JPEG", quality=quality, optimize=True)
+    encoded = encoded.getvalue()
+    if not downsample and len(encoded) >= len(image.read_raw_bytes()):
+        return False
+
+    image.write(encoded, filter=pikepdf.Name.DCTDecode)
+    image.Width, image.Height = picture.size
+    if "/DecodeParms" in image:
+        del image["/DecodeParms"]
+    return True
+
+
+def optimize_pdf(path: str, mode: str = PDF_OPTIMIZE) -> OptimizeResult:
+    """
+    Post-process a PDF file in place
+
+    Linearization adds hint tables, so a small, already compact PDF can
+    grow by a few hundred bytes; it is kept anyway for the faster first page.
+    """
+    original_size = os.path.getsize(path)
+    if mode == "off":
+        return OptimizeResult(original_size, original_size, 0)
+
+    try:
+        import pikepdf
+    except ImportError:
+        raise RuntimeError("PDF optimization requires pikepdf (pip install pikepdf)")
+
+    started = time.perf_counter()
+    images_recompressed = 0
+    optimized_path = f"{path}.optimized"
+    try:
+        with pikepdf.open(path) as pdf:
+            if mode == "images":
+                placements = image_placements(pdf)
+                for objgen, placement in placements.items():
+                    image = pdf.get_object(objgen)
+                    if _recompress_image(image, placement, PDF_OPTIMIZE_IMAGE_DPI, PDF_OPTIMIZE_JPEG_QUALITY):
+                        images_recompressed += 1
+            pdf.remove_unreferenced_resources()
+            pdf.save(
+                optimized_path,
+                linearize=True,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                compress_streams=True,
+                recompress_flate=True,
+                deterministic_id=True
+            )
+
+        optimized_size = os.path.getsize(optimized_path)
+        os.replace(optimized_path, path)
+    finally:
+        if os.path.exists(optimized_path):
+            os.remove(optimized_path)
+
+    duration_ms = round((time.perf_counter() - started) * 1000)
+    return OptimizeResult(original_size, optimized_size, duration_ms, images_recompressed)
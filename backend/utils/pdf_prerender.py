@@ -0,0 +1,180 @@
+"""
+PDF Pre-rendering
+Speculatively renders the default PDF of a form once it is complete (100%
+and every AI section generated), so the "Download PDF" click that usually
+follows is a content-hash cache hit instead of a cold render.
+
+Work is low priority: edits restart a per-form quiet period (so a
+pre-render of an outdated form never starts), one pre-render runs at a
+time, only while no interactive request is using or waiting for a browser,
+and at most once every PDF_PRERENDER_MIN_INTERVAL_SECONDS.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from prisma import Prisma
+from utils.ai_service import AVAILABLE_SECTIONS
+from utils.pdf_renderer import browser_pool
+
+logger = logging.getLogger(__name__)
+
+# Quiet period after the last edit before pre-rendering (0 disables)
+PDF_PRERENDER_DELAY_SECONDS = float(os.getenv("PDF_PRERENDER_DELAY_SECONDS", "30"))
+
+# Minimum time between two pre-renders
+PDF_PRERENDER_MIN_INTERVAL_SECONDS = float(os.getenv("PDF_PRERENDER_MIN_INTERVAL_SECONDS", "10"))
+
+# The PDF a download click produces without options
+PDF_PRERENDER_LANGUAGE = "english"
+PDF_PRERENDER_TEMPLATE_TYPE = "professional"
+
+# How often to check whether the browsers are free
+IDLE_POLL_SECONDS = 0.5
+
+PrerenderJob = Callable[[Prisma, int], Awaitable[object]]
+
+
+def is_ready_for_prerender(form) -> bool:
+    """True for a complete form (loaded with generatedContents) with every AI section"""
+    if not form or form.completionPercentage < 100:
+        return False
+    sections = {content.sectionName for content in form.generatedContents or [] if content.generatedText}
+    return all(section in sections for section in AVAILABLE_SECTIONS)
+
+
+class PdfPrerenderScheduler:
+    """Debounced, rate-limited background pre-rendering of completed forms"""
+
+    def __init__(
+        self,
+        delay_seconds: float = PDF_PRERENDER_DELAY_SECONDS,
+        min_interval_seconds: float = PDF_PRERENDER_MIN_INTERVAL_SECONDS
+    ):
+        self.delay_seconds = delay_seconds
+        self.min_interval_seconds = min_interval_seconds
+        self.db = Prisma()
+        self._job: Optional[PrerenderJob] = None
+        self._pending: Dict[int, asyncio.Task] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: set = set()
+        self._worker: Optional[asyncio.Task] = None
+        self._running: Dict[int, asyncio.Task] = {}
+        self._last_started = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._worker is not None
+
+    def start(self, job: PrerenderJob):
+        """Start the worker (app startup); job(db, form_id) renders one form"""
+        if self.delay_seconds <= 0 or self._worker is not None:
+            return
+        self._job = job
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    def schedule(self, form_id: int):
+        """
+        A form changed: drop any pre-render that has not started yet and try
+        again after the quiet period (the form is re-checked then)
+        """
+        if not self.enabled:
+            return
+        self.cancel(form_id)
+        self._pending[form_id] = asyncio.create_task(self._queue_after_delay(form_id))
+
+    def cancel(self, form_id: int):
+        """Forget a form's pending pre-render (it is no longer complete)"""
+        pending = self._pending.pop(form_id, None)
+        if pending and not pending.done():
+            pending.cancel()
+        self._queued.discard(form_id)
+
+    async def wait_for(self, form_id: int, language: str, template_type: str, timeout: float):
+        """
+        Wait for a running pre-render of the same PDF, so an interactive
+        request reuses its result instead of rendering the form twice
+        """
+        running = self._running.get(form_id)
+        if running is None or (language, template_type) != (PDF_PRERENDER_LANGUAGE, PDF_PRERENDER_TEMPLATE_TYPE):
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(running), timeout)
+        except Exception:
+            pass
+
+    async def _queue_after_delay(self, form_id: int):
+        try:
+            await asyncio.sleep(self.delay_seconds)
+        except asyncio.CancelledError:
+            return
+        if self._pending.get(form_id) is asyncio.current_task():
+            del self._pending[form_id]
+        if form_id not in self._queued:
+            self._queued.add(form_id)
+            self._queue.put_nowait(form_id)
+
+    async def _wait_for_quiet(self):
+        """Wait until interactive rendering is idle and the rate limit allows a job"""
+        while True:
+            remaining = self._last_started + self.min_interval_seconds - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+            elif not browser_pool.idle:
+                await asyncio.sleep(IDLE_POLL_SECONDS)
+            else:
+                return
+
+    async def _run(self):
+        while True:
+            form_id = await self._queue.get()
+            if form_id not in self._queued:
+                # Cancelled or rescheduled while waiting in the queue
+                continue
+            await self._wait_for_quiet()
+            if form_id not in self._queued:
+                continue
+            self._queued.discard(form_id)
+            self._last_started = time.monotonic()
+
+            task = asyncio.create_task(self._prerender(form_id))
+            self._running[form_id] = task
+            try:
+                await asyncio.shield(task)
+            finally:
+                if self._running.get(form_id) is task:
+                    del self._running[form_id]
+
+    async def _prerender(self, form_id: int):
+        try:
+            if not self.db.is_connected():
+                await self.db.connect()
+            await self._job(self.db, form_id)
+        except Exception as e:
+            logger.error(f"Background PDF pre-render failed for form {form_id}: {str(e)}")
+
+    async def shutdown(self):
+        """Cancel pending pre-renders and disconnect (app shutdown)"""
+        running = list(self._running.values())
+        tasks: List[asyncio.Task] = list(self._pending.values())
+        if self._worker is not None:
+            tasks.append(self._worker)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pending.clear()
+        self._queued.clear()
+        self._worker = None
+
+        # Let a render that is already running finish
+        await asyncio.gather(*running, return_exceptions=True)
+        self._running.clear()
+
+        if self.db.is_connected():
+            await self.db.disconnect()
+
+
+# Global scheduler instance
+pdf_prerender_scheduler = PdfPrerenderScheduler()
@@ -0,0 +1,229 @@
+"""
+PDF Renderer
+Long-lived pool of headless Chromium browsers used to render PDFs.
+Browsers start once in the app lifespan; each job gets its own isolated
+browser context, and concurrency is capped with a bounded wait queue.
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, TypeVar
+from playwright.sync_api import Page, sync_playwright
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Browsers kept running (= PDFs rendered concurrently)
+PDF_BROWSER_POOL_SIZE = int(os.getenv("PDF_BROWSER_POOL_SIZE", "2"))
+
+# Renders before a browser is restarted to release leaked memory
+PDF_BROWSER_MAX_RENDERS = int(os.getenv("PDF_BROWSER_MAX_RENDERS", "50"))
+
+# Requests allowed to wait for a free browser, and for how long
+PDF_QUEUE_LIMIT = int(os.getenv("PDF_QUEUE_LIMIT", "20"))
+PDF_QUEUE_TIMEOUT_SECONDS = float(os.getenv("PDF_QUEUE_TIMEOUT_SECONDS", "120"))
+
+# Browser context used for render jobs
+CONTEXT_OPTIONS = {
+    "viewport": {"width": 1920, "height": 1080},
+    "device_scale_factor": 2
+}
+
+# Server-rendered DPR HTML is static, so no scripts run even if some slip
+# into the content (the frontend page needs JavaScript to load the form)
+STATIC_CONTEXT_OPTIONS = {**CONTEXT_OPTIONS, "java_script_enabled": False}
+
+# page.pdf() options shared by every DPR render
+PDF_OPTIONS = {
+    "format": "A4",
+    "print_background": True,
+    "margin": {
+        "top": "20mm",
+        "right": "15mm",
+        "bottom": "20mm",
+        "left": "15mm"
+    },
+    "prefer_css_page_size": False
+}
+
+LAUNCH_ARGS = ["--disable-dev-shm-usage", "--disable-gpu"]
+
+
+def context_options_for(render_source: str) -> dict:
+    """Browser context options of a render source (server or frontend)"""
+    return STATIC_CONTEXT_OPTIONS if render_source == "server" else CONTEXT_OPTIONS
+
+
+class PdfRendererBusy(Exception):
+    """All browsers are busy and the wait queue is full (or the wait timed out)"""
+
+
+class _BrowserSlot:
+    """
+    One Chromium instance owned by a dedicated thread
+
+    Playwright's sync API is bound to the thread that started it, so every
+    call for this browser goes through the slot's single-thread executor.
+    Running Playwright off the event loop also avoids asyncio subprocess
+    issues on Windows.
+    """
+
+    def __init__(self, index: int, max_renders: int):
+        self.index = index
+        self.max_renders = max_renders
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"pdf-browser-{index}")
+        self._playwright = None
+        self._browser = None
+        self.renders = 0
+
+    def ensure_browser(self):
+        if self._browser is not None and self._browser.is_connected():
+            return
+        self.close()
+        self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        self.renders = 0
+        logger.info(f"PDF browser {self.index} launched")
+
+    def render(self, job: Callable[[Page], T], context_options: dict) -> T:
+        self.ensure_browser()
+        context = self._browser.new_context(**context_options)
+        try:
+            return job(context.new_page())
+        finally:
+            try:
+                context.close()
+            except Exception as e:
+                logger.warning(f"Failed to close browser context on browser {self.index}: {str(e)}")
+            self.renders += 1
+            if not self._browser.is_connected():
+                logger.warning(f"PDF browser {self.index} crashed, restarting on next job")
+                self.close()
+            elif self.renders >= self.max_renders:
+                logger.info(f"Recycling PDF browser {self.index} after {self.renders} renders")
+                self.close()
+
+    def close(self):
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+class BrowserPool:
+    """Fixed-size pool of browser slots with a bounded wait queue"""
+
+    def __init__(
+        self,
+        size: int = PDF_BROWSER_POOL_SIZE,
+        max_renders: int = PDF_BROWSER_MAX_RENDERS,
+        queue_limit: int = PDF_QUEUE_LIMIT,
+        queue_timeout: float = PDF_QUEUE_TIMEOUT_SECONDS
+    ):
+        self.size = size
+        self.max_renders = max_renders
+        self.queue_limit = queue_limit
+        self.queue_timeout = queue_timeout
+        self._slots: List[_BrowserSlot] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._waiting = 0
+
+    @property
+    def started(self) -> bool:
+        return self._idle is not None
+
+    @property
+    def idle(self) -> bool:
+        """No render is running or waiting for a browser"""
+        return not self.started or (self._waiting == 0 and self._idle.qsize() == self.size)
+
+    async def start(self, warm: bool = True):
+        """Create the slots and (optionally) launch their browsers up front"""
+        if self.started:
+            return
+        self._idle = asyncio.Queue()
+        self._slots = [_BrowserSlot(index, self.max_renders) for index in range(self.size)]
+        for slot in self._slots:
+            self._idle.put_nowait(slot)
+
+        if warm:
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(
+                *(loop.run_in_executor(slot.executor, slot.ensure_browser) for slot in self._slots),
+                return_exceptions=True
+            )
+            failures = [result for result in results if isinstance(result, Exception)]
+            if failures:
+                # Browsers are launched lazily on first use instead
+                logger.warning(f"Could not pre-launch PDF browsers: {str(failures[0])}")
+        logger.info(f"PDF browser pool started with {self.size} browsers")
+
+    async def run(self, job: Callable[[Page], T], context_options: dict = CONTEXT_OPTIONS) -> T:
+        """
+        Run job(page) on a fresh, isolated page of a pooled browser, in a
+        context created with context_options
+
+        Raises PdfRendererBusy when the wait queue is full or no browser frees
+        up within the queue timeout.
+        """
+        if not self.started:
+            await self.start(warm=False)
+
+        if self._idle.empty() and self._waiting >= self.queue_limit:
+            raise PdfRendererBusy("PDF renderer is busy, please try again shortly")
+
+        self._waiting += 1
+        try:
+            slot = await asyncio.wait_for(self._idle.get(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise PdfRendererBusy("Timed out waiting for a free PDF renderer")
+        finally:
+            self._waiting -= 1
+
+        loop = asyncio.get_running_loop()
+        idle = self._idle
+        try:
+            future = slot.executor.submit(slot.render, job, context_options)
+        except BaseException:
+            idle.put_nowait(slot)
+            raise
+
+        def release(_):
+            # The slot is free only once its thread has finished the job, even
+            # when the awaiting request was cancelled while it was rendering
+            try:
+                loop.call_soon_threadsafe(idle.put_nowait, slot)
+            except RuntimeError:
+                pass  # Event loop closed (shutdown)
+
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    async def shutdown(self):
+        """Close every browser (app shutdown)"""
+        if not self.started:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(slot.executor, slot.close) for slot in self._slots),
+            return_exceptions=True
+        )
+        for slot in self._slots:
+            slot.executor.shutdown(wait=False)
+        self._slots = []
+        self._idle = None
+        logger.info("PDF browser pool stopped")
+
+
+# Global pool instance
+browser_pool = BrowserPool()
@@ -0,0 +1,286 @@
+"""
+PDF Storage
+Where generated PDF files live. Two drivers:
+- local: content-addressed files sharded under PDF_STORAGE_DIR
+  (ab/cd/abcd....pdf), written atomically; point several nodes at a shared
+  mount to share PDFs
+- s3: any S3-compatible object store (AWS S3, MinIO, ...). Needs boto3,
+  which is only imported when this driver is used.
+
+Keys are the SHA-256 of the file, so identical PDFs are stored once.
+Documents created before this module have their flat uploads/ file name
+as the key.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PDF_STORAGE_DRIVERS = ("local", "s3")
+PDF_STORAGE_DRIVER = os.getenv("PDF_STORAGE_DRIVER", "local")
+if PDF_STORAGE_DRIVER not in PDF_STORAGE_DRIVERS:
+    raise ValueError(f"PDF_STORAGE_DRIVER must be one of: {', '.join(PDF_STORAGE_DRIVERS)}")
+
+# Local driver root; a relative path is resolved against the backend
+# directory (local_storage_root), wherever the server is started from
+PDF_STORAGE_DIR = os.getenv("PDF_STORAGE_DIR", "uploads")
+
+# S3 driver settings; credentials come from the usual AWS_* variables
+PDF_S3_BUCKET = os.getenv("PDF_S3_BUCKET", "")
+PDF_S3_PREFIX = os.getenv("PDF_S3_PREFIX", "pdfs/")
+PDF_S3_ENDPOINT_URL = os.getenv("PDF_S3_ENDPOINT_URL") or None
+PDF_S3_REGION = os.getenv("PDF_S3_REGION") or None
+
+# Downloads from S3 redirect to a presigned URL valid this long (0 streams
+# the file through the app instead)
+PDF_S3_PRESIGN_SECONDS = int(os.getenv("PDF_S3_PRESIGN_SECONDS", "300"))
+
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    key: str
+    size: int
+    checksum: str
+
+
+def local_storage_root(directory: str = PDF_STORAGE_DIR) -> str:
+    """Absolute local driver root, shared by the storage and the /uploads mount"""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(backend_dir, directory)
+
+
+def content_key(checksum: str) -> str:
+    """Sharded key for a SHA-256 checksum, e.g. ab/cd/abcd....pdf"""
+    return f"{checksum[:2]}/{checksum[2:4]}/{checksum}.pdf"
+
+
+def file_checksum(path: str) -> Tuple[str, int]:
+    """SHA-256 and size of a file, read in chunks"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class LocalPdfStorage:
+    """Content-addressed files under a root directory"""
+
+    name = "local"
+    STAGING_DIR = ".staging"
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or local_storage_root()
+
+    def path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, key))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def save_file(self, source_path: str) -> StoredObject:
+        """
+        Store a file under its checksum
+
+        The copy goes to a staging file in the same filesystem and is renamed
+        into place, so readers never see a partial PDF even with several
+        workers writing the same content.
+        """
+        checksum, size = file_checksum(source_path)
+        key = content_key(checksum)
+        target = self.path(key)
+        try:
+            # Already stored: refresh its mtime so the GC orphan sweep does
+            # not delete it before the new document row references it
+            os.utime(target)
+            return StoredObject(key, size, checksum)
+        except FileNotFoundError:
+            pass
+
+        staging = os.path.join(self.root, self.STAGING_DIR)
+        os.makedirs(staging, exist_ok=True)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        descriptor, staged = tempfile.mkstemp(dir=staging, suffix=".pdf")
+        try:
+            with os.fdopen(descriptor, "wb") as staged_file, open(source_path, "rb") as source:
+                shutil.copyfileobj(source, staged_file, CHUNK_SIZE)
+                staged_file.flush()
+                os.fsync(staged_file.fileno())
+            os.replace(staged, target)
+        except BaseException:
+            if os.path.exists(staged):
+                os.remove(staged)
+            raise
+        return StoredObject(key, size, checksum)
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.path(key))
+
+    def open(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Stream bytes start..end (inclusive) of an object"""
+        with open(self.path(key), "rb") as source:
+            source.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = source.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str) -> int:
+        """Delete an object, returning the bytes freed (0 if it was already gone)"""
+        try:
+            path = self.path(key)
+            size = os.path.getsize(path)
+            os.remove(path)
+            return size
+        except FileNotFoundError:
+            return 0
+
+    def iter_objects(self) -> Iterator[Tuple[str, int, float]]:
+        """(key, size, modified timestamp) of every stored PDF"""
+        if not os.path.isdir(self.root):
+            return
+        for directory, directories, files in os.walk(self.root):
+            if self.STAGING_DIR in directories:
+                directories.remove(self.STAGING_DIR)
+            for name in files:
+                if not name.lower().endswith(".pdf"):
+                    continue
+                path = os.path.join(directory, name)
+                stat = os.stat(path)
+                yield os.path.relpath(path, self.root).replace(os.sep, "/"), stat.st_size, stat.st_mtime
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self.path(key)
+
+    def presigned_url(self, key: str) -> Optional[str]:
+        return None
+
+
+class S3PdfStorage:
+    """Objects in an S3-compatible bucket under a key prefix"""
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str = PDF_S3_BUCKET,
+        prefix: str = PDF_S3_PREFIX,
+        endpoint_url: Optional[str] = PDF_S3_ENDPOINT_URL,
+        region: Optional[str] = PDF_S3_REGION,
+        presign_seconds: int = PDF_S3_PRESIGN_SECONDS
+    ):
+        if not bucket:
+            raise ValueError("PDF_S3_BUCKET is required for the s3 storage driver")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.presign_seconds = presign_seconds
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise RuntimeError("The s3 PDF storage driver requires boto3 (pip install boto3)")
+            self._client = boto3.client("s3", endpoint_url=self.endpoint_url, region_name=self.region)
+        return self._client
+
+    def object_name(self, key: str) -> str:
+        return self.prefix + key
+
+    def save_file(self, source_path: str) -> StoredObject:
+        """Upload a file under its checksum (multipart, streamed from disk)"""
+        checksum, size = file_checksum(source_path)
+        key = content_key(checksum)
+        if not self.exists(key):
+            self.client.upload_file(
+                source_path,
+                self.bucket,
+                self.object_name(key),
+                ExtraArgs={"ContentType": "application/pdf", "Metadata": {"sha256": checksum}}
+            )
+        return StoredObject(key, size, checksum)
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_name(key))
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def open(self, key: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        arguments = {"Bucket": self.bucket, "Key": self.object_name(key)}
+        if start or end is not None:
+            arguments["Range"] = f"bytes={start}-{'' if end is None else end}"
+        body = self.client.get_object(**arguments)["Body"]
+        try:
+            yield from body.iter_chunks(CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def delete(self, key: str) -> int:
+        from botocore.exceptions import ClientError
+        try:
+            size = self.client.head_object(Bucket=self.bucket, Key=self.object_name(key))["ContentLength"]
+        except ClientError:
+            return 0
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_name(key))
+        return size
+
+    def iter_objects(self) -> Iterator[Tuple[str, int, float]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                yield item["Key"][len(self.prefix):], item["Size"], item["LastModified"].timestamp()
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+    def presigned_url(self, key: str) -> Optional[str]:
+        if self.presign_seconds <= 0:
+            return None
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self.object_name(key)},
+            ExpiresIn=self.presign_seconds
+        )
+
+
+_storages: Dict[str, object] = {}
+
+
+def get_storage(driver: str = PDF_STORAGE_DRIVER):
+    """Storage instance for a driver name (created on first use)"""
+    if driver not in _storages:
+        if driver == "local":
+            _storages[driver] = LocalPdfStorage()
+        elif driver == "s3":
+            _storages[driver] = S3PdfStorage()
+        else:
+            raise ValueError(f"Unknown PDF storage driver: {driver}")
+    return _storages[driver]
+
+
+def storage_for(pdf_document):
+    """Storage that holds a document's file, and its key"""
+    storage = get_storage(pdf_document.storageDriver or "local")
+    return storage, pdf_document.storageKey or pdf_document.fileName